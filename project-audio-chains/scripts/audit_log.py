@@ -1,16 +1,60 @@
 #!/usr/bin/env python3
-"""Simple audit log writer for mastering workflow automation."""
+"""Simple audit log writer for mastering workflow automation.
+
+Entries are appended to a JSON Lines file, one object per line, so a write
+never has to read or rewrite the history. Setting AUDIT_LOG_BACKEND=sqlite
+stores them in an indexed SQLite database instead, for phase/status/time
+queries over large histories.
+
+The JSONL log is rotated according to ROTATION_POLICY: once it is too big,
+holds too many entries or its oldest entry is too old, it is compressed into
+a gzip segment under logs/archive/ and listed in archive/manifest.json.
+"""
 from __future__ import annotations
 
+import atexit
+import fcntl
+import gzip
 import json
+import os
+import shutil
+import sqlite3
+import threading
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
-LOG_FILE = PROJECT_ROOT / "logs" / "audit_history.json"
+LOG_FILE = PROJECT_ROOT / "logs" / "audit_history.jsonl"
+# Pre-JSONL format: a single JSON array, migrated once on first access
+LEGACY_LOG_FILE = PROJECT_ROOT / "logs" / "audit_history.json"
+DB_FILE = PROJECT_ROOT / "logs" / "audit_history.sqlite3"
+BACKEND = os.getenv("AUDIT_LOG_BACKEND", "jsonl")
 ISO_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+TAIL_BLOCK_SIZE = 4096
+# Rotated segments live next to the active log
+ARCHIVE_DIR_NAME = "archive"
+MANIFEST_NAME = "manifest.json"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    phase TEXT NOT NULL,
+    status TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    details TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_phase ON entries (phase, id);
+CREATE INDEX IF NOT EXISTS entries_status ON entries (status, id);
+CREATE INDEX IF NOT EXISTS entries_timestamp ON entries (timestamp);
+"""
+
+_connection_cache: Dict[Any, sqlite3.Connection] = {}
+# (device, inode, first line) of the active log -> (bytes counted, newlines seen), so max_entries checks
+# only scan new data
+_line_counts: Dict[Tuple[int, int, bytes], Tuple[int, int]] = {}
 
 
 @dataclass
@@ -30,36 +74,624 @@ class AuditEntry:
         )
 
 
+@dataclass
+class RotationPolicy:
+    """Thresholds that roll the active JSONL log into a compressed segment; None disables one."""
+
+    max_bytes: Optional[int] = 16 * 1024 * 1024
+    max_entries: Optional[int] = None
+    max_age_seconds: Optional[float] = None
+
+
+ROTATION_POLICY = RotationPolicy()
+
+
 def _ensure_parent() -> None:
     LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
 
 
-def load_log() -> List[Dict[str, Any]]:
+@contextmanager
+def _locked_log() -> Iterator[IO[bytes]]:
+    # Advisory lock shared by every process writing through this module. save_log and the
+    # migration swap the file, so retry until the locked handle is still the file on disk.
+    while True:
+        handle = LOG_FILE.open("a+b")
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        if LOG_FILE.exists() and os.fstat(handle.fileno()).st_ino == LOG_FILE.stat().st_ino:
+            break
+        handle.close()
+    try:
+        yield handle
+    finally:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        handle.close()
+
+
+def _encode(entry: Dict[str, Any]) -> bytes:
+    return (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _decode(line: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(line)
+    except ValueError:
+        # Torn line left by a writer that died mid-append
+        return None
+
+
+def migrate_legacy_log() -> int:
+    """Move entries from the old JSON array file into the JSONL log; returns how many were moved."""
+    if not LEGACY_LOG_FILE.exists():
+        return 0
     _ensure_parent()
+    with _locked_log():
+        # Another process may have finished the migration while we waited for the lock
+        if not LEGACY_LOG_FILE.exists():
+            return 0
+        entries = json.loads(LEGACY_LOG_FILE.read_text(encoding="utf-8") or "[]")
+        legacy_lines = b"".join(_encode(entry) for entry in entries)
+        current = LOG_FILE.read_bytes()
+        tmp = LOG_FILE.with_name(LOG_FILE.name + ".tmp")
+        tmp.write_bytes(legacy_lines + current)
+        os.replace(tmp, LOG_FILE)
+        LEGACY_LOG_FILE.rename(LEGACY_LOG_FILE.with_name(LEGACY_LOG_FILE.name + ".migrated"))
+    return len(entries)
+
+
+def _use_sqlite() -> bool:
+    return BACKEND == "sqlite"
+
+
+def _connect() -> sqlite3.Connection:
+    # One connection per process, thread and database file; sqlite3 connections are bound to
+    # their thread and a forked child must not reuse its parent's
+    cache_key = (os.getpid(), threading.get_ident(), str(DB_FILE))
+    connection = _connection_cache.get(cache_key)
+    if connection is None:
+        _ensure_parent()
+        connection = sqlite3.connect(DB_FILE, timeout=30, isolation_level=None)
+        # WAL lets readers run alongside a writer and keeps appends cheap
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        _connection_cache[cache_key] = connection
+        _import_jsonl(connection)
+    return connection
+
+
+def _row(values: Iterable[Any]) -> Dict[str, Any]:
+    phase, status, timestamp, details = values
+    return {"phase": phase, "status": status, "details": json.loads(details), "timestamp": timestamp}
+
+
+def _params(entry: Dict[str, Any]) -> tuple:
+    details = json.dumps(entry.get("details") or {}, ensure_ascii=False, separators=(",", ":"))
+    return entry["phase"], entry["status"], entry["timestamp"], details
+
+
+def _insert(connection: sqlite3.Connection, entries: Iterable[Dict[str, Any]]) -> None:
+    connection.executemany(
+        "INSERT INTO entries (phase, status, timestamp, details) VALUES (?, ?, ?, ?)", (_params(e) for e in entries)
+    )
+
+
+def _import_jsonl(connection: sqlite3.Connection) -> None:
+    # Switching an existing project to SQLite: pull in the JSONL history (and any legacy array) once
+    migrate_legacy_log()
     if not LOG_FILE.exists():
-        return []
-    return json.loads(LOG_FILE.read_text(encoding="utf-8"))
+        return
+    with connection:
+        connection.execute("BEGIN IMMEDIATE")
+        if not LOG_FILE.exists():
+            return
+        _insert(connection, _iter_jsonl())
+        LOG_FILE.rename(LOG_FILE.with_name(LOG_FILE.name + ".migrated"))
+        if _archive_dir().exists():
+            _archive_dir().rename(_archive_dir().with_name(ARCHIVE_DIR_NAME + ".migrated"))
+
+
+def _archive_dir() -> Path:
+    return LOG_FILE.parent / ARCHIVE_DIR_NAME
+
+
+def _load_manifest() -> Dict[str, Any]:
+    try:
+        return json.loads((_archive_dir() / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"generation": 0, "segments": [], "last_entry": None}
+
+
+def _save_manifest(manifest: Dict[str, Any]) -> None:
+    path = _archive_dir() / MANIFEST_NAME
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _iter_lines(
+    handle: IO[bytes], since: Optional[str] = None, until: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    for line in handle:
+        entry = _decode(line) if line.strip() else None
+        if entry is None:
+            continue
+        if since is not None and entry.get("timestamp", "") < since:
+            continue
+        if until is not None and entry.get("timestamp", "") >= until:
+            continue
+        yield entry
+
+
+@contextmanager
+def _pinned_view() -> Iterator[Tuple[Dict[str, Any], Optional[IO[bytes]]]]:
+    # The manifest and the active file handle must belong to the same generation, otherwise a rotation
+    # in between would make us skip or repeat a segment. Rotation runs under the exclusive lock of the
+    # active log, so reading the manifest under a shared lock on a handle that is still the file on disk
+    # pins both.
+    while True:
+        try:
+            active = LOG_FILE.open("rb")
+        except FileNotFoundError:
+            yield _load_manifest(), None
+            return
+        fcntl.flock(active.fileno(), fcntl.LOCK_SH)
+        try:
+            current = LOG_FILE.exists() and os.fstat(active.fileno()).st_ino == LOG_FILE.stat().st_ino
+            if current:
+                manifest = _load_manifest()
+        finally:
+            fcntl.flock(active.fileno(), fcntl.LOCK_UN)
+        if current:
+            break
+        active.close()
+    with active:
+        yield manifest, active
+
+
+def _iter_jsonl(since: Optional[str] = None, until: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    with _pinned_view() as (manifest, active):
+        for segment in manifest["segments"]:
+            # Every segment records the oldest and newest timestamp it holds: skip what the window excludes
+            if since is not None and segment["last"] < since:
+                continue
+            if until is not None and segment["first"] >= until:
+                continue
+            with gzip.open(_archive_dir() / segment["file"], "rb") as handle:
+                yield from _iter_lines(handle, since, until)
+        if active is not None:
+            yield from _iter_lines(active, since, until)
+
+
+def iter_history(
+    since: Union[str, datetime, None] = None, until: Union[str, datetime, None] = None
+) -> Iterator[Dict[str, Any]]:
+    """Lazily yield entries in write order, across archived segments and the active log.
+
+    Write order is time order except that batches from concurrent buffered loggers may interleave.
+    """
+    since, until = _timestamp(since), _timestamp(until)
+    if _use_sqlite():
+        yield from query(since=since, until=until)
+        return
+    migrate_legacy_log()
+    yield from _iter_jsonl(since, until)
+
+
+def _count_lines(handle: IO[bytes], size: int) -> int:
+    stat = os.fstat(handle.fileno())
+    handle.seek(0)
+    # Inode numbers are reused once a rotated log is gone; the first entry tells the files apart
+    key = (stat.st_dev, stat.st_ino, handle.readline(256))
+    offset, count = _line_counts.get(key, (0, 0))
+    if offset > size:
+        offset, count = 0, 0
+    handle.seek(offset)
+    while offset < size:
+        block = handle.read(min(1 << 20, size - offset))
+        if not block:
+            break
+        count += block.count(b"\n")
+        offset += len(block)
+    _line_counts[key] = (offset, count)
+    return count
+
+
+def _entry_timestamp(line: bytes) -> Optional[str]:
+    # _encode writes the timestamp last, so it can be sliced out without decoding the whole entry
+    marker = line.rfind(b'"timestamp":"')
+    if marker != -1:
+        end = line.find(b'"', marker + 13)
+        if end != -1:
+            return line[marker + 13 : end].decode("utf-8")
+    entry = _decode(line)
+    return entry.get("timestamp") if entry else None
+
+
+def _should_rotate(handle: IO[bytes], size: int, policy: RotationPolicy) -> bool:
+    if not size:
+        return False
+    if policy.max_bytes is not None and size >= policy.max_bytes:
+        return True
+    if policy.max_entries is not None and _count_lines(handle, size) >= policy.max_entries:
+        return True
+    if policy.max_age_seconds is not None:
+        handle.seek(0)
+        first = _decode(handle.readline())
+        if first is not None:
+            oldest = datetime.strptime(first["timestamp"], ISO_FORMAT)
+            return (datetime.utcnow() - oldest).total_seconds() >= policy.max_age_seconds
+    return False
+
+
+def _rotate_locked(handle: IO[bytes]) -> Optional[Dict[str, Any]]:
+    size = handle.seek(0, os.SEEK_END)
+    if not size:
+        return None
+    last = _tail_entry(handle)
+    if last is None:
+        return None
+    archive = _archive_dir()
+    archive.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest()
+    generation = manifest["generation"] + 1
+    target = archive / f"{LOG_FILE.stem}-{generation:06d}.jsonl.gz"
+    tmp = target.with_name(target.name + ".tmp")
+    # One pass compresses the log and collects the time span; buffered writers can interleave
+    # batches, so the first and last lines are not necessarily the oldest and newest entries
+    entries, oldest, newest = 0, None, None
+    handle.seek(0)
+    with gzip.open(tmp, "wb") as compressed:
+        for line in handle:
+            compressed.write(line)
+            timestamp = _entry_timestamp(line) if line.strip() else None
+            if timestamp is None:
+                continue
+            entries += 1
+            oldest = timestamp if oldest is None or timestamp < oldest else oldest
+            newest = timestamp if newest is None or timestamp > newest else newest
+    os.replace(tmp, target)
+    segment = {
+        "file": target.name,
+        "entries": entries,
+        "first": oldest,
+        "last": newest,
+        "bytes": size,
+        "compressed_bytes": target.stat().st_size,
+    }
+    # Start a fresh active log before publishing the segment, so no reader ever sees the rotated
+    # entries both in the manifest and in the active file. The new file stays locked until the
+    # manifest lists the segment: readers and writers that open it early wait, and writers blocked
+    # on the old inode notice the swap and reopen.
+    empty = LOG_FILE.with_name(LOG_FILE.name + ".tmp")
+    with empty.open("wb") as fresh:
+        fcntl.flock(fresh.fileno(), fcntl.LOCK_EX)
+        os.replace(empty, LOG_FILE)
+        manifest["generation"] = generation
+        manifest["segments"].append(segment)
+        manifest["last_entry"] = last
+        _save_manifest(manifest)
+    _line_counts.clear()
+    return segment
+
+
+def rotate_log() -> Optional[Dict[str, Any]]:
+    """Archive the active JSONL log now, whatever the policy says; returns the new segment, if any."""
+    if _use_sqlite():
+        return None
+    _ensure_parent()
+    migrate_legacy_log()
+    with _locked_log() as handle:
+        return _rotate_locked(handle)
+
+
+def load_log() -> List[Dict[str, Any]]:
+    if _use_sqlite():
+        cursor = _connect().execute("SELECT phase, status, timestamp, details FROM entries ORDER BY id")
+        return [_row(values) for values in cursor]
+    _ensure_parent()
+    migrate_legacy_log()
+    return list(_iter_jsonl())
 
 
 def save_log(entries: List[Dict[str, Any]]) -> None:
+    if _use_sqlite():
+        connection = _connect()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute("DELETE FROM entries")
+            _insert(connection, entries)
+        return
     _ensure_parent()
-    LOG_FILE.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+    migrate_legacy_log()
+    with _locked_log():
+        # The given entries become the whole history, so archived segments go too
+        if _archive_dir().exists():
+            shutil.rmtree(_archive_dir())
+        tmp = LOG_FILE.with_name(LOG_FILE.name + ".tmp")
+        tmp.write_bytes(b"".join(_encode(entry) for entry in entries))
+        os.replace(tmp, LOG_FILE)
 
 
-def log_phase(phase: str, status: str, details: Optional[Dict[str, Any]] = None) -> AuditEntry:
-    entries = load_log()
-    entry = AuditEntry.create(phase=phase, status=status, details=details)
-    entries.append(asdict(entry))
-    save_log(entries)
-    print(f"[AUDIT] Phase: {phase} — Status: {status}")
-    return entry
+def append_entries(entries: List[Dict[str, Any]], fsync: bool = False) -> None:
+    """Write several entries with one lock (JSONL) or one transaction (SQLite)."""
+    if not entries:
+        return
+    if _use_sqlite():
+        connection = _connect()
+        if fsync:
+            # NORMAL only syncs the WAL at checkpoints; FULL makes this commit durable
+            connection.execute("PRAGMA synchronous=FULL")
+        try:
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                _insert(connection, entries)
+        finally:
+            if fsync:
+                connection.execute("PRAGMA synchronous=NORMAL")
+        return
+    _append_lines([_encode(entry) for entry in entries], fsync)
+
+
+def _append_lines(lines: List[bytes], fsync: bool) -> None:
+    # JSONL append of entries already encoded by _encode
+    _ensure_parent()
+    migrate_legacy_log()
+    with _locked_log() as handle:
+        size = handle.seek(0, os.SEEK_END)
+        if size:
+            handle.seek(size - 1)
+            if handle.read(1) != b"\n":
+                # Terminate a torn line so this entry starts on its own line
+                handle.write(b"\n")
+        handle.write(b"".join(lines))
+        handle.flush()
+        if fsync:
+            os.fsync(handle.fileno())
+        if _should_rotate(handle, handle.seek(0, os.SEEK_END), ROTATION_POLICY):
+            _rotate_locked(handle)
+
+
+def append_entry(entry: Dict[str, Any], fsync: bool = False) -> None:
+    append_entries([entry], fsync=fsync)
+
+
+@dataclass
+class AuditCounters:
+    queued: int = 0
+    flushed: int = 0
+    dropped: int = 0
+
+    @property
+    def pending(self) -> int:
+        return self.queued - self.flushed - self.dropped
+
+
+class AuditLogger:
+    """Buffers entries in memory and writes them in batches.
+
+    A batch is written once max_batch entries are waiting or every flush_interval
+    seconds, from a background thread. With flush_interval=None there is no thread
+    and full batches are written by the caller. Entries beyond max_pending are
+    dropped rather than growing the buffer without bound. Pending entries are
+    flushed on close(), on leaving a with-block and at interpreter exit.
+
+    Entries are serialized by log() itself, so details that JSON cannot encode
+    raise in the caller instead of failing later on the flush thread.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = 500,
+        flush_interval: Optional[float] = 1.0,
+        max_pending: int = 100_000,
+        echo: bool = False,
+    ) -> None:
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.echo = echo
+        self.last_error: Optional[BaseException] = None
+        self._counters = AuditCounters()
+        self._buffer: deque = deque()
+        self._lock = threading.Lock()
+        # Serializes writers so batches reach the log in the order they were queued
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        if flush_interval is not None:
+            self._thread = threading.Thread(target=self._run, name="audit-logger", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def counters(self) -> AuditCounters:
+        with self._lock:
+            return AuditCounters(self._counters.queued, self._counters.flushed, self._counters.dropped)
+
+    def log(
+        self, phase: str, status: str, details: Optional[Dict[str, Any]] = None, fsync: bool = False
+    ) -> AuditEntry:
+        """Queue an entry; fsync=True writes it (and everything queued before it) durably right away."""
+        entry = AuditEntry.create(phase=phase, status=status, details=details)
+        line = _encode(asdict(entry))
+        with self._lock:
+            if self._closed or len(self._buffer) >= self.max_pending:
+                self._counters.dropped += 1
+                return entry
+            self._buffer.append(line)
+            self._counters.queued += 1
+            full = len(self._buffer) >= self.max_batch
+        if self.echo:
+            print(f"[AUDIT] Phase: {phase} — Status: {status}")
+        if fsync or (full and self._thread is None):
+            self.flush(fsync=fsync)
+        elif full:
+            self._wakeup.set()
+        return entry
+
+    def flush(self, fsync: bool = False) -> int:
+        """Write every queued entry now; returns how many were written.
+
+        A batch that cannot be written is counted as dropped and the error is re-raised.
+        """
+        return self._flush(fsync=fsync, raise_errors=True)
+
+    def _flush(self, fsync: bool, raise_errors: bool) -> int:
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._buffer.popleft() for _ in range(min(self.max_batch, len(self._buffer)))]
+                if not batch:
+                    return written
+                try:
+                    if _use_sqlite():
+                        append_entries([json.loads(line) for line in batch], fsync=fsync)
+                    else:
+                        _append_lines(batch, fsync)
+                except (OSError, sqlite3.Error) as exc:
+                    self.last_error = exc
+                    with self._lock:
+                        self._counters.dropped += len(batch)
+                    if raise_errors:
+                        raise
+                    continue
+                written += len(batch)
+                with self._lock:
+                    self._counters.flushed += len(batch)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread is not None:
+            self._wakeup.set()
+            self._thread.join()
+        self.flush()
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            # Nobody to report to on this thread: failures stay in last_error and the counters
+            self._flush(fsync=False, raise_errors=False)
+
+    def __enter__(self) -> "AuditLogger":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+# log_phase keeps its historical behaviour: every call is written before it returns
+_default_logger = AuditLogger(max_batch=1, flush_interval=None, echo=True)
+
+
+def log_phase(
+    phase: str, status: str, details: Optional[Dict[str, Any]] = None, fsync: bool = False
+) -> AuditEntry:
+    return _default_logger.log(phase, status, details, fsync=fsync)
 
 
 def latest_entry() -> Optional[Dict[str, Any]]:
+    if _use_sqlite():
+        values = _connect().execute(
+            "SELECT phase, status, timestamp, details FROM entries ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        return _row(values) if values else None
+    migrate_legacy_log()
+    with _pinned_view() as (manifest, active):
+        entry = _tail_entry(active) if active is not None else None
+    # Active log empty right after a rotation: the manifest remembers the newest archived entry
+    return entry if entry is not None else manifest["last_entry"]
+
+
+def _tail_entry(handle: IO[bytes]) -> Optional[Dict[str, Any]]:
+    position = handle.seek(0, os.SEEK_END)
+    tail = b""
+    # Walk back block by block; every complete line found is tried newest first
+    while position > 0:
+        step = min(TAIL_BLOCK_SIZE, position)
+        position -= step
+        handle.seek(position)
+        tail = handle.read(step) + tail
+        lines = tail.split(b"\n")
+        # The first piece may be cut mid-line unless we reached the start of the file
+        complete, tail = (lines, b"") if position == 0 else (lines[1:], lines[0])
+        for line in reversed(complete):
+            entry = _decode(line) if line.strip() else None
+            if entry is not None:
+                return entry
+    return None
+
+
+def _timestamp(value: Union[str, datetime, None]) -> Optional[str]:
+    # Timestamps share one fixed-width format, so string order is time order
+    if isinstance(value, datetime):
+        return value.strftime(ISO_FORMAT)
+    return value
+
+
+def query(
+    phase: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Union[str, datetime, None] = None,
+    until: Union[str, datetime, None] = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Entries matching every given filter, oldest first; since is inclusive, until exclusive."""
+    since, until = _timestamp(since), _timestamp(until)
+    if _use_sqlite():
+        clauses, params = [], []
+        for clause, value in (("phase = ?", phase), ("status = ?", status), ("timestamp >= ?", since), ("timestamp < ?", until)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        sql = "SELECT phase, status, timestamp, details FROM entries"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [_row(values) for values in _connect().execute(sql, params)]
+
+    migrate_legacy_log()
+    matches: List[Dict[str, Any]] = []
+    for entry in _iter_jsonl(since, until):
+        if phase is not None and entry.get("phase") != phase:
+            continue
+        if status is not None and entry.get("status") != status:
+            continue
+        matches.append(entry)
+        if limit is not None and len(matches) >= limit:
+            break
+    return matches
+
+
+def latest_per_phase() -> Dict[str, Dict[str, Any]]:
+    """Most recent entry of every phase, keyed by phase."""
+    if _use_sqlite():
+        cursor = _connect().execute(
+            "SELECT phase, status, timestamp, details FROM entries "
+            "WHERE id IN (SELECT MAX(id) FROM entries GROUP BY phase) ORDER BY id"
+        )
+        return {values[0]: _row(values) for values in cursor}
+    migrate_legacy_log()
+    latest: Dict[str, Dict[str, Any]] = {}
+    for entry in _iter_jsonl():
+        latest[entry.get("phase")] = entry
+    return latest
+
+
+def export_json(path: Path) -> int:
+    """Write the history as the original indented JSON array; returns the number of entries."""
     entries = load_log()
-    if not entries:
-        return None
-    return entries[-1]
+    Path(path).write_text(json.dumps(entries, indent=2), encoding="utf-8")
+    return len(entries)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Benchmark the audit log: sequential log_phase calls (JSONL vs the old rewrite-the-array log)
+history queries over a large log (JSONL scan vs SQLite indexes), and recent-history reads
+over a rotated JSONL log with a large archive."""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import audit_log
+
+
+def legacy_log_phase(log_file: Path, phase: str, status: str) -> None:
+    # Previous implementation: load the whole JSON array, append, rewrite with indent=2
+    entries = json.loads(log_file.read_text(encoding="utf-8")) if log_file.exists() else []
+    entries.append(asdict(audit_log.AuditEntry.create(phase=phase, status=status, details={"n": len(entries)})))
+    log_file.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+
+
+def bench_legacy(workdir: Path, count: int) -> float:
+    log_file = workdir / "audit_history.json"
+    start = time.perf_counter()
+    for index in range(count):
+        legacy_log_phase(log_file, "Bench", "ok")
+    return time.perf_counter() - start
+
+
+def bench_jsonl(workdir: Path, count: int, fsync: bool) -> float:
+    audit_log.BACKEND = "jsonl"
+    audit_log.LOG_FILE = workdir / "audit_history.jsonl"
+    audit_log.LEGACY_LOG_FILE = workdir / "missing.json"
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index in range(count):
+            audit_log.log_phase("Bench", "ok", {"n": index}, fsync=fsync)
+    return time.perf_counter() - start
+
+
+def _synthetic_entries(count: int) -> List[Dict[str, object]]:
+    start = datetime(2024, 1, 1)
+    statuses = ["started", "ok", "warning", "failed"]
+    return [
+        {
+            "phase": f"Phase{index % 20}",
+            "status": statuses[index % 7 % 4],
+            "details": {"n": index},
+            "timestamp": (start + timedelta(seconds=index)).strftime(audit_log.ISO_FORMAT),
+        }
+        for index in range(count)
+    ]
+
+
+def _timed(label: str, action: Callable[[], object]) -> object:
+    start = time.perf_counter()
+    result = action()
+    suffix = f"  ({len(result)} results)" if isinstance(result, list) else ""
+    print(f"  {label:<28} {(time.perf_counter() - start) * 1000:9.1f} ms{suffix}")
+    return result
+
+
+def _check(queries: Dict[str, Callable[[], object]], expected: Dict[str, object]) -> int:
+    mismatched = [label for label, action in queries.items() if _timed(label, action) != expected[label]]
+    print(f"  results match the input: {not mismatched}{''.join(f'  mismatch: {label}' for label in mismatched)}")
+    return len(mismatched)
+
+
+def bench_queries(workdir: Path, count: int) -> int:
+    entries = _synthetic_entries(count)
+    since = entries[count // 2]["timestamp"]
+    until = entries[count // 2 + 3600]["timestamp"] if count > count // 2 + 3600 else None
+    window = [entry for entry in entries if entry["timestamp"] >= since and (until is None or entry["timestamp"] < until)]
+    expected = {
+        "latest_entry()": entries[-1],
+        "query(phase=...)": [entry for entry in entries if entry["phase"] == "Phase7"],
+        "query(status=...)": [entry for entry in entries if entry["status"] == "failed"],
+        "query(since, until) 1h": window,
+        "query(phase, status, since)": [
+            entry
+            for entry in entries
+            if entry["phase"] == "Phase3" and entry["status"] == "ok" and entry["timestamp"] >= since
+        ],
+        "latest_per_phase()": {entry["phase"]: entry for entry in entries},
+        "export_json()": count,
+    }
+    audit_log.LEGACY_LOG_FILE = workdir / "missing.json"
+    mismatches = 0
+    for backend in ("jsonl", "sqlite"):
+        audit_log.BACKEND = backend
+        audit_log.LOG_FILE = workdir / f"queries_{backend}.jsonl"
+        audit_log.DB_FILE = workdir / f"queries_{backend}.sqlite3"
+        start = time.perf_counter()
+        audit_log.save_log(entries)
+        print(f"{backend}: bulk load of {count} entries in {time.perf_counter() - start:.2f}s")
+        queries = {
+            "latest_entry()": audit_log.latest_entry,
+            "query(phase=...)": lambda: audit_log.query(phase="Phase7"),
+            "query(status=...)": lambda: audit_log.query(status="failed"),
+            "query(since, until) 1h": lambda: audit_log.query(since=since, until=until),
+            "query(phase, status, since)": lambda: audit_log.query(phase="Phase3", status="ok", since=since),
+            "latest_per_phase()": audit_log.latest_per_phase,
+            "export_json()": lambda: audit_log.export_json(workdir / "export.json"),
+        }
+        mismatches += _check(queries, expected)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for index in range(1000):
+                audit_log.log_phase("Bench", "ok", {"n": index})
+        print(f"  {'1000 x log_phase':<28} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    audit_log.BACKEND = "jsonl"
+    return mismatches
+
+
+def bench_rotation(workdir: Path, count: int, segment_entries: int) -> int:
+    audit_log.BACKEND = "jsonl"
+    audit_log.LOG_FILE = workdir / "rotated.jsonl"
+    audit_log.LEGACY_LOG_FILE = workdir / "missing.json"
+    audit_log.ROTATION_POLICY = audit_log.RotationPolicy(max_bytes=None, max_entries=segment_entries)
+    entries = _synthetic_entries(count)
+    start = time.perf_counter()
+    for offset in range(0, count, 1000):
+        audit_log.append_entries(entries[offset : offset + 1000])
+    manifest = audit_log._load_manifest()
+    archived = sum(segment["bytes"] for segment in manifest["segments"])
+    compressed = sum(segment["compressed_bytes"] for segment in manifest["segments"])
+    print(
+        f"rotation: {count} entries in {time.perf_counter() - start:.2f}s -> {len(manifest['segments'])} segments, "
+        f"{archived / 2**20:.1f} MiB compressed to {compressed / 2**20:.1f} MiB"
+    )
+    last_hour = entries[-3600]["timestamp"]
+    queries = {
+        "latest_entry()": audit_log.latest_entry,
+        "query(since=last hour)": lambda: audit_log.query(since=last_hour),
+        "iter_history() full": lambda: sum(1 for _ in audit_log.iter_history()),
+    }
+    expected = {"latest_entry()": entries[-1], "query(since=last hour)": entries[-3600:], "iter_history() full": count}
+    mismatches = _check(queries, expected)
+    audit_log.ROTATION_POLICY = audit_log.RotationPolicy()
+    return mismatches
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000, help="log_phase calls for the JSONL log")
+    parser.add_argument(
+        "--legacy-count",
+        type=int,
+        default=5_000,
+        help="calls for the old JSON array log; cost grows quadratically, 0 skips it",
+    )
+    parser.add_argument("--fsync", action="store_true", help="fsync every JSONL append")
+    parser.add_argument(
+        "--query-entries", type=int, default=0, help="also benchmark history queries on a log of this many entries"
+    )
+    parser.add_argument(
+        "--rotation-entries", type=int, default=0, help="also benchmark reads over a rotated log of this many entries"
+    )
+    parser.add_argument("--segment-entries", type=int, default=50_000, help="max_entries rotation threshold")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        if args.count:
+            jsonl_seconds = bench_jsonl(workdir, args.count, args.fsync)
+            print(f"jsonl : {args.count} calls in {jsonl_seconds:.2f}s ({args.count / jsonl_seconds:,.0f} calls/s)")
+            timed = time.perf_counter()
+            latest = audit_log.latest_entry()
+            print(f"jsonl : latest_entry over {args.count} entries in {(time.perf_counter() - timed) * 1000:.2f} ms")
+            complete = len(audit_log.load_log()) == args.count and latest["details"] == {"n": args.count - 1}
+            print(f"jsonl : every call on disk, latest entry is the last call: {complete}")
+            mismatches += not complete
+        if args.legacy_count:
+            legacy_seconds = bench_legacy(workdir, args.legacy_count)
+            print(
+                f"legacy: {args.legacy_count} calls in {legacy_seconds:.2f}s "
+                f"({args.legacy_count / legacy_seconds:,.0f} calls/s)"
+            )
+        if args.query_entries:
+            mismatches += bench_queries(workdir, args.query_entries)
+        if args.rotation_entries:
+            mismatches += bench_rotation(workdir, args.rotation_entries, args.segment_entries)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Benchmark preset generation: one generation_engine process per preset (the old way to build
+the genre x objective matrix) against batch mode, which loads the knowledge index once, and
+check weighted chain sampling: alias-table throughput and a chi-square test of the distribution."""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import generation_engine
+
+ENGINE = Path(generation_engine.__file__).resolve()
+
+
+def bench_per_invocation(requests: list) -> float:
+    start = time.perf_counter()
+    for request in requests:
+        command = [sys.executable, str(ENGINE), "--genre", request.genre]
+        if request.objective:
+            command += ["--objective", request.objective]
+        if request.seed is not None:
+            command += ["--seed", str(request.seed)]
+        # --dry-run keeps the loop from writing into the real preset folder; it still pays startup and load
+        subprocess.run(command + ["--dry-run"], check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def bench_batch(requests: list, output_dir: Path, jobs: int) -> float:
+    generation_engine.OUTPUT_DIR = output_dir / f"batch_{jobs}"
+    start = time.perf_counter()
+    index = generation_engine.load_index()
+    presets = generation_engine.generate_batch(index, requests, jobs=jobs)
+    generation_engine.write_presets(presets)
+    return time.perf_counter() - start
+
+
+def _weighted_knowledge(chain_count: int) -> dict:
+    # Zipf-like popularity: a few chains dominate, the long tail is rarely picked
+    chains = [
+        {"id": f"chain{index}", "objective_tags": ["balanced"], "signal_chain": [], "weight": 1.0 / (index + 1)}
+        for index in range(chain_count)
+    ]
+    return {"chains_by_genre": {"bench": chains}, "module_catalog": {}, "default_chains": []}
+
+
+def _chi_square_p_value(statistic: float, dof: int) -> float:
+    # Wilson-Hilferty: (X/k)^(1/3) is close to normal, good enough for a pass/fail check
+    z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def bench_sampling(chain_count: int, draws: int) -> int:
+    knowledge = _weighted_knowledge(chain_count)
+    index = generation_engine.KnowledgeIndex.build(knowledge)
+    chains = knowledge["chains_by_genre"]["bench"]
+    weights = [chain["weight"] for chain in chains]
+    rng = random.Random(0)
+
+    start = time.perf_counter()
+    for _ in range(draws):
+        random.choices(chains, weights)
+    choices_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    counts = dict.fromkeys((chain["id"] for chain in chains), 0)
+    for _ in range(draws):
+        counts[generation_engine.select_chain(index, "bench", "balanced", rng)["id"]] += 1
+    alias_seconds = time.perf_counter() - start
+    print(f"sampling: {chain_count} weighted chains, {draws} draws")
+    print(f"  {'random.choices (O(n))':<24} {draws / choices_seconds:12,.0f} draws/s")
+    print(f"  {'select_chain (alias)':<24} {draws / alias_seconds:12,.0f} draws/s  x{choices_seconds / alias_seconds:.1f}")
+
+    total = sum(weights)
+    statistic = sum(
+        (counts[chain["id"]] - draws * weight / total) ** 2 / (draws * weight / total)
+        for chain, weight in zip(chains, weights)
+    )
+    p_value = _chi_square_p_value(statistic, chain_count - 1)
+    verdict = "ok" if p_value > 0.001 else "DISTRIBUTION MISMATCH"
+    print(f"  chi-square {statistic:.1f} on {chain_count - 1} dof, p = {p_value:.3f}: {verdict}")
+
+    seeded = [generation_engine.select_chain(index, "bench", None, random.Random(seed))["id"] for seed in range(100)]
+    again = [generation_engine.select_chain(index, "bench", None, random.Random(seed))["id"] for seed in range(100)]
+    reproducible = seeded == again
+    print(f"  same seed, same chain: {reproducible}")
+
+    # Zero weights: never drawn, and a pool where every chain weighs 0 falls through to the defaults
+    knowledge["chains_by_genre"]["zeros"] = [dict(chain, weight=0) for chain in chains[:10]]
+    knowledge["default_chains"] = [{"id": "default", "objective_tags": ["balanced"], "signal_chain": []}]
+    for chain in chains[::2]:
+        chain["weight"] = 0
+    picked = set()
+    for source in (knowledge, generation_engine.KnowledgeIndex.build(knowledge)):
+        for genre in ("bench", "zeros"):
+            picked.update(
+                generation_engine.select_chain(source, genre, "balanced", random.Random(seed))["id"] for seed in range(2_000)
+            )
+    zero_ids = {chain["id"] for chain in chains[::2]}
+    zero_skipped = not picked & zero_ids and "default" in picked
+    print(f"  zero-weight chains never picked: {zero_skipped}")
+    return sum(not passed for passed in (p_value > 0.001, reproducible, zero_skipped))
+
+
+def _unicode_knowledge() -> dict:
+    modules = {"compresión": {"name": "Compresión suave", "category": "dinámica", "default_parameters": {"ratio": 2}}}
+    chains = [
+        {
+            "id": f"r{index}",
+            "objective_tags": ["cálido", "balanced"],
+            "signal_chain": [{"order": 1, "module_id": "compresión", "settings": {}}],
+        }
+        for index in range(3)
+    ]
+    defaults = [{"id": "d1", "objective_tags": ["balanced"], "signal_chain": []}]
+    return {"chains_by_genre": {"reggaetón": chains}, "module_catalog": modules, "default_chains": defaults}
+
+
+def check_lazy_unicode(workdir: Path) -> bool:
+    """Non-ASCII genre and module keys, raw UTF-8 and \\u-escaped: the lazy loader must match the dict path."""
+    knowledge = _unicode_knowledge()
+    saved = generation_engine.KNOWLEDGE_FILE, generation_engine.OFFSETS_CACHE_FILE
+    same = True
+    try:
+        for ensure_ascii in (False, True):
+            generation_engine.KNOWLEDGE_FILE = workdir / f"unicode_{ensure_ascii}.json"
+            generation_engine.OFFSETS_CACHE_FILE = workdir / f"offsets_{ensure_ascii}.json"
+            generation_engine.KNOWLEDGE_FILE.write_text(
+                json.dumps(knowledge, ensure_ascii=ensure_ascii, indent=2), encoding="utf-8"
+            )
+            lazy = generation_engine.open_knowledge()
+            for objective in (None, "cálido", "missing"):
+                for seed in range(5):
+                    presets = []
+                    for source in (knowledge, lazy):
+                        chain = generation_engine.select_chain(source, "reggaetón", objective, random.Random(seed))
+                        preset = generation_engine.build_preset(source, chain, "reggaetón", objective, seed)
+                        preset.pop("generated_at")
+                        presets.append(preset)
+                    same = same and presets[0] == presets[1]
+            lazy.close()
+    finally:
+        generation_engine.KNOWLEDGE_FILE, generation_engine.OFFSETS_CACHE_FILE = saved
+    return same
+
+
+def _report(label: str, count: int, seconds: float, baseline: float) -> None:
+    print(f"  {label:<24} {count:6d} presets {seconds:8.2f}s {count / seconds:10,.0f} presets/s  x{baseline / seconds:.1f}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seeds", type=int, default=10, help="seeds per genre x objective combination")
+    parser.add_argument("--jobs", type=int, default=4, help="worker processes for the pooled batch run")
+    parser.add_argument("--chains", type=int, default=1_000, help="weighted chains for the sampling benchmark")
+    parser.add_argument("--draws", type=int, default=200_000, help="samples for the sampling benchmark, 0 skips it")
+    parser.add_argument(
+        "--loop-limit", type=int, default=50, help="presets generated by the per-invocation loop (extrapolated)"
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    index = generation_engine.load_index()
+    requests = generation_engine.matrix_requests(index, seeds=list(range(args.seeds)))
+    print(f"matrix: {len(index.genre_chains)} genres x {len(index.objectives)} objectives x {args.seeds} seeds")
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        sample = requests[: args.loop_limit]
+        loop_seconds = bench_per_invocation(sample) * len(requests) / len(sample)
+        _report("per-invocation loop", len(requests), loop_seconds, loop_seconds)
+        _report("batch, 1 job", len(requests), bench_batch(requests, output_dir, 1), loop_seconds)
+        if args.jobs > 1:
+            _report(f"batch, {args.jobs} jobs", len(requests), bench_batch(requests, output_dir, args.jobs), loop_seconds)
+        lazy_matches = check_lazy_unicode(output_dir)
+        print(f"lazy loader matches dict path on non-ASCII keys: {lazy_matches}")
+    mismatches = int(not lazy_matches)
+    if args.draws:
+        mismatches += bench_sampling(args.chains, args.draws)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,16 +3,35 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import math
+import mmap
+import os
+import pickle
 import random
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 KNOWLEDGE_FILE = PROJECT_ROOT / "base_knowledge" / "knowledge.json"
 OUTPUT_DIR = PROJECT_ROOT / "plugin_build" / "presets"
 DEFAULT_OBJECTIVE = "balanced"
+INDEX_CACHE_FILE = PROJECT_ROOT / ".cache" / "knowledge_index.pickle"
+# Bump when KnowledgeIndex changes shape so stale caches are rebuilt
+INDEX_FORMAT_VERSION = 5
+OFFSETS_CACHE_FILE = PROJECT_ROOT / ".cache" / "knowledge_offsets.json"
+OFFSETS_FORMAT_VERSION = 2
+# (probability, alias) columns of a Walker/Vose alias table
+AliasTable = Tuple[List[float], List[int]]
+# Objects decoded member by member by LazyKnowledge
+LAZY_SECTIONS = ("chains_by_genre", "module_catalog")
 
 
 def load_knowledge() -> Dict[str, Any]:
@@ -21,6 +40,148 @@ def load_knowledge() -> Dict[str, Any]:
     return json.loads(KNOWLEDGE_FILE.read_text(encoding="utf-8"))
 
 
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _skip(text: str, idx: int, expected: Optional[str] = None) -> int:
+    idx = _WHITESPACE.match(text, idx).end()
+    if expected is not None:
+        if text[idx : idx + 1] != expected:
+            raise ValueError(f"Expected {expected!r} at offset {idx} of {KNOWLEDGE_FILE}")
+        idx = _WHITESPACE.match(text, idx + 1).end()
+    return idx
+
+
+def _member_spans(
+    text: str, idx: int, sections: Sequence[str] = ()
+) -> Tuple[Dict[str, List[int]], Dict[str, Dict[str, List[int]]], int]:
+    """[start, end) of each member of the JSON object at idx, plus member spans inside `sections`."""
+    spans: Dict[str, List[int]] = {}
+    nested: Dict[str, Dict[str, List[int]]] = {}
+    idx = _skip(text, idx, "{")
+    while text[idx : idx + 1] != "}":
+        key_start = idx
+        _, idx = _DECODER.raw_decode(text, idx)
+        # text is the latin-1 view of UTF-8 bytes: decode the key's own bytes to get the real string
+        key = json.loads(text[key_start:idx].encode("latin-1"))
+        start = idx = _skip(text, idx, ":")
+        if key in sections and text[idx : idx + 1] == "{":
+            nested[key], _, idx = _member_spans(text, idx)
+        else:
+            _, idx = _DECODER.raw_decode(text, idx)
+        spans[key] = [start, idx]
+        idx = _skip(text, idx)
+        if text[idx : idx + 1] == ",":
+            idx = _skip(text, idx + 1)
+    return spans, nested, idx + 1
+
+
+def _offset_index(data: Union[bytes, mmap.mmap], path: Path) -> Dict[str, Any]:
+    # latin-1 maps every byte to one character, so character offsets are byte offsets;
+    # multi-byte UTF-8 only appears inside strings, and keys are re-decoded from their bytes
+    text = bytes(data).decode("latin-1")
+    top, sections, _ = _member_spans(text, _skip(text, 0), LAZY_SECTIONS)
+    stat = path.stat()
+    return {
+        "version": OFFSETS_FORMAT_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "top": top,
+        "sections": sections,
+    }
+
+
+def _load_offsets(data: mmap.mmap, path: Path, use_cache: bool, rebuild: bool) -> Dict[str, Any]:
+    cached: Optional[Dict[str, Any]] = None
+    if use_cache and not rebuild and OFFSETS_CACHE_FILE.exists():
+        try:
+            cached = json.loads(OFFSETS_CACHE_FILE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            cached = None
+    if cached is not None and cached.get("version") == OFFSETS_FORMAT_VERSION:
+        stat = path.stat()
+        if (cached.get("size"), cached.get("mtime_ns")) == (stat.st_size, stat.st_mtime_ns):
+            return cached
+        # Touched but possibly unchanged (checkout, copy): only the content hash decides
+        if cached.get("sha256") == hashlib.sha256(data).hexdigest():
+            cached.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            _save_offsets(cached)
+            return cached
+    offsets = _offset_index(data, path)
+    if use_cache:
+        _save_offsets(offsets)
+    return offsets
+
+
+def _save_offsets(offsets: Dict[str, Any]) -> None:
+    OFFSETS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = OFFSETS_CACHE_FILE.with_name(OFFSETS_CACHE_FILE.name + ".tmp")
+    tmp.write_text(json.dumps(offsets), encoding="utf-8")
+    tmp.replace(OFFSETS_CACHE_FILE)
+
+
+class _LazySection(Mapping[str, Any]):
+    """One object of the knowledge base whose members are decoded on first access."""
+
+    def __init__(self, owner: "LazyKnowledge", spans: Dict[str, List[int]]) -> None:
+        self._owner = owner
+        self._spans = spans
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._values:
+            self._values[key] = self._owner._decode(self._spans[key])
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._spans)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+
+class LazyKnowledge(Mapping[str, Any]):
+    """Read-only view of knowledge.json over a memory map.
+
+    Top-level values are decoded on first access; chains_by_genre and module_catalog are decoded
+    one genre or module at a time. Byte offsets come from an index cached next to the
+    knowledge index and rebuilt when the file's content hash changes.
+    """
+
+    def __init__(self, path: Path, use_cache: bool = True, rebuild: bool = False) -> None:
+        if not path.exists():
+            raise FileNotFoundError(f"Knowledge file not found: {path}")
+        with path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets = _load_offsets(self._map, path, use_cache, rebuild)
+        self._values: Dict[str, Any] = {}
+
+    def _decode(self, span: List[int]) -> Any:
+        return json.loads(self._map[span[0] : span[1]])
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._values:
+            span = self._offsets["top"][key]
+            members = self._offsets["sections"].get(key)
+            self._values[key] = _LazySection(self, members) if members is not None else self._decode(span)
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets["top"])
+
+    def __len__(self) -> int:
+        return len(self._offsets["top"])
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def open_knowledge(use_cache: bool = True, rebuild: bool = False) -> LazyKnowledge:
+    return LazyKnowledge(KNOWLEDGE_FILE, use_cache=use_cache, rebuild=rebuild)
+
+
 def _objective_tags(chain: Dict[str, Any]) -> List[str]:
     return [tag.lower() for tag in chain.get("objective_tags", [])]
 
@@ -30,28 +191,310 @@ def _matches_objective(chain: Dict[str, Any], objective: str) -> bool:
     return objective_lower in _objective_tags(chain)
 
 
-def select_chain(knowledge: Dict[str, Any], genre: str, objective: Optional[str]) -> Dict[str, Any]:
-    objective = (objective or DEFAULT_OBJECTIVE).lower()
-    chains = knowledge.get("chains_by_genre", {}).get(genre, [])
+def _chain_weight(chain: Mapping[str, Any]) -> float:
+    # null counts as unset, like a missing key: fall through to popularity, then to 1.0
+    value = chain.get("weight")
+    if value is None:
+        value = chain.get("popularity")
+    if value is None:
+        value = 1.0
+    try:
+        weight = float(value)
+    except (TypeError, ValueError):
+        weight = -1.0
+    if not math.isfinite(weight) or weight < 0:
+        raise ValueError(f"Chain '{chain.get('id')}' has an invalid weight: {value!r}")
+    return weight
+
+
+def build_alias_table(weights: Sequence[float]) -> Optional[AliasTable]:
+    """Walker/Vose alias table for O(1) weighted sampling; None when a uniform choice is equivalent.
+
+    Weights that are all zero also give None: callers skip such pools (see _has_weight), a uniform
+    draw would pick chains whose weight asks for them never to be picked.
+    """
+    total = math.fsum(weights)
+    if total <= 0 or all(weight == weights[0] for weight in weights):
+        return None
+    count = len(weights)
+    scaled = [weight * count / total for weight in weights]
+    probability = [1.0] * count
+    alias = list(range(count))
+    small = [index for index, value in enumerate(scaled) if value < 1.0]
+    large = [index for index, value in enumerate(scaled) if value >= 1.0]
+    while small and large:
+        low, high = small.pop(), large.pop()
+        probability[low] = scaled[low]
+        alias[low] = high
+        scaled[high] -= 1.0 - scaled[low]
+        (small if scaled[high] < 1.0 else large).append(high)
+    # Whatever is left is 1.0 up to rounding error and keeps probability 1.0
+    return probability, alias
+
+
+def _has_weight(weights: Sequence[float]) -> bool:
+    # A pool whose chains all weigh 0 has nothing to pick: selection moves on to the next fallback
+    return math.fsum(weights) > 0
+
+
+def _no_chains_error(genre: str, available: Iterable[str], all_zero: bool) -> ValueError:
+    if all_zero:
+        return ValueError(f"All chains for genre '{genre}' and its fallbacks have weight 0")
+    available = ", ".join(sorted(available))
+    return ValueError(f"No chains defined for genre '{genre}'. Available genres: {available or 'none'}")
+
+
+def _pick(items: Sequence[Any], table: Optional[AliasTable], rng: Optional[random.Random]) -> Any:
+    # rng=None keeps using the module-level generator (random.seed) for existing callers
+    source = rng if rng is not None else random
+    if table is None:
+        # Same draw as the previous random.choice, so seeds keep picking the same chains
+        return source.choice(items)
+    probability, alias = table
+    column = int(source.random() * len(items))
+    return items[column if source.random() < probability[column] else alias[column]]
+
+
+class KnowledgeIndex:
+    """Chain lookups precomputed from a knowledge base.
+
+    Chains are addressed by position. `candidates` maps (genre, objective) to the positions
+    select_chain would pick from, and `alias_tables` holds the alias table of every pool whose
+    chains are not equally weighted ("" stands for the genre / objective fallbacks) and
+    `zero_weight_pools` the pools select skips because all their chains weigh 0; each chain
+    is kept together with its signal chain already joined with module_catalog, and `chain_positions`
+    maps each chain `id` to its positions. When loaded from the binary cache, chains stay encoded until
+    one is selected, so startup only pays for the lookup tables.
+    """
+
+    def __init__(
+        self,
+        genre_chains: Dict[str, List[int]],
+        candidates: Dict[Tuple[str, str], List[int]],
+        default_chains: List[int],
+        default_candidates: Dict[str, List[int]],
+        metering_targets: Dict[str, Any],
+        objectives: List[str],
+        alias_tables: Dict[Tuple[str, str], AliasTable],
+        entries: List[Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]],
+        chain_positions: Dict[Optional[str], List[int]],
+        zero_weight_pools: Set[Tuple[str, str]],
+        blobs: Optional[List[Optional[bytes]]] = None,
+    ) -> None:
+        self.genre_chains = genre_chains
+        self.candidates = candidates
+        self.default_chains = default_chains
+        self.default_candidates = default_candidates
+        self.metering_targets = metering_targets
+        self.objectives = objectives
+        self.alias_tables = alias_tables
+        self._entries = entries
+        self._blobs = blobs if blobs is not None else [None] * len(entries)
+        self.chain_positions = chain_positions
+        self.zero_weight_pools = zero_weight_pools
+
+    @classmethod
+    def build(cls, knowledge: Mapping[str, Any]) -> "KnowledgeIndex":
+        module_catalog = knowledge.get("module_catalog", {})
+        entries: List[Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]] = []
+        tags: List[List[str]] = []
+        weights: List[float] = []
+
+        def _add(chain: Dict[str, Any]) -> int:
+            entries.append((chain, _detailed_signal_chain(chain, module_catalog)))
+            tags.append(_objective_tags(chain))
+            weights.append(_chain_weight(chain))
+            return len(entries) - 1
+
+        genre_chains = {
+            genre: [_add(chain) for chain in genre_list]
+            for genre, genre_list in knowledge.get("chains_by_genre", {}).items()
+        }
+        default_chains = [_add(chain) for chain in knowledge.get("default_chains", [])]
+
+        def _by_objective(positions: List[int]) -> Dict[str, List[int]]:
+            by_objective: Dict[str, List[int]] = {}
+            for position in positions:
+                # dict.fromkeys: a tag listed twice must not make the chain twice as likely
+                for tag in dict.fromkeys(tags[position]):
+                    by_objective.setdefault(tag, []).append(position)
+            return by_objective
+
+        candidates = {
+            (genre, objective): matches
+            for genre, positions in genre_chains.items()
+            for objective, matches in _by_objective(positions).items()
+        }
+        default_candidates = _by_objective(default_chains)
+        pools: Dict[Tuple[str, str], List[int]] = dict(candidates)
+        pools.update(((genre, ""), positions) for genre, positions in genre_chains.items())
+        pools.update((("", objective), positions) for objective, positions in default_candidates.items())
+        pools[("", "")] = default_chains
+        chain_positions: Dict[Optional[str], List[int]] = {}
+        for position, (chain, _) in enumerate(entries):
+            chain_positions.setdefault(chain.get("id"), []).append(position)
+        alias_tables = {}
+        zero_weight_pools = set()
+        for key, positions in pools.items():
+            pool_weights = [weights[position] for position in positions]
+            if positions and not _has_weight(pool_weights):
+                zero_weight_pools.add(key)
+                continue
+            table = build_alias_table(pool_weights)
+            if table is not None:
+                alias_tables[key] = table
+        return cls(
+            genre_chains=genre_chains,
+            candidates=candidates,
+            default_chains=default_chains,
+            default_candidates=default_candidates,
+            metering_targets=knowledge.get("metering_targets", {}),
+            objectives=_known_objectives(knowledge, candidates, default_chains, tags),
+            alias_tables=alias_tables,
+            entries=entries,
+            chain_positions=chain_positions,
+            zero_weight_pools=zero_weight_pools,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _entry(self, position: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        entry = self._entries[position]
+        if entry is None:
+            entry = pickle.loads(self._blobs[position])
+            self._entries[position] = entry
+        return entry
+
+    def chain(self, position: int) -> Dict[str, Any]:
+        return self._entry(position)[0]
 
-    if chains:
-        objective_matches = [chain for chain in chains if _matches_objective(chain, objective)]
-        if objective_matches:
-            chains = objective_matches
+    def _pool(self, genre: str, objective: Optional[str]) -> Tuple[Tuple[str, str], List[int]]:
+        objective = (objective or DEFAULT_OBJECTIVE).lower()
+        all_zero = False
+        for key, positions in (
+            ((genre, objective), self.candidates.get((genre, objective))),
+            ((genre, ""), self.genre_chains.get(genre)),
+            (("", objective), self.default_candidates.get(objective)),
+            (("", ""), self.default_chains),
+        ):
+            if positions and key in self.zero_weight_pools:
+                all_zero = True
+            elif positions:
+                return key, positions
+        raise _no_chains_error(genre, self.genre_chains, all_zero)
 
-    if not chains:
-        defaults = knowledge.get("default_chains", [])
-        default_matches = [chain for chain in defaults if _matches_objective(chain, objective)]
-        chains = default_matches or defaults
+    def candidate_positions(self, genre: str, objective: Optional[str]) -> List[int]:
+        return self._pool(genre, objective)[1]
 
-    if not chains:
-        available = ", ".join(sorted(knowledge.get("chains_by_genre", {}).keys()))
-        raise ValueError(f"No chains defined for genre '{genre}'. Available genres: {available or 'none'}")
+    def select(self, genre: str, objective: Optional[str], rng: Optional[random.Random] = None) -> Dict[str, Any]:
+        key, positions = self._pool(genre, objective)
+        return self.chain(_pick(positions, self.alias_tables.get(key), rng))
 
-    return random.choice(chains)
+    def detailed_signal_chain(self, chain: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        # Matched by value, not identity: copies and chains re-loaded from JSON resolve too, and
+        # chains sharing an id (e.g. across genres) are told apart by their content
+        for position in self.chain_positions.get(chain.get("id"), []):
+            indexed, detailed = self._entry(position)
+            if indexed is chain or indexed == chain:
+                return detailed
+        return None
 
+    def to_state(self) -> Dict[str, Any]:
+        """Builtins-only form for the cache, so it loads the same whether this runs as a script or a module."""
+        blobs = [
+            blob if blob is not None else pickle.dumps(self._entries[position], protocol=pickle.HIGHEST_PROTOCOL)
+            for position, blob in enumerate(self._blobs)
+        ]
+        return {
+            "genre_chains": self.genre_chains,
+            "candidates": self.candidates,
+            "default_chains": self.default_chains,
+            "default_candidates": self.default_candidates,
+            "metering_targets": self.metering_targets,
+            "objectives": self.objectives,
+            "alias_tables": self.alias_tables,
+            "chain_positions": self.chain_positions,
+            "zero_weight_pools": self.zero_weight_pools,
+            "blobs": blobs,
+        }
 
-def _detailed_signal_chain(chain: Dict[str, Any], module_catalog: Dict[str, Any]) -> List[Dict[str, Any]]:
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "KnowledgeIndex":
+        state = dict(state)
+        blobs = state.pop("blobs")
+        return cls(entries=[None] * len(blobs), blobs=blobs, **state)
+
+
+def _known_objectives(
+    knowledge: Mapping[str, Any],
+    candidates: Dict[Tuple[str, str], List[int]],
+    default_chains: List[int],
+    tags: List[List[str]],
+) -> List[str]:
+    # objectives_index order first, then any tag only used on chains
+    objectives = [entry["tag"].lower() for entry in knowledge.get("objectives_index", []) if entry.get("tag")]
+    objectives.extend(objective for _, objective in candidates)
+    objectives.extend(tag for position in default_chains for tag in tags[position])
+    return list(dict.fromkeys(objectives))
+
+
+def _source_signature(path: Path) -> Tuple[int, int, int]:
+    stat = path.stat()
+    return INDEX_FORMAT_VERSION, stat.st_size, stat.st_mtime_ns
+
+
+def load_index(use_cache: bool = True, rebuild: bool = False) -> KnowledgeIndex:
+    """KnowledgeIndex for KNOWLEDGE_FILE, read from the binary cache while the file is unchanged."""
+    if not KNOWLEDGE_FILE.exists():
+        raise FileNotFoundError(f"Knowledge file not found: {KNOWLEDGE_FILE}")
+    signature = _source_signature(KNOWLEDGE_FILE)
+    if use_cache and not rebuild and INDEX_CACHE_FILE.exists():
+        try:
+            with INDEX_CACHE_FILE.open("rb") as handle:
+                cached_signature, state = pickle.load(handle)
+            if cached_signature == signature:
+                return KnowledgeIndex.from_state(state)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError, TypeError, ValueError):
+            pass
+    index = KnowledgeIndex.build(load_knowledge())
+    if use_cache:
+        INDEX_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = INDEX_CACHE_FILE.with_name(INDEX_CACHE_FILE.name + ".tmp")
+        with tmp.open("wb") as handle:
+            pickle.dump((signature, index.to_state()), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(INDEX_CACHE_FILE)
+    return index
+
+
+def select_chain(
+    knowledge: Union[Mapping[str, Any], KnowledgeIndex],
+    genre: str,
+    objective: Optional[str],
+    rng: Optional[random.Random] = None,
+) -> Dict[str, Any]:
+    """Pick a chain for genre/objective, weighted by each chain's `weight` (or `popularity`)."""
+    if isinstance(knowledge, KnowledgeIndex):
+        return knowledge.select(genre, objective, rng)
+    objective = (objective or DEFAULT_OBJECTIVE).lower()
+    genre_chains = knowledge.get("chains_by_genre", {}).get(genre, [])
+    defaults = knowledge.get("default_chains", [])
+    # Same fallback order as KnowledgeIndex._pool, skipping pools whose chains all weigh 0
+    for chains in (
+        [chain for chain in genre_chains if _matches_objective(chain, objective)],
+        genre_chains,
+        [chain for chain in defaults if _matches_objective(chain, objective)],
+        defaults,
+    ):
+        weights = [_chain_weight(chain) for chain in chains]
+        if _has_weight(weights):
+            return _pick(chains, build_alias_table(weights), rng)
+
+    all_zero = bool(genre_chains or defaults)
+    raise _no_chains_error(genre, knowledge.get("chains_by_genre", {}).keys(), all_zero)
+
+
+def _detailed_signal_chain(chain: Dict[str, Any], module_catalog: Mapping[str, Any]) -> List[Dict[str, Any]]:
     detailed: List[Dict[str, Any]] = []
     for stage in chain.get("signal_chain", []):
         module_id = stage.get("module_id")
@@ -71,14 +514,22 @@ def _detailed_signal_chain(chain: Dict[str, Any], module_catalog: Dict[str, Any]
 
 
 def build_preset(
-    knowledge: Dict[str, Any],
+    knowledge: Union[Mapping[str, Any], KnowledgeIndex],
     chain: Dict[str, Any],
     genre: str,
     objective: Optional[str],
     seed: Optional[int],
 ) -> Dict[str, Any]:
-    module_catalog = knowledge.get("module_catalog", {})
-    metering_fallback = knowledge.get("metering_targets", {}).get(genre)
+    if isinstance(knowledge, KnowledgeIndex):
+        signal_chain = knowledge.detailed_signal_chain(chain)
+        if signal_chain is None:
+            raise ValueError(f"Chain '{chain.get('id')}' is not part of this knowledge index")
+        # Copy the stages so editing one preset cannot leak into the shared index
+        signal_chain = [dict(stage) for stage in signal_chain]
+        metering_fallback = knowledge.metering_targets.get(genre)
+    else:
+        signal_chain = _detailed_signal_chain(chain, knowledge.get("module_catalog", {}))
+        metering_fallback = knowledge.get("metering_targets", {}).get(genre)
     preset = {
         "generated_at": datetime.utcnow().isoformat() + "Z",
         "generation_seed": seed,
@@ -88,7 +539,7 @@ def build_preset(
         "chain_name": chain.get("name"),
         "source_signal_path_id": chain.get("source_signal_path_id"),
         "description": chain.get("description"),
-        "signal_chain": _detailed_signal_chain(chain, module_catalog),
+        "signal_chain": signal_chain,
         "macro_snapshot": chain.get("macro_snapshot", {}),
         "metering": chain.get("metering") or metering_fallback,
         "post_checks": chain.get("post_checks", []),
@@ -101,31 +552,178 @@ def _sanitize_filename(value: str) -> str:
     return "".join(char if char.isalnum() or char in {"-", "_"} else "-" for char in value.lower())
 
 
-def write_preset(preset: Dict[str, Any]) -> Path:
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+def _preset_path(preset: Dict[str, Any], include_seed: bool = False) -> Path:
     slug_components = [preset["genre"], preset.get("objective") or DEFAULT_OBJECTIVE, preset.get("chain_id", "chain")]
+    if include_seed and preset.get("generation_seed") is not None:
+        slug_components.append(f"seed{preset['generation_seed']}")
     slug = "_".join(filter(None, map(_sanitize_filename, slug_components)))
-    output_path = OUTPUT_DIR / f"{slug}.json"
+    return OUTPUT_DIR / f"{slug}.json"
+
+
+def write_preset(preset: Dict[str, Any]) -> Path:
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output_path = _preset_path(preset)
     output_path.write_text(json.dumps(preset, indent=2), encoding="utf-8")
     return output_path
 
 
+def _sync_directory(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # platforms without directory handles (Windows)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_presets(presets: Iterable[Dict[str, Any]]) -> List[Path]:
+    """Write a batch of presets (seed in the file name) and sync OUTPUT_DIR once at the end.
+
+    Presets that would share a file name, such as two seedless requests that picked the same chain,
+    get a counter appended instead of overwriting each other.
+    """
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    paths: List[Path] = []
+    used: Set[Path] = set()
+    for preset in presets:
+        output_path = base_path = _preset_path(preset, include_seed=True)
+        duplicate = 1
+        while output_path in used:
+            duplicate += 1
+            output_path = base_path.with_name(f"{base_path.stem}_{duplicate}{base_path.suffix}")
+        used.add(output_path)
+        output_path.write_text(json.dumps(preset, indent=2), encoding="utf-8")
+        paths.append(output_path)
+    _sync_directory(OUTPUT_DIR)
+    return paths
+
+
+@dataclass(frozen=True)
+class PresetRequest:
+    genre: str
+    objective: Optional[str] = None
+    seed: Optional[int] = None
+
+
+def matrix_requests(
+    index: KnowledgeIndex,
+    genres: Optional[Sequence[str]] = None,
+    objectives: Optional[Sequence[str]] = None,
+    seeds: Sequence[Optional[int]] = (None,),
+) -> List[PresetRequest]:
+    """Every genre x objective x seed combination; genres and objectives default to the whole index."""
+    return [
+        PresetRequest(genre, objective, seed)
+        for genre in genres or sorted(index.genre_chains)
+        for objective in objectives or index.objectives
+        for seed in seeds
+    ]
+
+
+def load_manifest(path: Path, index: KnowledgeIndex) -> List[PresetRequest]:
+    """Read batch requests from JSON.
+
+    Either a list of {"genre", "objective", "seed"} objects, or an object with optional
+    "genres", "objectives" and "seeds" lists that is expanded like --matrix. Entries without
+    a seed pick their chain at random.
+    """
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, dict):
+        return matrix_requests(index, data.get("genres"), data.get("objectives"), data.get("seeds") or [None])
+    if not isinstance(data, list):
+        raise ValueError(f"Manifest {path} must be a JSON list or object")
+    return [PresetRequest(item["genre"], item.get("objective"), item.get("seed")) for item in data]
+
+
+def generate_preset(index: KnowledgeIndex, request: PresetRequest) -> Dict[str, Any]:
+    # A generator per request: the same preset as a single run with --seed, whatever ran before
+    chain = select_chain(index, request.genre, request.objective, random.Random(request.seed))
+    return build_preset(index, chain, request.genre, request.objective, request.seed)
+
+
+_worker_index: Optional[KnowledgeIndex] = None
+
+
+def _init_worker(use_cache: bool) -> None:
+    global _worker_index
+    _worker_index = load_index(use_cache=use_cache)
+
+
+def _generate_in_worker(request: PresetRequest) -> Dict[str, Any]:
+    assert _worker_index is not None
+    return generate_preset(_worker_index, request)
+
+
+def generate_batch(
+    index: KnowledgeIndex, requests: Sequence[PresetRequest], jobs: int = 1, use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """Presets for all requests, in request order; jobs > 1 spreads them over a process pool."""
+    if jobs <= 1 or len(requests) < 2:
+        return [generate_preset(index, request) for request in requests]
+    jobs = min(jobs, len(requests))
+    chunksize = max(1, len(requests) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(use_cache,)) as pool:
+        return list(pool.map(_generate_in_worker, requests, chunksize=chunksize))
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Generate Ableton mastering preset JSON from knowledge base.")
     parser.add_argument("--genre", default="electronic", help="Genre key to use (matches knowledge base).")
     parser.add_argument("--objective", default=None, help="Optional objective tag (e.g., club_mix, balanced).")
     parser.add_argument("--seed", type=int, default=None, help="Optional random seed for reproducibility.")
     parser.add_argument("--dry-run", action="store_true", help="Print preset instead of writing to disk.")
+    parser.add_argument("--no-index-cache", action="store_true", help="Do not read or write the on-disk knowledge caches.")
+    parser.add_argument("--rebuild-index", action="store_true", help="Rebuild the cached knowledge indexes.")
+    batch = parser.add_argument_group("batch mode")
+    batch_source = batch.add_mutually_exclusive_group()
+    batch_source.add_argument(
+        "--matrix", action="store_true", help="Generate every genre x objective (x seed) combination in one run."
+    )
+    batch_source.add_argument("--manifest", type=Path, default=None, help="JSON file listing the presets to generate.")
+    batch.add_argument("--genres", nargs="+", default=None, help="Restrict --matrix to these genres.")
+    batch.add_argument("--objectives", nargs="+", default=None, help="Restrict --matrix to these objectives.")
+    batch.add_argument("--seeds", nargs="+", type=int, default=None, help="Seeds for --matrix (default: --seed).")
+    batch.add_argument("--jobs", type=int, default=1, help="Worker processes for batch mode.")
     return parser.parse_args()
 
 
+def run_batch(args: argparse.Namespace, index: KnowledgeIndex) -> None:
+    if args.manifest is not None:
+        requests = load_manifest(args.manifest, index)
+    else:
+        requests = matrix_requests(index, args.genres, args.objectives, args.seeds or [args.seed])
+    seedless = sum(request.seed is None for request in requests)
+    if seedless:
+        print(
+            f"Warning: {seedless} of {len(requests)} requests have no seed, their chains are random and "
+            "cannot be reproduced (pass --seeds with --matrix, or \"seed\"/\"seeds\" in the manifest).",
+            file=sys.stderr,
+        )
+    start = time.perf_counter()
+    presets = generate_batch(index, requests, jobs=args.jobs, use_cache=not args.no_index_cache)
+    if args.dry_run:
+        print(json.dumps(presets, indent=2))
+        return
+    paths = write_presets(presets)
+    elapsed = time.perf_counter() - start
+    rate = len(paths) / elapsed if elapsed else float("inf")
+    print(
+        f"{len(paths)} presets written to {OUTPUT_DIR.relative_to(PROJECT_ROOT)} "
+        f"in {elapsed:.2f}s ({rate:,.0f} presets/s, {max(args.jobs, 1)} job(s))"
+    )
+
+
 def main() -> None:
     args = parse_args()
-    if args.seed is not None:
-        random.seed(args.seed)
 
-    knowledge = load_knowledge()
-    chain = select_chain(knowledge, args.genre, args.objective)
+    if args.matrix or args.manifest is not None:
+        run_batch(args, load_index(use_cache=not args.no_index_cache, rebuild=args.rebuild_index))
+        return
+    # A single preset only needs one genre: decode it from the memory-mapped file
+    knowledge = open_knowledge(use_cache=not args.no_index_cache, rebuild=args.rebuild_index)
+    chain = select_chain(knowledge, args.genre, args.objective, random.Random(args.seed))
     preset = build_preset(knowledge, chain, args.genre, args.objective, args.seed)
 
     if args.dry_run:
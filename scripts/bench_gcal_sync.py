@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""Exercise gcal_sync against a local stub of the Calendar v3 HTTP API, batch endpoint included,
+driven by the real googleapiclient: HTTP calls of the batched sync against the old per-row upsert,
+delta runs from the state file (events deleted by hand included), concurrent workers under latency,
+a rate-limited flaky server, resuming from a checkpoint, and the Arrow vs xlsx input load."""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from email.parser import BytesParser
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import httplib2
+import pandas as pd
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+import gcal_sync as gs
+import vencimientos_tools as vt
+
+CALENDAR_ID = "bench@example.com"
+DISCOVERY = json.loads(get_static_doc("calendar", "v3"))
+CONCEPTOS = ["UTE", "OSE", "ANTEL", "BPS", "DGI", "Alquiler", "Tarjeta OCA", "Seguro", "Patente", "Contador"]
+ESTADOS = ["PENDIENTE", "PAGO", "BORRADORES", None]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes: without this every response waits on a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _handle(self) -> None:
+        stub = self.server.stub
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        time.sleep(stub.latency)
+        stub.count("http")
+        if self.path.startswith("/batch"):
+            stub.count("batch")
+            status = 200
+            content_type, payload = stub.batch(self.headers["Content-Type"], body)
+        else:
+            status, result = stub.call(self.command, self.path, body)
+            content_type, payload = "application/json", json.dumps(result).encode("utf-8") if result else b""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+
+class CalendarStub:
+    """In-memory events API of one calendar, served over HTTP on localhost.
+
+    latency delays every HTTP request, rate caps operations per second (the excess is answered
+    429 rateLimitExceeded), error_rate answers that share of operations with 503, and once
+    fail_after operations went through every further one is refused with a non-retryable 403.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        rate: Optional[float] = None,
+        error_rate: float = 0.0,
+        fail_after: Optional[int] = None,
+        seed: int = 0,
+    ) -> None:
+        self.events: Dict[str, dict] = {}
+        self.counts: Counter = Counter()
+        self.latency = latency
+        self.rate = rate
+        self.error_rate = error_rate
+        self.fail_after = fail_after
+        self._ids = itertools.count()
+        self._random = random.Random(seed)
+        self._tokens = rate or 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.root_url = f"http://127.0.0.1:{self._server.server_address[1]}/"
+
+    def __enter__(self) -> "CalendarStub":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def service(self):
+        # The batch endpoint is taken from the discovery document's rootUrl, not from api_endpoint
+        document = json.dumps(dict(DISCOVERY, rootUrl=self.root_url))
+        return build_from_document(document, http=httplib2.Http(timeout=60, proxy_info=None))
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def _error(self, status: int, reason: str) -> Tuple[int, dict]:
+        self.counts[status] += 1
+        return status, {"error": {"code": status, "message": reason, "errors": [{"reason": reason}]}}
+
+    def _admit(self) -> Optional[Tuple[int, dict]]:
+        self.counts["ops"] += 1
+        if self.fail_after is not None and self.counts["ops"] > self.fail_after:
+            return self._error(403, "forbidden")
+        if self.rate is not None:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return self._error(429, "rateLimitExceeded")
+            self._tokens -= 1
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self._error(503, "backendError")
+        return None
+
+    def _list(self, query: Dict[str, list]) -> dict:
+        self.counts["list"] += 1
+        first, last = query["timeMin"][0][:10], query["timeMax"][0][:10]
+        text = query.get("q", [None])[0]
+        items = [
+            event
+            for event in self.events.values()
+            if first <= event["start"]["date"] < last and (text is None or text in event.get("summary", ""))
+        ]
+        offset = int(query.get("pageToken", ["0"])[0])
+        size = int(query.get("maxResults", ["250"])[0])
+        page = {"items": items[offset : offset + size]}
+        if offset + size < len(items):
+            page["nextPageToken"] = str(offset + size)
+        return page
+
+    def call(self, method: str, target: str, body: bytes) -> Tuple[int, Optional[dict]]:
+        url = urlsplit(target)
+        # calendar/v3/calendars/{calendarId}/events[/{eventId}]
+        parts = url.path.strip("/").split("/")
+        event_id = unquote(parts[5]) if len(parts) > 5 else None
+        with self._lock:
+            refused = self._admit()
+            if refused is not None:
+                return refused
+            if method == "GET":
+                return 200, self._list(parse_qs(url.query))
+            if method == "POST":
+                event_id = f"ev{next(self._ids)}"
+                self.events[event_id] = dict(json.loads(body), id=event_id)
+                return 200, self.events[event_id]
+            if event_id not in self.events:
+                return self._error(404, "notFound")
+            if method == "PUT":
+                self.events[event_id] = dict(json.loads(body), id=event_id)
+                return 200, self.events[event_id]
+            del self.events[event_id]
+            return 204, None
+
+    def batch(self, content_type: str, body: bytes) -> Tuple[str, bytes]:
+        message = BytesParser().parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + body)
+        boundary = "batch_stub_boundary"
+        parts = []
+        for part in message.get_payload():
+            head, _, request_body = part.get_payload().replace("\r\n", "\n").partition("\n\n")
+            method, target, _ = head.split("\n", 1)[0].split(" ", 2)
+            status, result = self.call(method, target, request_body.encode("utf-8"))
+            content = json.dumps(result) if result else ""
+            # The client leaves spaces around "+" so long Content-IDs can be folded: unfold before echoing
+            content_id = " ".join(part["Content-ID"].split())[1:-1]
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\nContent-Type: application/json\r\n\r\n"
+                f"{content}\r\n"
+            )
+        payload = "".join(parts) + f"--{boundary}--\r\n"
+        return f"multipart/mixed; boundary={boundary}", payload.encode("utf-8")
+
+
+def legacy_upsert_event(service, calendar_id: str, row: pd.Series) -> None:
+    # Previous sync: one events().list per row to find a match by summary + date, then insert or update
+    fecha = row.get("fecha_vencimiento")
+    concepto = row.get("concepto") or "Vencimiento"
+    if pd.isna(fecha) or fecha is None:
+        return
+    if isinstance(fecha, str):
+        dt = datetime.fromisoformat(fecha)
+    elif isinstance(fecha, datetime):
+        dt = fecha
+    else:
+        dt = datetime.combine(fecha, datetime.min.time())
+    start = {"date": dt.date().isoformat()}
+    end = {"date": (dt.date() + timedelta(days=1)).isoformat()}
+    description_parts = []
+    if row.get("referencia"):
+        description_parts.append(f"Referencia: {row.get('referencia')}")
+    if row.get("estado"):
+        description_parts.append(f"Estado: {row.get('estado')}")
+    if row.get("importe_uy") or row.get("importe_usd"):
+        description_parts.append(f"Importe: {row.get('importe_uy') or row.get('importe_usd')}")
+    if row.get("alertas"):
+        description_parts.append(f"Alertas: {row.get('alertas')}")
+    body = {"summary": str(concepto), "description": "\n".join(description_parts), "start": start, "end": end}
+    existing = (
+        service.events()
+        .list(
+            calendarId=calendar_id,
+            timeMin=dt.replace(tzinfo=timezone.utc).isoformat(),
+            timeMax=(dt + timedelta(days=1)).replace(tzinfo=timezone.utc).isoformat(),
+            q=str(concepto),
+            singleEvents=True,
+            orderBy="startTime",
+        )
+        .execute()
+    )
+    items = existing.get("items", [])
+    if items:
+        service.events().update(calendarId=calendar_id, eventId=items[0]["id"], body=body).execute()
+    else:
+        service.events().insert(calendarId=calendar_id, body=body).execute()
+
+
+def vencimientos_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Consolidated rows shaped like consolidate_csvs output, one event each (unique referencia)."""
+    rng = random.Random(seed)
+    first = date(2025, 1, 1)
+    records = []
+    for index in range(rows):
+        fecha = first + timedelta(days=rng.randrange(730))
+        records.append(
+            {
+                "concepto": rng.choice(CONCEPTOS),
+                "referencia": f"REF-{index:06d}",
+                "fecha_vencimiento": fecha,
+                "importe_uy": round(rng.uniform(100, 50_000), 2) if rng.random() < 0.8 else None,
+                "importe_usd": round(rng.uniform(10, 2_000), 2) if rng.random() < 0.3 else None,
+                "estado": rng.choice(ESTADOS),
+                "fecha_pago": fecha - timedelta(days=rng.randrange(10)) if rng.random() < 0.4 else None,
+                "alertas": "revisar" if rng.random() < 0.1 else "",
+                "fuente_archivo": f"{fecha.strftime('%B').lower()}_{fecha.year}.csv",
+            }
+        )
+    return pd.DataFrame(records, columns=vt.UNIFIED_COLUMNS)
+
+
+def _changed(df: pd.DataFrame) -> pd.DataFrame:
+    # One row edited, ten rows gone from the source
+    changed = df.iloc[:-10].copy()
+    changed.loc[changed.index[0], "estado"] = "PAGO" if changed["estado"].iloc[0] != "PAGO" else "PENDIENTE"
+    return changed
+
+
+def _desired(df: pd.DataFrame) -> Dict[str, dict]:
+    bodies = {}
+    for row in df.to_dict("records"):
+        built = gs.build_event_body(row)
+        if built is not None:
+            bodies.setdefault(*built)
+    return bodies
+
+
+def calendar_matches(stub: CalendarStub, df: pd.DataFrame) -> bool:
+    """The stub holds exactly one event per source row, with the body gcal_sync would send."""
+    remote = {}
+    for event in stub.events.values():
+        key = event["extendedProperties"]["private"][gs.KEY_PROPERTY]
+        if key in remote:
+            return False
+        remote[key] = {field: value for field, value in event.items() if field != "id"}
+    return remote == _desired(df)
+
+
+def run_sync(stub: CalendarStub, df: pd.DataFrame, **options) -> Tuple[gs.SyncStats, float, Counter]:
+    before = Counter(stub.counts)
+    start = time.perf_counter()
+    stats = gs.sync_dataframe_to_calendar(
+        df, CALENDAR_ID, stub.service(), gs.SyncOptions(service_factory=stub.service, **options)
+    )
+    return stats, time.perf_counter() - start, stub.counts - before
+
+
+def _line(label: str, stats: gs.SyncStats, counts: Counter, seconds: Optional[float] = None) -> None:
+    timing = f" {seconds:7.2f}s" if seconds is not None else ""
+    print(
+        f"  {label:<30} http={counts['http']:5d} ins={stats.inserted:5d} upd={stats.updated:4d} "
+        f"del={stats.deleted:3d} unchanged={stats.unchanged:5d} failed={stats.failed}{timing}"
+    )
+
+
+def bench_calls(df: pd.DataFrame) -> int:
+    print(f"HTTP calls, {len(df)} rows, full mode (no state file)")
+    with CalendarStub() as stub:
+        service = stub.service()
+        start = time.perf_counter()
+        for _, row in df.iterrows():
+            legacy_upsert_event(service, CALENDAR_ID, row)
+        print(f"  {'per-row upsert (old)':<30} http={stub.counts['http']:5d} {time.perf_counter() - start:62.2f}s")
+    with CalendarStub() as stub:
+        for label, frame in (("first sync", df), ("no-op resync", df), ("1 change + 10 removed", _changed(df))):
+            stats, seconds, counts = run_sync(stub, frame)
+            _line(label, stats, counts, seconds)
+        same = calendar_matches(stub, _changed(df))
+        print(f"  calendar matches the source: {same}")
+    return int(not same)
+
+
+def bench_delta(df: pd.DataFrame, workdir: str) -> int:
+    print(f"delta runs from the state file, {len(df)} rows")
+    state = os.path.join(workdir, "delta_state.json")
+    with CalendarStub() as stub:
+        for label, frame in (("first sync", df), ("no-op rerun", df), ("1 change + 10 removed", _changed(df))):
+            stats, _, counts = run_sync(stub, frame, state_path=state)
+            _line(f"{label} ({stats.mode})", stats, counts)
+        # Events deleted by hand in the calendar: the state still points at them
+        current = _changed(df)
+        gone = list(stub.events)[:5]
+        for event_id in gone:
+            del stub.events[event_id]
+        edited = current.copy()
+        edited["alertas"] = "editado"
+        stats, _, counts = run_sync(stub, edited, state_path=state)
+        _line(f"{len(gone)} deleted remotely ({stats.mode})", stats, counts)
+        same = calendar_matches(stub, edited)
+        print(f"  calendar matches the source: {same}")
+        known = json.load(open(state, encoding="utf-8"))["events"]
+        known_ids = all(entry["id"] in stub.events for entry in known.values())
+        print(f"  state ids all exist remotely: {known_ids}")
+    return int(not same) + int(not known_ids)
+
+
+def bench_workers(df: pd.DataFrame, latency: float, workers: int) -> int:
+    print(f"{len(df)} inserts, {latency * 1000:.0f} ms per HTTP request")
+    mismatches = 0
+    for count in (1, workers):
+        with CalendarStub(latency=latency) as stub:
+            stats, seconds, counts = run_sync(stub, df, workers=count)
+            _line(f"{count} worker(s)", stats, counts, seconds)
+            mismatches += not calendar_matches(stub, df)
+    print(f"  calendar matches the source: {mismatches == 0}")
+    return mismatches
+
+
+def bench_flaky(df: pd.DataFrame, server_rate: float, client_rate: float, error_rate: float) -> int:
+    print(f"server limit {server_rate:.0f} ops/s, {error_rate:.0%} 503s, client bucket {client_rate:.0f}/s, 4 workers")
+    with CalendarStub(rate=server_rate, error_rate=error_rate) as stub:
+        stats, seconds, counts = run_sync(stub, df, workers=4, rate=client_rate)
+        _line("flaky server", stats, counts, seconds)
+        print(f"  429 answered: {counts[429]}  503 answered: {counts[503]}  retried ops: {stats.retried}")
+        same = calendar_matches(stub, df)
+        print(f"  calendar matches the source: {same}")
+    return int(not same)
+
+
+def bench_resume(df: pd.DataFrame, workdir: str, fail_after: int) -> int:
+    print(f"resume: server refuses every operation after {fail_after}")
+    state = os.path.join(workdir, "resume_state.json")
+    checkpoint = os.path.join(workdir, "resume_checkpoint.json")
+    with CalendarStub(fail_after=fail_after) as stub:
+        stats, _, counts = run_sync(stub, df, state_path=state, checkpoint_path=checkpoint)
+        _line("interrupted run", stats, counts)
+        kept = os.path.exists(checkpoint)
+        print(f"  checkpoint kept: {kept}")
+        stub.fail_after = None
+        stats, _, counts = run_sync(stub, df, state_path=state, checkpoint_path=checkpoint)
+        _line("resumed run", stats, counts)
+        print(f"  resumed={stats.resumed} replayed ops={counts['ops']} list calls={counts['list']}")
+        stats, _, counts = run_sync(stub, df, state_path=state, full_resync=True)
+        _line("full resync afterwards", stats, counts)
+        same = calendar_matches(stub, df)
+        print(f"  calendar matches the source: {same}")
+    return int(not kept) + int(not same)
+
+
+def bench_load(rows: int, workdir: str) -> int:
+    df = vencimientos_frame(rows, seed=1)
+    xlsx = os.path.join(workdir, "Calendario_Vencimientos_Completo.xlsx")
+    arrow = os.path.join(workdir, "Calendario_Vencimientos_Completo.arrow")
+    vt.export_excel_with_data(df, xlsx)
+    vt.export_arrow(df, arrow)
+    results = {}
+    for label, path in (("xlsx", xlsx), ("arrow", arrow)):
+        start = time.perf_counter()
+        loaded, _ = gs.load_vencimientos(path, xlsx, "Calendario")
+        results[label] = (time.perf_counter() - start, _desired(loaded))
+    print(f"input load, {rows} rows")
+    for label, (seconds, _) in results.items():
+        print(f"  {label:<6} {seconds:8.3f}s")
+    same = results["xlsx"][1] == results["arrow"][1] == _desired(df)
+    print(f"  same event bodies: {same}")
+    return int(not same)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_400, help="rows synced in every scenario")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per HTTP request in the workers run")
+    parser.add_argument("--workers", type=int, default=4, help="workers compared against a sequential run")
+    parser.add_argument("--server-rate", type=float, default=400.0, help="operations per second the stub accepts")
+    parser.add_argument("--client-rate", type=float, default=350.0, help="gcal_sync token bucket for the flaky run")
+    parser.add_argument("--error-rate", type=float, default=0.03, help="share of operations answered 503")
+    parser.add_argument("--fail-after", type=int, default=1_000, help="operations before the resume run is cut off")
+    parser.add_argument("--load-rows", type=int, default=33_000, help="rows for the Arrow vs xlsx load, 0 skips it")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    df = vencimientos_frame(args.rows)
+    with tempfile.TemporaryDirectory() as workdir:
+        mismatches = bench_calls(df)
+        mismatches += bench_delta(df, workdir)
+        mismatches += bench_workers(df, args.latency, args.workers)
+        mismatches += bench_flaky(df, args.server_rate, args.client_rate, args.error_rate)
+        mismatches += bench_resume(df, workdir, args.fail_after)
+        if args.load_rows:
+            mismatches += bench_load(args.load_rows, workdir)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,772 @@
+#!/usr/bin/env python3
+"""Benchmark vencimientos_tools against the previous row-by-row implementations on a synthetic CSV
+corpus and check that every output is unchanged: consolidation (sequential and with workers), the
+per-file cache, the memoized parsers, dedup, validation, the ICS writer, the Excel exports (values
+and styles, template included) and the bounded-memory --stream mode (tracemalloc peak against the
+in-memory path).
+
+The defaults finish in a few minutes; --rows 1000000 and --stream-rows 5000000 reproduce the large
+runs quoted in the commit messages (the legacy consolidation alone then takes several minutes)."""
+
+import argparse
+import csv
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from copy import copy
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from dateutil import parser as date_parser
+from openpyxl import load_workbook
+
+import vencimientos_tools as vt
+
+try:
+    from ics import Calendar, DisplayAlarm, Event
+except ImportError:  # dropped from requirements.txt; only the legacy ICS writer needs it
+    Calendar = None
+
+SOURCE_HEADERS = [
+    ["Concepto ", "Referencia", "Fecha de vencimiento", "Importe $", "Importe U$S", "Estado", "Fecha de pago", "Alertas"],
+    ["concepto", "referencia", "fecha_vencimiento", "importe_uy", "importe usd", "estado", "fecha_pago", "alertas"],
+    ["Concepto", "Fecha", "Importe", "Estado"],
+]
+CONCEPTOS = ["UTE", "OSE", "ANTEL", "BPS", "DGI", "Alquiler", "Tarjeta OCA", "Seguro auto", "Patente", "Contador", ""]
+ESTADOS_CRUDOS = ["Pendiente", "pago", "Se debita (pago)", "en borradores", "PAGAMOS $", "impreso", "", "-", "a revisar"]
+IMPORTES = ["$ 1.234,56", "1234.5", "U$S 300", "1,234.56", "980", "", "n/a", "-15,5", "UY$ 12.000"]
+
+
+def _fecha_cell(rng: random.Random, day: date) -> str:
+    style = rng.randrange(9)
+    if style == 0:
+        return f"{day.day}/{day.month}"
+    if style == 1:
+        return f"{day.day:02d}-{day.month:02d}-{day.year}"
+    if style == 2:
+        return f"{day.day:02d}.{day.month:02d}.{day.year}"
+    if style == 3:
+        return day.isoformat()
+    if style == 4:
+        return str(day.day)
+    if style == 5:
+        return rng.choice(["", "a confirmar", "31/02/2024"])
+    return f"{day.day:02d}/{day.month:02d}/{day.year}"
+
+
+def write_corpus(directory: str, rows: int, files: int, seed: int = 0) -> None:
+    """Monthly CSV exports with mixed headers, date and amount formats, filler rows and heavy duplication,
+    plus a header-only file and an unreadable one."""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    months = list(vt.SPANISH_MONTHS)
+    referencias = [f"REF-{index:04d}" for index in range(400)] + [""]
+    per_file = max(1, rows // files)
+    for index in range(files):
+        year = 2023 + index // 12
+        name = f"{months[index % len(months)]}_{year}.csv" if index % 5 else f"{months[index % len(months)]}.csv"
+        header = SOURCE_HEADERS[index % len(SOURCE_HEADERS)]
+        with open(os.path.join(directory, name), "w", encoding="utf-8", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(header)
+            for _ in range(per_file):
+                if rng.random() < 0.02:
+                    writer.writerow([""] * len(header))
+                    continue
+                day = date(year, 1, 1) + timedelta(days=rng.randrange(365))
+                values = {
+                    "concepto": rng.choice(CONCEPTOS),
+                    "referencia": rng.choice(referencias),
+                    "fecha": _fecha_cell(rng, day),
+                    "importe": rng.choice(IMPORTES),
+                    "usd": rng.choice(IMPORTES[2:]),
+                    "estado": rng.choice(ESTADOS_CRUDOS),
+                    "pago": _fecha_cell(rng, day) if rng.random() < 0.3 else "",
+                    "alertas": "revisar" if rng.random() < 0.1 else "",
+                }
+                if len(header) == 4:
+                    writer.writerow([values["concepto"], values["fecha"], values["importe"], values["estado"]])
+                else:
+                    writer.writerow([values[key] for key in ("concepto", "referencia", "fecha", "importe", "usd", "estado", "pago", "alertas")])
+    with open(os.path.join(directory, "solo_encabezado.csv"), "w", encoding="utf-8") as handle:
+        handle.write(",".join(SOURCE_HEADERS[0]) + "\n")
+    with open(os.path.join(directory, "roto.csv"), "wb") as handle:
+        handle.write(b"Concepto,Fecha\n\xff\xfe\x00garbage\n")
+
+
+# Previous implementations, kept verbatim apart from the legacy_ prefix
+
+
+def legacy_infer_year_month_from_filename(filename: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    if not filename:
+        return (None, None)
+    name = str(filename).lower().replace(".csv", "").strip()
+    year: Optional[int] = None
+    month: Optional[int] = None
+    parts = name.split("_")
+    for p in reversed(parts):
+        if p.isdigit() and len(p) == 4:
+            year = int(p)
+            break
+    for m_name, m_num in vt.SPANISH_MONTHS.items():
+        if m_name in name:
+            month = m_num
+            break
+    return (year, month)
+
+
+def legacy_parse_date(value: object) -> Optional[date]:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.date() if isinstance(value, datetime) else value
+    s = str(value).strip()
+    if not s or s.lower() in {"nan", "none", "-"}:
+        return None
+    try:
+        dt = date_parser.parse(s, dayfirst=True, fuzzy=True)
+        return dt.date()
+    except Exception:
+        return None
+
+
+def legacy_parse_date_with_context(value: object, source_filename: Optional[str]) -> Optional[date]:
+    dt = legacy_parse_date(value)
+    if dt is not None:
+        return dt
+    try:
+        if value is None:
+            return None
+        s = str(value).strip()
+        if not s:
+            return None
+        year_hint, month_hint = legacy_infer_year_month_from_filename(source_filename)
+        sep = "/" if "/" in s else ("-" if "-" in s else None)
+        if sep:
+            parts = [p for p in s.replace(" ", "").split(sep) if p]
+            if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+                d = int(parts[0])
+                m = int(parts[1]) if parts[1] else (month_hint or 1)
+                y = year_hint or datetime.utcnow().year
+                return date(y, m, d)
+            if len(parts) == 1 and parts[0].isdigit() and month_hint:
+                d = int(parts[0])
+                y = year_hint or datetime.utcnow().year
+                return date(y, month_hint, d)
+    except Exception:
+        return None
+    return None
+
+
+def legacy_parse_number(value: object) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        if isinstance(value, str):
+            s = value.strip()
+            if not s:
+                return None
+            s_clean = s
+            for tok in ["U$S", "USD", "$", "U$", "US$", "uy$", "UY$"]:
+                s_clean = s_clean.replace(tok, "")
+            match = re.search(r"[-+]?[0-9]{1,3}(?:[\.,][0-9]{3})*(?:[\.,][0-9]+)?|[-+]?[0-9]+(?:[\.,][0-9]+)?", s_clean)
+            if not match:
+                return None
+            num = match.group(0)
+            if "," in num and "." in num:
+                num = num.replace(",", "")
+            elif "," in num and "." not in num:
+                num = num.replace(",", ".")
+            num = num.replace(" ", "")
+            return float(num)
+        if pd.isna(value):
+            return None
+        return float(value)
+    except Exception:
+        return None
+
+
+def legacy_read_all_csvs(directory: str) -> List[pd.DataFrame]:
+    dataframes: List[pd.DataFrame] = []
+    for entry in sorted(os.listdir(directory)):
+        if not entry.lower().endswith(".csv"):
+            continue
+        path = os.path.join(directory, entry)
+        try:
+            df = pd.read_csv(path, dtype=str, keep_default_na=False)
+            df["__fuente_archivo"] = entry
+            dataframes.append(df)
+        except Exception:
+            continue
+    return dataframes
+
+
+def legacy_normalize_estado(val: Optional[str]) -> Optional[str]:
+    if val is None:
+        return None
+    s = str(val).strip().lower()
+    if not s or s in {"nan", "none", "-"}:
+        return None
+    replacements = {
+        "en borradores": "BORRADORES",
+        "borradores": "BORRADORES",
+        "borrador": "BORRADORES",
+        "pendiente": "PENDIENTE",
+        "pendientes": "PENDIENTE",
+        "pendiente de pago": "PENDIENTE",
+        "se debita (pendiente)": "PENDIENTE",
+        "se debita (pago)": "PAGO",
+        "pago": "PAGO",
+        "pagamos": "PAGO",
+        "pagamos $": "PAGO",
+        "pagamos minimos": "PAGO",
+        "se pagó": "PAGO",
+        "pagar en red pagos": "PENDIENTE",
+        "impreso": "PENDIENTE",
+    }
+    for key, target in replacements.items():
+        if key in s:
+            return target
+    return s.upper()
+
+
+def legacy_normalize_rows(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    normalized_rows: List[dict] = []
+    for df in frames:
+        cols_lower = {c.lower().strip(): c for c in df.columns}
+        concepto_col = cols_lower.get("concepto ") or cols_lower.get("concepto")
+        referencia_col = cols_lower.get("referencia")
+        fecha_col = cols_lower.get("fecha de vencimiento") or cols_lower.get("fecha_vencimiento") or cols_lower.get("fecha")
+        importe_uy_col = cols_lower.get("importe $") or cols_lower.get("importe_uy") or cols_lower.get("importe")
+        importe_usd_col = cols_lower.get("importe u$s") or cols_lower.get("importe usd")
+        estado_col = cols_lower.get("estado")
+        fecha_pago_col = cols_lower.get("fecha de pago") or cols_lower.get("fecha_pago")
+        alertas_col = cols_lower.get("alertas")
+        fuente_archivo_col = "__fuente_archivo"
+
+        for _, row in df.iterrows():
+            concepto = str(row.get(concepto_col, "")).strip() if concepto_col else ""
+            if not concepto and not str(row.get(fecha_col, "")).strip():
+                continue
+            rec = {
+                "concepto": concepto,
+                "referencia": str(row.get(referencia_col, "")).strip() if referencia_col else None,
+                "fecha_vencimiento": legacy_parse_date_with_context(row.get(fecha_col), row.get(fuente_archivo_col)) if fecha_col else None,
+                "importe_uy": legacy_parse_number(row.get(importe_uy_col)) if importe_uy_col else None,
+                "importe_usd": legacy_parse_number(row.get(importe_usd_col)) if importe_usd_col else None,
+                "estado": legacy_normalize_estado(str(row.get(estado_col, "")).strip()) if estado_col else None,
+                "fecha_pago": legacy_parse_date(row.get(fecha_pago_col)) if fecha_pago_col else None,
+                "alertas": str(row.get(alertas_col, "")).strip() if alertas_col else None,
+                "fuente_archivo": row.get(fuente_archivo_col),
+            }
+            if not rec["concepto"]:
+                if rec["referencia"] or (rec["importe_uy"] is not None) or (rec["importe_usd"] is not None):
+                    rec["concepto"] = "OTROS"
+            if not rec["concepto"] and not rec["fecha_vencimiento"]:
+                continue
+            normalized_rows.append(rec)
+    return pd.DataFrame(normalized_rows, columns=vt.UNIFIED_COLUMNS)
+
+
+def legacy_deduplicate(result: pd.DataFrame) -> pd.DataFrame:
+    helpers = ["__has_importe_uy", "__has_importe_usd", "__has_estado", "__has_fecha_pago", "__has_alertas"]
+    for helper, col in zip(helpers, ["importe_uy", "importe_usd", "estado", "fecha_pago", "alertas"]):
+        result[helper] = result[col].notna()
+    result.sort_values(
+        by=["concepto", "fecha_vencimiento"] + helpers,
+        ascending=[True, True, False, False, False, False, False],
+        inplace=True,
+        na_position="last",
+    )
+    result = result.drop_duplicates(subset=["concepto", "fecha_vencimiento", "referencia"], keep="first")
+    result = result.drop_duplicates(subset=["concepto", "fecha_vencimiento", "referencia"], keep="first")
+    result.drop(columns=helpers, inplace=True, errors="ignore")
+    return result.reset_index(drop=True)
+
+
+def legacy_consolidate_csvs(directory: str) -> pd.DataFrame:
+    frames = legacy_read_all_csvs(directory)
+    if not frames:
+        return pd.DataFrame(columns=vt.UNIFIED_COLUMNS)
+    return legacy_deduplicate(legacy_normalize_rows(frames))
+
+
+def legacy_validate(df: pd.DataFrame) -> pd.DataFrame:
+    problems: List[dict] = []
+    allowed_estados = {"BORRADORES", "PENDIENTE", "PAGO"}
+    for idx, row in df.iterrows():
+        issues: List[str] = []
+        if not row.get("concepto"):
+            issues.append("concepto_vacio")
+        if pd.isna(row.get("fecha_vencimiento")) or row.get("fecha_vencimiento") is None:
+            issues.append("sin_fecha_vencimiento")
+        if pd.isna(row.get("importe_uy")) and pd.isna(row.get("importe_usd")):
+            issues.append("sin_importe")
+        estado_val = row.get("estado")
+        if estado_val and estado_val not in allowed_estados:
+            issues.append("estado_no_normalizado")
+        if issues:
+            problems.append(
+                {
+                    "row_index": idx,
+                    "concepto": row.get("concepto"),
+                    "referencia": row.get("referencia"),
+                    "fecha_vencimiento": row.get("fecha_vencimiento"),
+                    "estado": estado_val,
+                    "problemas": ",".join(issues),
+                    "fuente_archivo": row.get("fuente_archivo"),
+                }
+            )
+    return pd.DataFrame(problems)
+
+
+def legacy_export_ics(df: pd.DataFrame, output_path: str, reminders_days: List[int]) -> None:
+    cal = Calendar()
+    for _, row in df.iterrows():
+        fecha = row.get("fecha_vencimiento")
+        concepto = row.get("concepto") or "Vencimiento"
+        if pd.isna(fecha) or fecha is None:
+            continue
+        if isinstance(fecha, str):
+            fecha_dt = legacy_parse_date(fecha)
+        elif isinstance(fecha, (datetime, date)):
+            fecha_dt = fecha if isinstance(fecha, date) else fecha.date()
+        else:
+            fecha_dt = None
+        if not fecha_dt:
+            continue
+        event = Event()
+        event.name = str(concepto)
+        event.begin = datetime.combine(fecha_dt, datetime.min.time())
+        event.make_all_day()
+        detalles = []
+        for label, value in (
+            ("Referencia", row.get("referencia")),
+            ("Estado", row.get("estado")),
+            ("Importe", row.get("importe_uy") or row.get("importe_usd")),
+            ("Alertas", row.get("alertas")),
+        ):
+            if value:
+                detalles.append(f"{label}: {value}")
+        event.description = "\n".join(detalles)
+        for days_before in reminders_days:
+            event.alarms.append(DisplayAlarm(trigger=timedelta(days=-int(days_before)), display_text=str(concepto)))
+        cal.events.add(event)
+    with open(output_path, "w", encoding="utf-8") as f, warnings.catch_warnings():
+        # ics 0.7 warns that iterating a Calendar will change in 0.8; the old exporter relied on it
+        warnings.simplefilter("ignore", FutureWarning)
+        f.writelines(cal)
+
+
+def legacy_export_excel_with_data(df: pd.DataFrame, output_path: str) -> None:
+    df = df[vt.UNIFIED_COLUMNS]
+    with pd.ExcelWriter(output_path, engine="xlsxwriter") as writer:
+        sheet_name = "Calendario"
+        df.to_excel(writer, index=False, sheet_name=sheet_name, startrow=1)
+        workbook = writer.book
+        worksheet = writer.sheets[sheet_name]
+        title_format = workbook.add_format({"bold": True, "font_size": 16, "align": "left", "valign": "vcenter"})
+        worksheet.write(0, 0, "Calendario de Vencimientos", title_format)
+        header_format = workbook.add_format(
+            {
+                "bold": True,
+                "bg_color": "#0F4C81",
+                "font_color": "#FFFFFF",
+                "border": 1,
+                "align": "center",
+                "valign": "vcenter",
+            }
+        )
+        for col_idx, col_name in enumerate(vt.UNIFIED_COLUMNS):
+            worksheet.write(1, col_idx, col_name, header_format)
+        widths = [28, 24, 16, 14, 14, 16, 14, 36, 22]
+        for i, w in enumerate(widths):
+            worksheet.set_column(i, i, w)
+        date_format = workbook.add_format({"num_format": "yyyy-mm-dd"})
+        money_format = workbook.add_format({"num_format": "$ #,##0.00"})
+        worksheet.set_column(2, 2, widths[2], date_format)
+        worksheet.set_column(3, 3, widths[3], money_format)
+        worksheet.set_column(4, 4, widths[4], money_format)
+        worksheet.set_column(6, 6, widths[6], date_format)
+        worksheet.freeze_panes(2, 0)
+
+
+def legacy_export_excel_template(output_path: str) -> None:
+    df = pd.DataFrame(columns=vt.UNIFIED_COLUMNS)
+    with pd.ExcelWriter(output_path, engine="xlsxwriter") as writer:
+        sheet_name = "Calendario"
+        df.to_excel(writer, index=False, sheet_name=sheet_name, startrow=1)
+        workbook = writer.book
+        worksheet = writer.sheets[sheet_name]
+        title_format = workbook.add_format({"bold": True, "font_size": 16, "align": "left", "valign": "vcenter"})
+        worksheet.write(0, 0, "Plantilla - Calendario de Vencimientos", title_format)
+        header_format = workbook.add_format(
+            {
+                "bold": True,
+                "bg_color": "#0F4C81",
+                "font_color": "#FFFFFF",
+                "border": 1,
+                "align": "center",
+                "valign": "vcenter",
+            }
+        )
+        for col_idx, col_name in enumerate(vt.UNIFIED_COLUMNS):
+            worksheet.write(1, col_idx, col_name, header_format)
+        widths = [28, 24, 16, 14, 14, 16, 14, 36, 22]
+        for i, w in enumerate(widths):
+            worksheet.set_column(i, i, w)
+        date_format = workbook.add_format({"num_format": "yyyy-mm-dd"})
+        money_format = workbook.add_format({"num_format": "$ #,##0.00"})
+        worksheet.set_column(2, 2, widths[2], date_format)
+        worksheet.set_column(3, 3, widths[3], money_format)
+        worksheet.set_column(4, 4, widths[4], money_format)
+        worksheet.set_column(6, 6, widths[6], date_format)
+        estados = ["BORRADORES", "PENDIENTE", "PAGO", "EN BORRADORES"]
+        worksheet.data_validation(
+            2,
+            5,
+            1000,
+            5,
+            {
+                "validate": "list",
+                "source": estados,
+                "error_title": "Estado inválido",
+                "error_message": "Seleccione un estado de la lista",
+            },
+        )
+        worksheet.freeze_panes(2, 0)
+        note_format = workbook.add_format({"font_color": "#555555", "italic": True})
+        worksheet.write(1002, 0, "Notas: utilice formato yyyy-mm-dd para las fechas.", note_format)
+
+
+def _timed(func: Callable, *args) -> Tuple[float, object]:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def _same_frame(expected: pd.DataFrame, actual: pd.DataFrame, label: str) -> bool:
+    try:
+        pd.testing.assert_frame_equal(actual, expected)
+    except AssertionError as exc:
+        print(f"{label} mismatch:\n{exc}", file=sys.stderr)
+        return False
+    return True
+
+
+def _report(label: str, rows: int, seconds: float, baseline: float) -> None:
+    print(f"  {label:<26} {seconds:8.3f}s {rows / seconds:12,.0f} rows/s  x{baseline / seconds:.1f}")
+
+
+def _clear_parser_caches() -> None:
+    for func in (vt._parse_date_text, vt._parse_date_from_hint, vt._parse_number_text):
+        func.cache_clear()
+
+
+def check_consolidate(corpus: str, workers: int) -> Tuple[pd.DataFrame, int]:
+    legacy_seconds, expected = _timed(legacy_consolidate_csvs, corpus)
+    _clear_parser_caches()
+    seconds, actual = _timed(vt.consolidate_csvs, corpus)
+    print(f"consolidate_csvs: {len(expected)} rows after dedup")
+    _report("legacy iterrows", len(expected), legacy_seconds, legacy_seconds)
+    _report("vectorized", len(expected), seconds, legacy_seconds)
+    pooled_seconds, pooled = _timed(lambda: vt.consolidate_csvs(corpus, workers=workers))
+    _report(f"vectorized, {workers} workers", len(expected), pooled_seconds, legacy_seconds)
+    same = _same_frame(expected, actual, "consolidate") and _same_frame(expected, pooled, "workers")
+    print(f"  identical to the legacy output: {same}")
+    return actual, int(not same)
+
+
+def check_cache(corpus: str, workdir: str, reference: pd.DataFrame) -> int:
+    cache_dir = os.path.join(workdir, "cache")
+    expected_report = vt._validate(reference).to_csv(index=False).encode("utf-8")
+    print("per-file cache")
+    same = True
+    for run, rebuild in (("cold", False), ("warm", False), ("after touch", False), ("rebuild", True)):
+        if run == "after touch":
+            # Fresh checkouts only change mtimes: the sha256 must still give hits
+            for entry in os.listdir(corpus):
+                os.utime(os.path.join(corpus, entry), None)
+        stats: List[vt.IngestStat] = []
+        seconds, frame = _timed(lambda: vt.consolidate_csvs(corpus, stats=stats, cache_dir=cache_dir, rebuild_cache=rebuild))
+        hits = sum(stat.cached for stat in stats)
+        report = vt._validate(frame).to_csv(index=False).encode("utf-8")
+        same = same and _same_frame(reference, frame, f"cache {run}") and report == expected_report
+        print(f"  {run:<12} {seconds:8.3f}s  {hits}/{len(stats)} files from cache")
+    print(f"  frames and validation CSV byte-identical to the uncached run: {same}")
+    return int(not same)
+
+
+def bench_parsers(cells: int) -> int:
+    rng = random.Random(1)
+    filenames = ["abril_2024.csv", "mayo.csv", "setiembre_2023.csv", "otros.csv", None]
+    days = [date(2024, 1, 1) + timedelta(days=offset) for offset in range(366)]
+    distinct_dates = sorted({_fecha_cell(rng, day) for day in days for _ in range(3)})
+    grid = [(value, name) for value in distinct_dates for name in filenames]
+    amounts = sorted(set(IMPORTES) | {f"$ {rng.randrange(10**6):,}".replace(",", ".") + ",50" for _ in range(2000)})
+    mismatches = sum(legacy_parse_date_with_context(v, n) != vt._parse_date_with_context(v, n) for v, n in grid)
+    mismatches += sum(legacy_parse_date(v) != vt._parse_date(v) for v, _ in grid)
+    mismatches += sum(legacy_parse_number(v) != vt._parse_number(v) for v in amounts)
+    print(f"parsers: {len(grid)} date/filename combinations and {len(amounts)} amounts, mismatches: {mismatches}")
+
+    # Exports repeat a few hundred distinct cells many times
+    date_cells = [rng.choice(grid) for _ in range(cells)]
+    amount_cells = [rng.choice(amounts) for _ in range(cells)]
+    _clear_parser_caches()
+    for label, legacy, current, sample in (
+        ("dates", lambda: [legacy_parse_date_with_context(v, n) for v, n in date_cells], lambda: [vt._parse_date_with_context(v, n) for v, n in date_cells], cells),
+        ("amounts", lambda: [legacy_parse_number(v) for v in amount_cells], lambda: [vt._parse_number(v) for v in amount_cells], cells),
+    ):
+        legacy_seconds, _ = _timed(legacy)
+        seconds, _ = _timed(current)
+        print(f"  {label:<8} legacy {sample / legacy_seconds:12,.0f}/s  memoized {sample / seconds:12,.0f}/s  x{legacy_seconds / seconds:.1f}")
+    return mismatches
+
+
+def _random_frame(rng: random.Random, rows: int) -> pd.DataFrame:
+    def maybe(value):
+        return value if rng.random() < 0.6 else None
+
+    records = [
+        {
+            "concepto": rng.choice(["A", "B", "C"]),
+            "referencia": rng.choice(["r1", "r2", "", None]),
+            "fecha_vencimiento": rng.choice([date(2024, 1, 1), date(2024, 1, 2), None]),
+            "importe_uy": maybe(float(rng.randrange(5))),
+            "importe_usd": maybe(float(rng.randrange(5))),
+            "estado": maybe(rng.choice(["PAGO", "PENDIENTE"])),
+            "fecha_pago": maybe(date(2024, 1, 3)),
+            "alertas": maybe("x"),
+            "fuente_archivo": f"f{rng.randrange(3)}.csv",
+        }
+        for _ in range(rows)
+    ]
+    return pd.DataFrame(records, columns=vt.UNIFIED_COLUMNS)
+
+
+def check_dedup(corpus: str, random_frames: int) -> int:
+    rng = random.Random(2)
+    same = all(
+        _same_frame(legacy_deduplicate(frame.copy()), vt._deduplicate(frame), "random dedup")
+        for frame in (_random_frame(rng, rng.randrange(1, 60)) for _ in range(random_frames))
+    )
+    frames, _ = vt._ingest_csvs(corpus)
+    result = vt._concat_normalized(frames)
+    legacy_seconds, expected = _timed(legacy_deduplicate, result.copy())
+    seconds, actual = _timed(vt._deduplicate, result)
+    same = same and _same_frame(expected, actual, "corpus dedup")
+    print(f"dedup: {len(result)} normalized rows -> {len(actual)}")
+    _report("sort + drop_duplicates", len(result), legacy_seconds, legacy_seconds)
+    _report("keyed linear pass", len(result), seconds, legacy_seconds)
+    print(f"  identical on the corpus and {random_frames} random frames: {same}")
+    return int(not same)
+
+
+def check_validate(df: pd.DataFrame) -> int:
+    legacy_seconds, expected = _timed(legacy_validate, df)
+    seconds, actual = _timed(vt._validate, df)
+    same = expected.to_csv(index=False) == actual.to_csv(index=False)
+    print(f"validation: {len(df)} rows, {len(actual)} flagged")
+    _report("iterrows", len(df), legacy_seconds, legacy_seconds)
+    _report("rule masks", len(df), seconds, legacy_seconds)
+    print(f"  report CSV byte-identical: {same}")
+    return int(not same)
+
+
+def _peak(func: Callable, *args) -> Tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / (1 << 20)
+
+
+def _ics_events(path: str) -> List[tuple]:
+    # Unfold, then keep what both writers must agree on: date, summary and alarm triggers
+    with open(path, encoding="utf-8", newline="") as handle:
+        text = re.sub(r"\r?\n[ \t]", "", handle.read())
+    events = []
+    for block in re.findall(r"BEGIN:VEVENT(.*?)END:VEVENT", text, re.S):
+        fields = dict(re.findall(r"^(DTSTART[^:]*|SUMMARY):(.*?)\r?$", block, re.M))
+        triggers = tuple(sorted(re.findall(r"^TRIGGER:(.*?)\r?$", block, re.M)))
+        events.append((fields.get("DTSTART;VALUE=DATE"), fields.get("SUMMARY"), triggers))
+    return sorted(events)
+
+
+def bench_ics(df: pd.DataFrame, workdir: str) -> int:
+    reminders = [3, 1]
+    current_path = os.path.join(workdir, "current.ics")
+    seconds, peak = _peak(vt.export_ics, df, current_path, reminders)
+    print(f"ICS: {len(df)} rows")
+    if Calendar is None:
+        print(f"  {'direct writer':<26} {seconds:8.3f}s {len(df) / seconds:12,.0f} rows/s  peak {peak:7.1f} MiB")
+        print("  ics package not installed: legacy writer skipped")
+        return 0
+    legacy_path = os.path.join(workdir, "legacy.ics")
+    legacy_seconds, legacy_peak = _peak(legacy_export_ics, df, legacy_path, reminders)
+    print(f"  {'ics library':<26} {legacy_seconds:8.3f}s {len(df) / legacy_seconds:12,.0f} rows/s  peak {legacy_peak:7.1f} MiB")
+    print(f"  {'direct writer':<26} {seconds:8.3f}s {len(df) / seconds:12,.0f} rows/s  peak {peak:7.1f} MiB")
+    with open(current_path, encoding="utf-8", newline="") as handle:
+        parsed = Calendar(handle.read())
+    same = _ics_events(legacy_path) == _ics_events(current_path)
+    print(f"  same dates, summaries and alarms: {same}; ics parser reads {len(parsed.events)} events back")
+    return int(not same)
+
+
+def _sheet_values(path: str) -> List[tuple]:
+    workbook = load_workbook(path, read_only=True)
+    values = [row for row in workbook["Calendario"].iter_rows(values_only=True)]
+    workbook.close()
+    return values
+
+
+def _sheet_layout(path: str, sheet: str) -> dict:
+    """Column widths and formats, frozen panes, validations, and value plus styles of every written cell."""
+    workbook = load_workbook(path)
+    worksheet = workbook[sheet]
+    styles: Dict[int, tuple] = {}
+
+    def style(cell) -> tuple:
+        # Copying the style proxies is slow and a sheet only has a handful of distinct styles
+        if cell.style_id not in styles:
+            styles[cell.style_id] = (
+                cell.number_format,
+                copy(cell.font),
+                copy(cell.fill),
+                copy(cell.border),
+                copy(cell.alignment),
+            )
+        return styles[cell.style_id]
+
+    layout = {
+        "columns": {
+            (dimension.min, dimension.max): (dimension.width, dimension.number_format)
+            for dimension in worksheet.column_dimensions.values()
+        },
+        "freeze_panes": worksheet.freeze_panes,
+        "validations": [(str(rule.sqref), rule.formula1) for rule in worksheet.data_validations.dataValidation],
+        "cells": {
+            cell.coordinate: (cell.value, style(cell))
+            for row in worksheet.iter_rows()
+            for cell in row
+            if cell.value is not None or cell.has_style
+        },
+    }
+    workbook.close()
+    return layout
+
+
+def bench_excel(df: pd.DataFrame, workdir: str) -> int:
+    legacy_path, current_path = os.path.join(workdir, "legacy.xlsx"), os.path.join(workdir, "current.xlsx")
+    legacy_seconds, _ = _timed(legacy_export_excel_with_data, df, legacy_path)
+    seconds, _ = _timed(vt.export_excel_with_data, df, current_path)
+    print(f"Excel data workbook: {len(df)} rows")
+    _report("DataFrame.to_excel", len(df), legacy_seconds, legacy_seconds)
+    _report("constant_memory writer", len(df), seconds, legacy_seconds)
+    same_values = _sheet_values(legacy_path) == _sheet_values(current_path)
+    print(f"  same cell values: {same_values}")
+    # Widths, number formats, fonts, fills and frozen panes, on top of the values
+    legacy_data = _sheet_layout(legacy_path, "Calendario")
+    same_data = legacy_data == _sheet_layout(current_path, "Calendario")
+    print(f"  same layout and styles: {same_data}")
+    legacy_template_path = os.path.join(workdir, "legacy_template.xlsx")
+    template_path = os.path.join(workdir, "template.xlsx")
+    combined_path = os.path.join(workdir, "combined.xlsx")
+    legacy_export_excel_template(legacy_template_path)
+    vt.export_excel_template(template_path)
+    vt.export_excel_with_data(df, combined_path, include_template=True)
+    legacy_template = _sheet_layout(legacy_template_path, "Calendario")
+    same_template = legacy_template == _sheet_layout(template_path, "Calendario")
+    print(f"  template, same layout and styles: {same_template}")
+    same_combined = (
+        _sheet_layout(combined_path, "Calendario") == legacy_data
+        and _sheet_layout(combined_path, vt.TEMPLATE_SHEET_NAME) == legacy_template
+    )
+    print(f"  include_template, both sheets same layout and styles: {same_combined}")
+    return sum(not same for same in (same_values, same_data, same_template, same_combined))
+
+
+def _in_memory_export(corpus: str, outputs: Dict[str, str]) -> Tuple[int, int]:
+    df = vt.consolidate_csvs(corpus)
+    report = vt._validate(df)
+    vt.export_excel_with_data(df, outputs["excel"])
+    vt.export_ics(df, outputs["ics"])
+    report.to_csv(outputs["report"], index=False)
+    return len(df), len(report)
+
+
+def _stream_export(corpus: str, outputs: Dict[str, str]) -> Tuple[int, int]:
+    return vt.export_streaming(vt._iter_deduplicated_chunks(corpus), outputs["excel"], outputs["ics"], outputs["report"])
+
+
+def _outputs(workdir: str, label: str) -> Dict[str, str]:
+    extensions = {"excel": "xlsx", "ics": "ics", "report": "csv"}
+    return {kind: os.path.join(workdir, f"{label}.{extension}") for kind, extension in extensions.items()}
+
+
+def bench_stream(corpus: str, workdir: str, compare: bool) -> int:
+    stream_outputs = _outputs(workdir, "stream")
+    stream = _peak(_stream_export, corpus, stream_outputs)
+    print(f"--stream export of {corpus}")
+    if compare:
+        memory_outputs = _outputs(workdir, "memory")
+        in_memory = _peak(_in_memory_export, corpus, memory_outputs)
+        print(f"  {'in memory':<26} {in_memory[0]:8.2f}s  tracemalloc peak {in_memory[1]:8.1f} MiB")
+    print(f"  {'stream':<26} {stream[0]:8.2f}s  tracemalloc peak {stream[1]:8.1f} MiB")
+    if compare:
+        # Stream rows come out in source order, the in-memory path sorts them: compare as sets
+        def rows(path):
+            return sorted(_sheet_values(path)[2:], key=repr)
+
+        same_rows = rows(stream_outputs["excel"]) == rows(memory_outputs["excel"])
+        same_issues = len(pd.read_csv(stream_outputs["report"])) == len(pd.read_csv(memory_outputs["report"]))
+        same_events = _ics_events(stream_outputs["ics"]) == _ics_events(memory_outputs["ics"])
+        print(f"  same rows: {same_rows}  same issue count: {same_issues}  same events: {same_events}")
+        return sum(not same for same in (same_rows, same_issues, same_events))
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000, help="rows in the synthetic CSV corpus")
+    parser.add_argument("--files", type=int, default=12, help="CSV files the corpus is split into")
+    parser.add_argument("--workers", type=int, default=4, help="processes for the pooled consolidation")
+    parser.add_argument("--parser-cells", type=int, default=100_000, help="cells for the parser micro-benchmark")
+    parser.add_argument("--random-frames", type=int, default=300, help="random frames for the dedup parity check")
+    parser.add_argument("--ics-rows", type=int, default=5_000, help="rows written by both ICS writers")
+    parser.add_argument(
+        "--stream-rows", type=int, default=0, help="also measure --stream alone on a corpus of this many rows"
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as workdir:
+        corpus = os.path.join(workdir, "corpus")
+        write_corpus(corpus, args.rows, args.files)
+        df, mismatches = check_consolidate(corpus, args.workers)
+        mismatches += check_cache(corpus, workdir, df)
+        mismatches += bench_parsers(args.parser_cells)
+        mismatches += check_dedup(corpus, args.random_frames)
+        mismatches += check_validate(df)
+        mismatches += bench_ics(df.head(args.ics_rows), workdir)
+        mismatches += bench_excel(df, workdir)
+        mismatches += bench_stream(corpus, workdir, compare=True)
+        if args.stream_rows:
+            large = os.path.join(workdir, "large")
+            write_corpus(large, args.stream_rows, args.files * 4, seed=1)
+            bench_stream(large, workdir, compare=False)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
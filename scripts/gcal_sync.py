@@ -1,15 +1,47 @@
+import hashlib
 import json
 import os
-from datetime import datetime, timedelta, timezone
-from typing import Optional
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
 
+import httplib2
 import pandas as pd
+import pyarrow as pa
 from google.oauth2 import service_account
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
+# Private extended properties that mark events owned by this sync and identify their source row
+MANAGED_PROPERTY = "origen"
+MANAGED_VALUE = "vencimientos"
+KEY_PROPERTY = "vencimiento_key"
+# Calendar API limits: 50 calls per batch request, 2500 events per list page
+BATCH_SIZE = 50
+LIST_PAGE_SIZE = 2500
+# Default Calendar API quota is 600 queries per minute per user; every call inside a batch counts
+DEFAULT_RATE = 10.0
+DEFAULT_WORKERS = 4
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 64.0
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded")
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT = ".gcal_sync_checkpoint.json"
+# Remote event id + content hash per key, persisted after every sync so the next run only sends deltas
+STATE_VERSION = 1
+DEFAULT_STATE = ".gcal_sync_state.json"
+# Dropped connections, socket timeouts and DNS hiccups
+TRANSPORT_ERRORS = (OSError, httplib2.HttpLib2Error)
+OUTCOMES = {"insert": "inserted", "update": "updated", "delete": "deleted"}
 
 
 def get_service(
@@ -37,74 +69,553 @@ def get_service(
     raise RuntimeError("No Google credentials provided")
 
 
-def upsert_event(service, calendar_id: str, row: pd.Series):
-    fecha = row.get("fecha_vencimiento")
-    concepto = row.get("concepto") or "Vencimiento"
-    if pd.isna(fecha) or fecha is None:
-        return
+def _read_excel(path: str, sheet: str) -> pd.DataFrame:
+    # Row 0 holds the sheet title, the column headers are on row 1
+    return pd.read_excel(path, sheet_name=sheet, header=1)
+
+
+def _newer_or_same(path: str, than: str) -> bool:
+    if not os.path.exists(path):
+        return False
+    return not os.path.exists(than) or os.path.getmtime(path) >= os.path.getmtime(than)
+
+
+def load_vencimientos(input_path: Optional[str], xlsx_path: str, sheet: str) -> Tuple[pd.DataFrame, str]:
+    if input_path is None:
+        # Not asked for explicitly: the Arrow copy vencimientos_tools writes next to the Excel loads much
+        # faster and keeps dtypes, but only while it is not older than the Excel
+        sibling = os.path.splitext(xlsx_path)[0] + ".arrow"
+        if _newer_or_same(sibling, xlsx_path):
+            input_path = sibling
+    if input_path and os.path.exists(input_path):
+        if input_path.endswith(".xlsx"):
+            return _read_excel(input_path, sheet), input_path
+        with pa.memory_map(input_path, "r") as source:
+            return pa.ipc.open_file(source).read_all().to_pandas(), input_path
+    # Only the Excel is available (e.g. produced by an older run), or the Arrow copy is stale
+    return _read_excel(xlsx_path, sheet), xlsx_path
+
 
+def _present(value) -> bool:
+    # NaN cells from the spreadsheet count as empty
+    return value is not None and not (isinstance(value, float) and pd.isna(value)) and bool(value)
+
+
+def _event_date(fecha) -> Optional[date]:
+    if fecha is None or pd.isna(fecha):
+        return None
     if isinstance(fecha, str):
         # ISO date expected from our pipeline
-        dt = datetime.fromisoformat(fecha)
-    elif isinstance(fecha, datetime):
-        dt = fecha
-    else:
-        dt = datetime.combine(fecha, datetime.min.time())
+        return datetime.fromisoformat(fecha).date()
+    if isinstance(fecha, datetime):
+        return fecha.date()
+    return fecha
+
+
+def event_key(concepto, fecha: date, referencia) -> str:
+    # Stable identity of a vencimiento, stored as a private extended property on the event
+    ref = str(referencia) if _present(referencia) else None
+    raw = json.dumps([str(concepto), fecha.isoformat(), ref], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def build_event_body(row) -> Optional[Tuple[str, dict]]:
+    fecha = _event_date(row.get("fecha_vencimiento"))
+    if fecha is None:
+        return None
+    concepto = row.get("concepto") if _present(row.get("concepto")) else "Vencimiento"
 
     # All-day event
-    start = {"date": dt.date().isoformat()}
-    end = {"date": (dt.date() + timedelta(days=1)).isoformat()}
+    start = {"date": fecha.isoformat()}
+    end = {"date": (fecha + timedelta(days=1)).isoformat()}
 
     description_parts = []
-    if row.get("referencia"):
+    if _present(row.get("referencia")):
         description_parts.append(f"Referencia: {row.get('referencia')}")
-    if row.get("estado"):
+    if _present(row.get("estado")):
         description_parts.append(f"Estado: {row.get('estado')}")
-    if row.get("importe_uy") or row.get("importe_usd"):
-        description_parts.append(
-            f"Importe: {row.get('importe_uy') or row.get('importe_usd')}"
-        )
-    if row.get("alertas"):
+    importe = row.get("importe_uy") if _present(row.get("importe_uy")) else row.get("importe_usd")
+    if _present(importe):
+        description_parts.append(f"Importe: {importe}")
+    if _present(row.get("alertas")):
         description_parts.append(f"Alertas: {row.get('alertas')}")
 
+    key = event_key(concepto, fecha, row.get("referencia"))
     body = {
         "summary": str(concepto),
         "description": "\n".join(description_parts),
         "start": start,
         "end": end,
+        "extendedProperties": {"private": {MANAGED_PROPERTY: MANAGED_VALUE, KEY_PROPERTY: key}},
     }
+    return key, body
+
+
+@dataclass
+class SyncStats:
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    retried: int = 0
+    resumed: int = 0
+    http_calls: int = 0
+    # "delta" when planned from the state file, "full" when planned against the remote calendar
+    mode: str = "full"
+    errors: List[str] = field(default_factory=list)
+    # Final outcome per operation id: inserted / updated / deleted / failed
+    outcomes: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def calls_saved(self) -> int:
+        # The per-row path costs one events().list plus one insert/update per row
+        return 2 * self.rows - self.http_calls
+
+
+@dataclass
+class SyncPlan:
+    inserts: List[dict] = field(default_factory=list)
+    updates: List[Tuple[str, dict]] = field(default_factory=list)
+    # (key, event id); key is None for stray duplicates that share a key with a kept event
+    deletes: List[Tuple[Optional[str], str]] = field(default_factory=list)
+    unchanged: int = 0
+    # key -> remote event id of events already up to date
+    matched: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class SyncOptions:
+    workers: int = 1
+    # Requests per second shared by all workers; None disables the limiter
+    rate: Optional[float] = None
+    max_attempts: int = MAX_ATTEMPTS
+    checkpoint_path: Optional[str] = None
+    state_path: Optional[str] = None
+    # Ignore the state file and diff against the remote calendar
+    full_resync: bool = False
+    # Builds one client per worker thread; httplib2-backed services are not thread-safe
+    service_factory: Optional[Callable[[], object]] = None
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> float:
+        # Reserve tokens up front (the balance may go negative) and sleep off the debt outside the lock,
+        # so a batch larger than the bucket still gets through at the configured rate
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
 
-    # Try to find existing by same summary+date (simple heuristic)
-    existing = (
-        service.events()
-        .list(
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, HttpError):
+        status = exc.resp.status
+        if status in RETRYABLE_STATUS:
+            return True
+        content = exc.content.decode("utf-8", "replace") if isinstance(exc.content, bytes) else str(exc.content)
+        return status == 403 and any(reason in content for reason in RATE_LIMIT_REASONS)
+    return isinstance(exc, TRANSPORT_ERRORS)
+
+
+def _backoff_delay(attempt: int, exc: Optional[Exception] = None) -> float:
+    if isinstance(exc, HttpError):
+        retry_after = exc.resp.get("retry-after")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+    # Full jitter keeps concurrent workers from retrying in lockstep
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+
+
+def _execute_with_retry(request, options: SyncOptions, limiter: Optional[TokenBucket], stats: SyncStats):
+    for attempt in range(options.max_attempts):
+        if limiter is not None:
+            limiter.acquire()
+        stats.http_calls += 1
+        try:
+            return request.execute()
+        except (HttpError, *TRANSPORT_ERRORS) as exc:
+            if attempt + 1 >= options.max_attempts or not _is_retryable(exc):
+                raise
+            stats.retried += 1
+            time.sleep(_backoff_delay(attempt, exc))
+
+
+def _day_start_utc(day: date) -> str:
+    return datetime.combine(day, datetime.min.time()).replace(tzinfo=timezone.utc).isoformat()
+
+
+def fetch_remote_events(
+    service,
+    calendar_id: str,
+    first_day: date,
+    last_day: date,
+    stats: SyncStats,
+    options: Optional[SyncOptions] = None,
+    limiter: Optional[TokenBucket] = None,
+) -> List[dict]:
+    options = options or SyncOptions()
+    items: List[dict] = []
+    page_token = None
+    while True:
+        request = service.events().list(
             calendarId=calendar_id,
-            timeMin=dt.replace(tzinfo=timezone.utc).isoformat(),
-            timeMax=(dt + timedelta(days=1)).replace(tzinfo=timezone.utc).isoformat(),
-            q=str(concepto),
+            timeMin=_day_start_utc(first_day),
+            timeMax=_day_start_utc(last_day + timedelta(days=1)),
             singleEvents=True,
-            orderBy="startTime",
+            maxResults=LIST_PAGE_SIZE,
+            pageToken=page_token,
         )
-        .execute()
-    )
-    items = existing.get("items", [])
-    if items:
-        # Update first match
-        event_id = items[0]["id"]
-        service.events().update(calendarId=calendar_id, eventId=event_id, body=body).execute()
+        response = _execute_with_retry(request, options, limiter, stats)
+        items.extend(response.get("items", []))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return items
+
+
+def _needs_update(remote: dict, body: dict) -> bool:
+    if any(remote.get(field_name) != body[field_name] for field_name in ("start", "end")):
+        return True
+    if (remote.get("summary") or "") != body["summary"] or (remote.get("description") or "") != body["description"]:
+        return True
+    private = remote.get("extendedProperties", {}).get("private", {})
+    return any(private.get(k) != v for k, v in body["extendedProperties"]["private"].items())
+
+
+def plan_sync(desired: Dict[str, dict], remote_items: List[dict]) -> SyncPlan:
+    plan = SyncPlan()
+    managed: Dict[str, dict] = {}
+    legacy: Dict[Tuple[str, str], List[dict]] = {}
+    for item in remote_items:
+        private = item.get("extendedProperties", {}).get("private", {})
+        key = private.get(KEY_PROPERTY)
+        if private.get(MANAGED_PROPERTY) == MANAGED_VALUE and key:
+            if key in managed:
+                # Leftover duplicate of an event we already track
+                plan.deletes.append((None, item["id"]))
+            else:
+                managed[key] = item
+        else:
+            legacy.setdefault((item.get("summary") or "", item.get("start", {}).get("date", "")), []).append(item)
+
+    for key, body in desired.items():
+        remote = managed.pop(key, None)
+        if remote is None:
+            # Events created before the key existed matched on summary + date: adopt them
+            candidates = legacy.get((body["summary"], body["start"]["date"]))
+            if candidates:
+                plan.updates.append((candidates.pop(0)["id"], body))
+            else:
+                plan.inserts.append(body)
+        elif _needs_update(remote, body):
+            plan.updates.append((remote["id"], body))
+        else:
+            plan.unchanged += 1
+            plan.matched[key] = remote["id"]
+
+    # Managed events whose source row disappeared
+    plan.deletes.extend((key, item["id"]) for key, item in managed.items())
+    return plan
+
+
+def body_hash(body: dict) -> str:
+    return hashlib.sha1(json.dumps(body, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def plan_from_state(desired: Dict[str, dict], known: Dict[str, dict]) -> SyncPlan:
+    # Same diff as plan_sync, but against the hashes recorded by the previous run instead of the calendar
+    plan = SyncPlan()
+    for key, body in desired.items():
+        entry = known.get(key)
+        if entry is None:
+            plan.inserts.append(body)
+        elif entry["hash"] != body_hash(body):
+            plan.updates.append((entry["id"], body))
+        else:
+            plan.unchanged += 1
+            plan.matched[key] = entry["id"]
+    plan.deletes.extend((key, entry["id"]) for key, entry in known.items() if key not in desired)
+    return plan
+
+
+def plan_operations(plan: SyncPlan) -> List[dict]:
+    # Flat, JSON-serializable operations with ids that stay stable across runs (used by the checkpoint)
+    operations = []
+    for body in plan.inserts:
+        key = body["extendedProperties"]["private"][KEY_PROPERTY]
+        operations.append({"op_id": f"insert-{key}", "kind": "insert", "key": key, "hash": body_hash(body), "body": body})
+    for event_id, body in plan.updates:
+        key = body["extendedProperties"]["private"][KEY_PROPERTY]
+        operations.append(
+            {"op_id": f"update-{event_id}", "kind": "update", "key": key, "hash": body_hash(body), "event_id": event_id, "body": body}
+        )
+    operations += [
+        {"op_id": f"delete-{event_id}", "kind": "delete", "key": key, "event_id": event_id} for key, event_id in plan.deletes
+    ]
+    return operations
+
+
+def _operation_request(events, calendar_id: str, op: dict):
+    if op["kind"] == "insert":
+        return events.insert(calendarId=calendar_id, body=op["body"])
+    if op["kind"] == "update":
+        return events.update(calendarId=calendar_id, eventId=op["event_id"], body=op["body"])
+    return events.delete(calendarId=calendar_id, eventId=op["event_id"])
+
+
+def _run_batch(
+    service, calendar_id: str, ops: List[dict], limiter: Optional[TokenBucket]
+) -> List[Tuple[dict, object, Optional[Exception]]]:
+    if limiter is not None:
+        limiter.acquire(len(ops))
+    responses: Dict[str, object] = {}
+    exceptions: Dict[str, Optional[Exception]] = {}
+
+    def _callback(request_id, response, exception):
+        responses[request_id] = response
+        exceptions[request_id] = exception
+
+    events = service.events()
+    batch = service.new_batch_http_request(callback=_callback)
+    for op in ops:
+        batch.add(_operation_request(events, calendar_id, op), request_id=op["op_id"])
+    try:
+        batch.execute()
+    except (HttpError, *TRANSPORT_ERRORS) as exc:
+        # The whole batch request failed: every operation without its own response shares the error
+        return [(op, responses.get(op["op_id"]), exceptions.get(op["op_id"], exc)) for op in ops]
+    return [(op, responses.get(op["op_id"]), exceptions.get(op["op_id"])) for op in ops]
+
+
+def _already_applied(op: dict, exc: Exception) -> bool:
+    # Deleting an event that is already gone (e.g. deleted just before a crash) is not a failure
+    return op["kind"] == "delete" and _is_gone(exc)
+
+
+def _is_gone(exc: Exception) -> bool:
+    return isinstance(exc, HttpError) and exc.resp.status in (404, 410)
+
+
+def _reinsert(op: dict) -> dict:
+    # The event was deleted by hand in the calendar since the state file was written: create it again.
+    # Rewritten in place so the checkpoint replays an insert; the op_id stays stable for its outcome.
+    op["kind"] = "insert"
+    op.pop("event_id", None)
+    return op
+
+
+def _thread_local_services(factory: Callable[[], object]) -> Callable[[], object]:
+    local = threading.local()
+
+    def _service():
+        if not hasattr(local, "service"):
+            local.service = factory()
+        return local.service
+
+    return _service
+
+
+def _record_outcome(stats: SyncStats, op: dict) -> None:
+    outcome = OUTCOMES[op["kind"]]
+    stats.outcomes[op["op_id"]] = outcome
+    setattr(stats, outcome, getattr(stats, outcome) + 1)
+
+
+def execute_operations(
+    service,
+    calendar_id: str,
+    operations: List[dict],
+    stats: SyncStats,
+    options: Optional[SyncOptions] = None,
+    limiter: Optional[TokenBucket] = None,
+    on_progress: Optional[Callable[[], None]] = None,
+    on_applied: Optional[Callable[[dict, object], None]] = None,
+) -> None:
+    options = options or SyncOptions()
+    service_for_thread = _thread_local_services(options.service_factory) if options.service_factory else lambda: service
+    pending = operations
+    attempt = 0
+    while pending:
+        retry: List[dict] = []
+        reinserts: List[dict] = []
+        delay = 0.0
+        chunks = [pending[offset : offset + BATCH_SIZE] for offset in range(0, len(pending), BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=max(1, options.workers)) as pool:
+            futures = [
+                pool.submit(lambda chunk=chunk: _run_batch(service_for_thread(), calendar_id, chunk, limiter))
+                for chunk in chunks
+            ]
+            # Results are merged on this thread only, so stats need no locking
+            for future in as_completed(futures):
+                stats.http_calls += 1
+                for op, response, exc in future.result():
+                    if exc is None or _already_applied(op, exc):
+                        _record_outcome(stats, op)
+                        if on_applied is not None:
+                            on_applied(op, response)
+                    elif op["kind"] == "update" and _is_gone(exc):
+                        reinserts.append(_reinsert(op))
+                    elif _is_retryable(exc) and attempt + 1 < options.max_attempts:
+                        retry.append(op)
+                        delay = max(delay, _backoff_delay(attempt, exc))
+                    else:
+                        stats.failed += 1
+                        stats.outcomes[op["op_id"]] = "failed"
+                        stats.errors.append(f"{op['op_id']}: {exc}")
+                if on_progress is not None:
+                    on_progress()
+        if retry:
+            # A rate-limit answer applies to the whole quota, so every worker pauses before the next round
+            stats.retried += len(retry)
+            time.sleep(delay)
+            attempt += 1
+        # Re-inserts go out with the next round without using up an attempt; an insert never turns into one again
+        pending = retry + reinserts
+
+
+def _source_fingerprint(calendar_id: str, desired: Dict[str, dict]) -> str:
+    raw = json.dumps([calendar_id, sorted(desired.items())], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _load_checkpoint(path: str, fingerprint: str) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            state = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if state.get("version") != CHECKPOINT_VERSION or state.get("fingerprint") != fingerprint:
+        # Stale checkpoint from another source workbook or calendar
+        return None
+    return state
+
+
+def _write_json_atomic(path: str, payload: dict) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _load_sync_state(path: str, calendar_id: str) -> Optional[Dict[str, dict]]:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            state = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if state.get("version") != STATE_VERSION or state.get("calendar_id") != calendar_id:
+        return None
+    return state["events"]
+
+
+def _save_sync_state(path: str, calendar_id: str, events: Dict[str, dict]) -> None:
+    _write_json_atomic(path, {"version": STATE_VERSION, "calendar_id": calendar_id, "events": events})
+
+
+def _apply_to_state(events: Dict[str, dict], op: dict, response) -> None:
+    if op["kind"] == "delete":
+        if op.get("key"):
+            events.pop(op["key"], None)
+        return
+    event_id = response.get("id") if isinstance(response, dict) and response.get("id") else op.get("event_id")
+    events[op["key"]] = {"id": event_id, "hash": op["hash"]}
+
+
+def sync_dataframe_to_calendar(
+    df: pd.DataFrame, calendar_id: str, service, options: Optional[SyncOptions] = None
+) -> SyncStats:
+    options = options or SyncOptions()
+    limiter = TokenBucket(options.rate) if options.rate else None
+    stats = SyncStats()
+    desired: Dict[str, dict] = {}
+    for row in df.to_dict("records"):
+        built = build_event_body(row)
+        if built is None:
+            continue
+        stats.rows += 1
+        key, body = built
+        desired.setdefault(key, body)
+
+    known = None
+    if options.state_path and not options.full_resync:
+        known = _load_sync_state(options.state_path, calendar_id)
+    if not desired and not known:
+        return stats
+
+    fingerprint = _source_fingerprint(calendar_id, desired)
+    checkpoint = _load_checkpoint(options.checkpoint_path, fingerprint) if options.checkpoint_path else None
+    if checkpoint is not None:
+        # Resume: the plan was already computed, only replay what did not complete.
+        # The state file was saved alongside the checkpoint, so it already holds the applied part.
+        done = {op_id for op_id, outcome in checkpoint["outcomes"].items() if outcome != "failed"}
+        operations = [op for op in checkpoint["operations"] if op["op_id"] not in done]
+        stats.mode = checkpoint["mode"]
+        stats.resumed = len(done)
+        stats.unchanged = checkpoint["unchanged"]
+        events = (_load_sync_state(options.state_path, calendar_id) or {}) if options.state_path else {}
     else:
-        service.events().insert(calendarId=calendar_id, body=body).execute()
+        if known is not None:
+            stats.mode = "delta"
+            plan = plan_from_state(desired, known)
+            events = dict(known)
+        else:
+            days = [date.fromisoformat(body["start"]["date"]) for body in desired.values()]
+            remote_items = fetch_remote_events(service, calendar_id, min(days), max(days), stats, options, limiter)
+            plan = plan_sync(desired, remote_items)
+            # Rebuilt from scratch: only events confirmed up to date now, the rest as operations apply
+            events = {key: {"id": event_id, "hash": body_hash(desired[key])} for key, event_id in plan.matched.items()}
+        operations = plan_operations(plan)
+        stats.unchanged = plan.unchanged
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "fingerprint": fingerprint,
+            "mode": stats.mode,
+            "unchanged": plan.unchanged,
+            "operations": operations,
+            "outcomes": {},
+        }
+
+    def on_applied(op, response):
+        _apply_to_state(events, op, response)
 
+    def on_progress():
+        if options.state_path:
+            _save_sync_state(options.state_path, calendar_id, events)
+        if options.checkpoint_path:
+            checkpoint["outcomes"].update(stats.outcomes)
+            _write_json_atomic(options.checkpoint_path, checkpoint)
 
-def sync_dataframe_to_calendar(df: pd.DataFrame, calendar_id: str, service):
-    for _, row in df.iterrows():
-        upsert_event(service, calendar_id, row)
+    on_progress()
+    execute_operations(service, calendar_id, operations, stats, options, limiter, on_progress, on_applied)
+    if options.state_path:
+        _save_sync_state(options.state_path, calendar_id, events)
+
+    if options.checkpoint_path and not stats.failed and os.path.exists(options.checkpoint_path):
+        os.remove(options.checkpoint_path)
+    return stats
 
 
 def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="Sync calendario vencimientos a Google Calendar")
+    parser.add_argument(
+        "--input",
+        help="Consolidado en Arrow IPC (.arrow). Sin este flag se usa el .arrow junto a --xlsx solo si no es mas viejo",
+    )
     parser.add_argument("--xlsx", default="Calendario_Vencimientos_Completo.xlsx")
     parser.add_argument("--sheet", default="Calendario")
     parser.add_argument("--calendar-id", required=True)
@@ -112,22 +623,52 @@ def main():
     parser.add_argument("--oauth-client-id", default=os.getenv("GCAL_OAUTH_CLIENT_ID"))
     parser.add_argument("--oauth-client-secret", default=os.getenv("GCAL_OAUTH_CLIENT_SECRET"))
     parser.add_argument("--oauth-refresh-token", default=os.getenv("GCAL_OAUTH_REFRESH_TOKEN"))
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Batches enviados en paralelo")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Requests por segundo (0 = sin limite)")
+    parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS, help="Intentos por operacion ante 429/5xx")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="Archivo para retomar una corrida interrumpida")
+    parser.add_argument("--no-checkpoint", action="store_true", help="No guardar ni retomar checkpoint")
+    parser.add_argument("--state", default=DEFAULT_STATE, help="Estado de la ultima sincronizacion (ids y hashes)")
+    parser.add_argument(
+        "--full-resync", action="store_true", help="Ignorar el estado y comparar contra el calendario remoto"
+    )
 
     args = parser.parse_args()
 
-    service = get_service(
-        service_account_json=args.service_account_json,
-        oauth_client_id=args.oauth_client_id,
-        oauth_client_secret=args.oauth_client_secret,
-        oauth_refresh_token=args.oauth_refresh_token,
+    def service_factory():
+        return get_service(
+            service_account_json=args.service_account_json,
+            oauth_client_id=args.oauth_client_id,
+            oauth_client_secret=args.oauth_client_secret,
+            oauth_refresh_token=args.oauth_refresh_token,
+        )
+
+    options = SyncOptions(
+        workers=args.workers,
+        rate=args.rate or None,
+        max_attempts=max(1, args.max_attempts),
+        checkpoint_path=None if args.no_checkpoint else args.checkpoint,
+        state_path=args.state,
+        full_resync=args.full_resync,
+        service_factory=service_factory,
     )
 
-    df = pd.read_excel(args.xlsx, sheet_name=args.sheet)
-    sync_dataframe_to_calendar(df, args.calendar_id, service)
-    print("Google Calendar sync completo")
+    df, source = load_vencimientos(args.input, args.xlsx, args.sheet)
+    print(f"Leyendo {source} ({len(df)} filas)")
+    stats = sync_dataframe_to_calendar(df, args.calendar_id, service_factory(), options)
+    for error in stats.errors:
+        print(f"  error: {error}")
+    print(
+        f"Google Calendar sync completo ({stats.mode}): filas={stats.rows} insertados={stats.inserted} "
+        f"actualizados={stats.updated} eliminados={stats.deleted} sin_cambios={stats.unchanged} fallidos={stats.failed} "
+        f"reintentos={stats.retried} retomadas={stats.resumed} "
+        f"llamadas_http={stats.http_calls} ahorradas={stats.calls_saved}"
+    )
+    if stats.failed:
+        if options.checkpoint_path:
+            print(f"Checkpoint guardado en {options.checkpoint_path}; volver a correr para retomar")
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
     main()
-
-
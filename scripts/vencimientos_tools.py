@@ -1,18 +1,31 @@
+import contextlib
 import csv
+import hashlib
+import json
 import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, asdict
-from datetime import datetime, date, timedelta
-from typing import List, Optional, Iterable, Tuple
+from datetime import datetime, date
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Iterable, Iterator, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import xlsxwriter
 from dateutil import parser as date_parser
-from ics import Calendar, Event, DisplayAlarm
 
 
 CALENDAR_DIR = os.path.join(
     os.path.dirname(os.path.dirname(__file__)), "Calendario de Vencimientos EVO"
 )
 
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".vencimientos_cache")
+CACHE_MANIFEST = "manifest.json"
+
 
 @dataclass
 class Vencimiento:
@@ -40,6 +53,54 @@ UNIFIED_COLUMNS = [
 ]
 
 
+COLUMN_WIDTHS = [28, 24, 16, 14, 14, 16, 14, 36, 22]
+TITLE_FORMAT = {"bold": True, "font_size": 16, "align": "left", "valign": "vcenter"}
+HEADER_FORMAT = {
+    "bold": True,
+    "bg_color": "#0F4C81",
+    "font_color": "#FFFFFF",
+    "border": 1,
+    "align": "center",
+    "valign": "vcenter",
+}
+DATE_FORMAT = {"num_format": "yyyy-mm-dd"}
+# DataFrame.to_excel wrote date cells with its own format, the column default stays lowercase
+CELL_DATE_FORMAT = {"num_format": "YYYY-MM-DD"}
+MONEY_FORMAT = {"num_format": "$ #,##0.00"}
+NOTE_FORMAT = {"font_color": "#555555", "italic": True}
+# concepto (text), referencia (text), fecha_vencimiento (date), importe_uy (money), importe_usd (money), ...
+COLUMN_FORMATS = {2: "date", 3: "money", 4: "money", 6: "date"}
+SHEET_NAME = "Calendario"
+TEMPLATE_SHEET_NAME = "Plantilla"
+TEMPLATE_ROWS = 1000
+TEMPLATE_ESTADOS = ["BORRADORES", "PENDIENTE", "PAGO", "EN BORRADORES"]
+
+ICS_HEADER = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//Dashboard-bmc//Calendario de Vencimientos//ES\r\n"
+    "CALSCALE:GREGORIAN\r\n"
+)
+ICS_FOOTER = "END:VCALENDAR\r\n"
+ICS_LINE_OCTETS = 75
+STREAM_CHUNKSIZE = 50_000
+
+# Typed interchange file for gcal_sync: Arrow IPC, uncompressed so readers can memory-map it
+ARROW_SCHEMA = pa.schema(
+    [
+        ("concepto", pa.string()),
+        ("referencia", pa.string()),
+        ("fecha_vencimiento", pa.date32()),
+        ("importe_uy", pa.float64()),
+        ("importe_usd", pa.float64()),
+        ("estado", pa.string()),
+        ("fecha_pago", pa.date32()),
+        ("alertas", pa.string()),
+        ("fuente_archivo", pa.string()),
+    ]
+)
+
+
 # Month names to infer month from filenames
 SPANISH_MONTHS = {
     "enero": 1,
@@ -58,6 +119,19 @@ SPANISH_MONTHS = {
 }
 
 
+# Exports repeat the same few hundred date and amount strings, so parsed values are memoized
+PARSE_CACHE_SIZE = 65536
+CURRENCY_TOKENS = ["U$S", "USD", "$", "U$", "US$", "uy$", "UY$"]
+NUMBER_RE = re.compile(r"[-+]?[0-9]{1,3}(?:[\.,][0-9]{3})*(?:[\.,][0-9]+)?|[-+]?[0-9]+(?:[\.,][0-9]+)?")
+# dd/mm/yyyy, dd-mm-yyyy, dd.mm.yyyy
+DMY_RE = re.compile(r"^(\d{1,2})([/.-])(\d{1,2})\2(\d{4})$")
+# dd/mm, dd-mm (dateutil fills in the current year)
+DM_RE = re.compile(r"^(\d{1,2})[/-](\d{1,2})$")
+
+_PARSE_COUNTERS: Counter = Counter()
+
+
+@lru_cache(maxsize=None)
 def _infer_year_month_from_filename(filename: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
     if not filename:
         return (None, None)
@@ -78,14 +152,34 @@ def _infer_year_month_from_filename(filename: Optional[str]) -> Tuple[Optional[i
     return (year, month)
 
 
-def _parse_date(value: object) -> Optional[date]:
-    if value is None or (isinstance(value, float) and pd.isna(value)):
+def _fast_parse_date(s: str) -> Optional[date]:
+    # Only unambiguous day-first inputs; anything dateutil would reinterpret falls through.
+    # ISO strings are left to dateutil: with dayfirst=True it reads 2024-03-05 as 3 May.
+    match = DMY_RE.match(s)
+    if match:
+        d, m, y = int(match.group(1)), int(match.group(3)), int(match.group(4))
+    else:
+        match = DM_RE.match(s)
+        if not match:
+            return None
+        d, m, y = int(match.group(1)), int(match.group(2)), date.today().year
+    if not 1 <= m <= 12 or y < 1000:
         return None
-    if isinstance(value, (datetime, date)):
-        return value.date() if isinstance(value, datetime) else value
-    s = str(value).strip()
+    try:
+        return date(y, m, d)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_date_text(s: str) -> Optional[date]:
     if not s or s.lower() in {"nan", "none", "-"}:
         return None
+    dt = _fast_parse_date(s)
+    if dt is not None:
+        _PARSE_COUNTERS["fecha_fast_path"] += 1
+        return dt
+    _PARSE_COUNTERS["fecha_dateutil"] += 1
     try:
         # Prefer day-first parsing since many inputs are dd/mm/yyyy
         dt = date_parser.parse(s, dayfirst=True, fuzzy=True)
@@ -94,19 +188,21 @@ def _parse_date(value: object) -> Optional[date]:
         return None
 
 
-def _parse_date_with_context(value: object, source_filename: Optional[str]) -> Optional[date]:
-    # First attempt the normal parser (dayfirst)
-    dt = _parse_date(value)
-    if dt is not None:
-        return dt
+def _parse_date(value: object) -> Optional[date]:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.date() if isinstance(value, datetime) else value
+    return _parse_date_text(str(value).strip())
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_date_from_hint(s: str, hint: Tuple[Optional[int], Optional[int]]) -> Optional[date]:
     # Try to infer missing year/month from filename for inputs like "26/3" or "26-03"
     try:
-        if value is None:
-            return None
-        s = str(value).strip()
         if not s:
             return None
-        year_hint, month_hint = _infer_year_month_from_filename(source_filename)
+        year_hint, month_hint = hint
         sep = "/" if "/" in s else ("-" if "-" in s else None)
         if sep:
             parts = [p for p in s.replace(" ", "").split(sep) if p]
@@ -124,31 +220,48 @@ def _parse_date_with_context(value: object, source_filename: Optional[str]) -> O
     return None
 
 
+def _parse_date_with_context(value: object, source_filename: Optional[str]) -> Optional[date]:
+    # First attempt the normal parser (dayfirst)
+    dt = _parse_date(value)
+    if dt is not None:
+        return dt
+    if value is None:
+        return None
+    return _parse_date_from_hint(str(value).strip(), _infer_year_month_from_filename(source_filename))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_number_text(value: str) -> Optional[float]:
+    try:
+        s = value.strip()
+        if not s:
+            return None
+        # Remove common currency markers
+        s_clean = s
+        for tok in CURRENCY_TOKENS:
+            s_clean = s_clean.replace(tok, "")
+        # Extract first numeric token
+        match = NUMBER_RE.search(s_clean)
+        if not match:
+            return None
+        num = match.group(0)
+        # Normalize: if both comma and dot, treat comma as thousands
+        if "," in num and "." in num:
+            num = num.replace(",", "")
+        elif "," in num and "." not in num:
+            num = num.replace(",", ".")
+        num = num.replace(" ", "")
+        return float(num)
+    except Exception:
+        return None
+
+
 def _parse_number(value: object) -> Optional[float]:
     if value is None:
         return None
+    if isinstance(value, str):
+        return _parse_number_text(value)
     try:
-        if isinstance(value, str):
-            s = value.strip()
-            if not s:
-                return None
-            # Remove common currency markers
-            s_clean = s
-            for tok in ["U$S", "USD", "$", "U$", "US$", "uy$", "UY$"]:
-                s_clean = s_clean.replace(tok, "")
-            # Extract first numeric token
-            import re
-            match = re.search(r"[-+]?[0-9]{1,3}(?:[\.,][0-9]{3})*(?:[\.,][0-9]+)?|[-+]?[0-9]+(?:[\.,][0-9]+)?", s_clean)
-            if not match:
-                return None
-            num = match.group(0)
-            # Normalize: if both comma and dot, treat comma as thousands
-            if "," in num and "." in num:
-                num = num.replace(",", "")
-            elif "," in num and "." not in num:
-                num = num.replace(",", ".")
-            num = num.replace(" ", "")
-            return float(num)
         if pd.isna(value):
             return None
         return float(value)
@@ -156,357 +269,811 @@ def _parse_number(value: object) -> Optional[float]:
         return None
 
 
-def _read_all_csvs(directory: str) -> List[pd.DataFrame]:
-    dataframes: List[pd.DataFrame] = []
-    for entry in sorted(os.listdir(directory)):
-        if not entry.lower().endswith(".csv"):
-            continue
-        path = os.path.join(directory, entry)
-        try:
-            df = pd.read_csv(path, dtype=str, keep_default_na=False)
-            df["__fuente_archivo"] = entry
-            dataframes.append(df)
-        except Exception:
-            # Skip unreadable files
-            continue
-    return dataframes
-
-
-def consolidate_csvs(calendar_dir: Optional[str] = None) -> pd.DataFrame:
-    directory = calendar_dir or CALENDAR_DIR
-    frames = _read_all_csvs(directory)
-    if not frames:
-        return pd.DataFrame(columns=UNIFIED_COLUMNS)
+def parser_cache_stats() -> Dict[str, Dict[str, int]]:
+    stats: Dict[str, Dict[str, int]] = {}
+    for name, func in (
+        ("fecha", _parse_date_text),
+        ("fecha_contexto", _parse_date_from_hint),
+        ("importe", _parse_number_text),
+    ):
+        info = func.cache_info()
+        stats[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    stats["fecha"]["fast_path"] = _PARSE_COUNTERS["fecha_fast_path"]
+    stats["fecha"]["dateutil"] = _PARSE_COUNTERS["fecha_dateutil"]
+    return stats
+
+
+def _read_csv(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    df["__fuente_archivo"] = os.path.basename(path)
+    return df
+
+
+ESTADO_REPLACEMENTS = {
+    "en borradores": "BORRADORES",
+    "borradores": "BORRADORES",
+    "borrador": "BORRADORES",
+    "pendiente": "PENDIENTE",
+    "pendientes": "PENDIENTE",
+    "pendiente de pago": "PENDIENTE",
+    "se debita (pendiente)": "PENDIENTE",
+    "se debita (pago)": "PAGO",
+    "pago": "PAGO",
+    "pagamos": "PAGO",
+    "pagamos $": "PAGO",
+    "pagamos minimos": "PAGO",
+    "se pagó": "PAGO",
+    "pagar en red pagos": "PENDIENTE",
+    "impreso": "PENDIENTE",
+}
 
-    normalized_rows: List[dict] = []
 
-    for df in frames:
-        cols_lower = {c.lower().strip(): c for c in df.columns}
-        concepto_col = cols_lower.get("concepto ") or cols_lower.get("concepto")
-        referencia_col = cols_lower.get("referencia")
-        fecha_col = (
+def _normalize_estado(val: Optional[str]) -> Optional[str]:
+    if val is None:
+        return None
+    s = str(val).strip().lower()
+    if not s or s in {"nan", "none", "-"}:
+        return None
+    for key, target in ESTADO_REPLACEMENTS.items():
+        if key in s:
+            return target
+    # default: keep original uppercased
+    return s.upper()
+
+
+def _map_source_columns(df: pd.DataFrame) -> Dict[str, Optional[str]]:
+    cols_lower = {c.lower().strip(): c for c in df.columns}
+    return {
+        "concepto": cols_lower.get("concepto ") or cols_lower.get("concepto"),
+        "referencia": cols_lower.get("referencia"),
+        "fecha_vencimiento": (
             cols_lower.get("fecha de vencimiento")
             or cols_lower.get("fecha_vencimiento")
             or cols_lower.get("fecha")
-        )
-        importe_uy_col = (
+        ),
+        "importe_uy": (
             cols_lower.get("importe $")
             or cols_lower.get("importe_uy")
             or cols_lower.get("importe")
-        )
-        importe_usd_col = cols_lower.get("importe u$s") or cols_lower.get("importe usd")
-        estado_col = cols_lower.get("estado")
-        fecha_pago_col = cols_lower.get("fecha de pago") or cols_lower.get("fecha_pago")
-        alertas_col = cols_lower.get("alertas")
-        fuente_archivo_col = "__fuente_archivo"
-
-        for _, row in df.iterrows():
-            concepto = str(row.get(concepto_col, "")).strip() if concepto_col else ""
-            # Skip empty filler rows
-            if not concepto and not str(row.get(fecha_col, "")).strip():
-                continue
+        ),
+        "importe_usd": cols_lower.get("importe u$s") or cols_lower.get("importe usd"),
+        "estado": cols_lower.get("estado"),
+        "fecha_pago": cols_lower.get("fecha de pago") or cols_lower.get("fecha_pago"),
+        "alertas": cols_lower.get("alertas"),
+    }
+
+
+def _map_unique(values: pd.Series, func: Callable[[object], object]) -> np.ndarray:
+    # Exports repeat the same few values many times: evaluate each distinct value once
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    mapped = np.empty(len(uniques), dtype=object)
+    mapped[:] = [func(u) for u in uniques]
+    return mapped[codes]
+
+
+def _normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    source_cols = _map_source_columns(df)
+    fuente = df["__fuente_archivo"].iloc[0] if len(df) else None
+    n = len(df)
+
+    def _stripped(key: str) -> Optional[pd.Series]:
+        col = source_cols[key]
+        return df[col].astype(str).str.strip() if col else None
+
+    concepto = _stripped("concepto")
+    if concepto is None:
+        concepto = pd.Series([""] * n, index=df.index, dtype=object)
+    fecha_raw = _stripped("fecha_vencimiento")
+    # Skip empty filler rows
+    keep = (concepto != "") | (fecha_raw != "") if fecha_raw is not None else concepto != ""
+    df = df[keep.to_numpy()]
+    concepto = concepto[keep.to_numpy()].to_numpy(dtype=object)
+    n = len(df)
+
+    def _column(key: str, func: Callable[[object], object]) -> np.ndarray:
+        col = source_cols[key]
+        if not col:
+            return np.full(n, None, dtype=object)
+        return _map_unique(df[col], func)
+
+    referencia = _column("referencia", lambda v: str(v).strip())
+    fecha_vencimiento = _column(
+        "fecha_vencimiento", lambda v: _parse_date_with_context(v, fuente)
+    )
+    importe_uy = _column("importe_uy", _parse_number)
+    importe_usd = _column("importe_usd", _parse_number)
+    estado = _column("estado", lambda v: _normalize_estado(str(v).strip()))
+    fecha_pago = _column("fecha_pago", _parse_date)
+    alertas = _column("alertas", lambda v: str(v).strip())
+
+    # Auto-fill concepto if missing but there is other signal
+    has_signal = (
+        (pd.notna(referencia) & (referencia != ""))
+        | pd.notna(importe_uy.astype(float))
+        | pd.notna(importe_usd.astype(float))
+    )
+    concepto = np.where((concepto == "") & has_signal, "OTROS", concepto).astype(object)
+
+    valid = (concepto != "") | pd.notna(fecha_vencimiento)
+    return pd.DataFrame(
+        {
+            "concepto": concepto[valid],
+            "referencia": referencia[valid],
+            "fecha_vencimiento": fecha_vencimiento[valid],
+            "importe_uy": importe_uy[valid],
+            "importe_usd": importe_usd[valid],
+            "estado": estado[valid],
+            "fecha_pago": fecha_pago[valid],
+            "alertas": alertas[valid],
+            "fuente_archivo": np.full(int(valid.sum()), fuente, dtype=object),
+        },
+        columns=UNIFIED_COLUMNS,
+    )
+
+
+def _concat_normalized(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    combined = pd.concat(frames, ignore_index=True) if frames else None
+    if combined is None or combined.empty:
+        return pd.DataFrame(columns=UNIFIED_COLUMNS)
+    # Re-infer dtypes from the Python values, as building the frame from records would
+    return pd.DataFrame(
+        {col: combined[col].tolist() for col in UNIFIED_COLUMNS}, columns=UNIFIED_COLUMNS
+    )
+
 
-            # Normalize estado values
-            def _normalize_estado(val: Optional[str]) -> Optional[str]:
-                if val is None:
-                    return None
-                s = str(val).strip().lower()
-                if not s or s in {"nan", "none", "-"}:
-                    return None
-                replacements = {
-                    "en borradores": "BORRADORES",
-                    "borradores": "BORRADORES",
-                    "borrador": "BORRADORES",
-                    "pendiente": "PENDIENTE",
-                    "pendientes": "PENDIENTE",
-                    "pendiente de pago": "PENDIENTE",
-                    "se debita (pendiente)": "PENDIENTE",
-                    "se debita (pago)": "PAGO",
-                    "pago": "PAGO",
-                    "pagamos": "PAGO",
-                    "pagamos $": "PAGO",
-                    "pagamos minimos": "PAGO",
-                    "se pagó": "PAGO",
-                    "pagar en red pagos": "PENDIENTE",
-                    "impreso": "PENDIENTE",
-                }
-                for key, target in replacements.items():
-                    if key in s:
-                        return target
-                # default: keep original uppercased
-                return s.upper()
-
-            rec = {
-                "concepto": concepto,
-                "referencia": str(row.get(referencia_col, "")).strip() if referencia_col else None,
-                "fecha_vencimiento": _parse_date_with_context(row.get(fecha_col), row.get(fuente_archivo_col)) if fecha_col else None,
-                "importe_uy": _parse_number(row.get(importe_uy_col)) if importe_uy_col else None,
-                "importe_usd": _parse_number(row.get(importe_usd_col)) if importe_usd_col else None,
-                "estado": _normalize_estado(str(row.get(estado_col, "")).strip()) if estado_col else None,
-                "fecha_pago": _parse_date(row.get(fecha_pago_col)) if fecha_pago_col else None,
-                "alertas": str(row.get(alertas_col, "")).strip() if alertas_col else None,
-                "fuente_archivo": row.get(fuente_archivo_col),
-            }
-
-            # Auto-fill concepto if missing but there is other signal
-            if not rec["concepto"]:
-                if rec["referencia"] or (rec["importe_uy"] is not None) or (rec["importe_usd"] is not None):
-                    rec["concepto"] = "OTROS"
-
-            if not rec["concepto"] and not rec["fecha_vencimiento"]:
+@dataclass
+class IngestStat:
+    fuente_archivo: str
+    rows_read: int
+    rows_normalized: int
+    seconds: float
+    error: Optional[str] = None
+    cached: bool = False
+
+
+def _ingest_csv(path: str) -> Tuple[Optional[pd.DataFrame], IngestStat]:
+    entry = os.path.basename(path)
+    start = time.perf_counter()
+    try:
+        df = _read_csv(path)
+    except Exception as exc:
+        # Unreadable files are skipped but reported
+        elapsed = time.perf_counter() - start
+        return None, IngestStat(entry, 0, 0, elapsed, f"{type(exc).__name__}: {exc}")
+    frame = _normalize_frame(df)
+    return frame, IngestStat(entry, len(df), len(frame), time.perf_counter() - start)
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _code_fingerprint() -> str:
+    # Cached frames are only valid for the normalization code that produced them, and for the
+    # year that dates like "26/3" were completed with when the file name carries no year
+    return f"{_file_sha256(os.path.abspath(__file__))}:{date.today().year}"
+
+
+def _load_cache_manifest(cache_dir: str) -> Dict[str, dict]:
+    try:
+        with open(os.path.join(cache_dir, CACHE_MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("code") != _code_fingerprint():
+        return {}
+    return manifest.get("files", {})
+
+
+def _save_cache_manifest(cache_dir: str, files: Dict[str, dict]) -> None:
+    manifest_path = os.path.join(cache_dir, CACHE_MANIFEST)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"code": _code_fingerprint(), "files": files}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    # Drop frames no longer referenced by any source file
+    referenced = {entry["frame"] for entry in files.values()}
+    for name in os.listdir(cache_dir):
+        if name.endswith(".pkl") and name not in referenced:
+            os.remove(os.path.join(cache_dir, name))
+
+
+def _cache_lookup(cache_dir: str, entry: Optional[dict], path: str) -> Optional[Tuple[pd.DataFrame, IngestStat]]:
+    if entry is None:
+        return None
+    start = time.perf_counter()
+    st = os.stat(path)
+    if entry["size"] != st.st_size:
+        return None
+    if entry["mtime_ns"] != st.st_mtime_ns:
+        # Fresh checkouts touch every file: fall back to the content hash
+        if entry["sha256"] != _file_sha256(path):
+            return None
+        entry["mtime_ns"] = st.st_mtime_ns
+    try:
+        frame = pd.read_pickle(os.path.join(cache_dir, entry["frame"]))
+    except Exception:
+        return None
+    stat = IngestStat(
+        os.path.basename(path), entry["rows_read"], len(frame), time.perf_counter() - start, cached=True
+    )
+    return frame, stat
+
+
+def _cache_store(cache_dir: str, path: str, frame: pd.DataFrame, stat: IngestStat) -> dict:
+    st = os.stat(path)
+    sha256 = _file_sha256(path)
+    frame_name = hashlib.sha256(f"{stat.fuente_archivo}\0{sha256}".encode("utf-8")).hexdigest() + ".pkl"
+    frame.to_pickle(os.path.join(cache_dir, frame_name))
+    return {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": sha256,
+        "frame": frame_name,
+        "rows_read": stat.rows_read,
+    }
+
+
+def _ingest_csvs(
+    directory: str,
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
+    rebuild_cache: bool = False,
+) -> Tuple[List[pd.DataFrame], List[IngestStat]]:
+    paths = [
+        os.path.join(directory, entry)
+        for entry in sorted(os.listdir(directory))
+        if entry.lower().endswith(".csv")
+    ]
+    manifest: Dict[str, dict] = {}
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        if not rebuild_cache:
+            manifest = _load_cache_manifest(cache_dir)
+
+    results: Dict[str, Tuple[Optional[pd.DataFrame], IngestStat]] = {}
+    if cache_dir:
+        for path in paths:
+            hit = _cache_lookup(cache_dir, manifest.get(os.path.basename(path)), path)
+            if hit is not None:
+                results[path] = hit
+    pending = [path for path in paths if path not in results]
+
+    if workers > 1 and len(pending) > 1:
+        # Executor.map yields in submission order, so frames stay in filename order
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            results.update(zip(pending, pool.map(_ingest_csv, pending)))
+    else:
+        results.update((path, _ingest_csv(path)) for path in pending)
+
+    if cache_dir:
+        files: Dict[str, dict] = {}
+        for path in paths:
+            frame, stat = results[path]
+            if frame is None:
                 continue
+            if stat.cached:
+                files[stat.fuente_archivo] = manifest[stat.fuente_archivo]
+            else:
+                files[stat.fuente_archivo] = _cache_store(cache_dir, path, frame, stat)
+        _save_cache_manifest(cache_dir, files)
+
+    ordered = [results[path] for path in paths]
+    frames = [frame for frame, _ in ordered if frame is not None]
+    stats = [stat for _, stat in ordered]
+    return frames, stats
+
+
+DEDUP_KEY = ["concepto", "fecha_vencimiento", "referencia"]
+# Most informative first: a row with importe_uy beats any row without it, and so on
+RICHNESS_COLUMNS = ["importe_uy", "importe_usd", "estado", "fecha_pago", "alertas"]
+
+
+def _richness_score(df: pd.DataFrame) -> np.ndarray:
+    score = np.zeros(len(df), dtype=np.int64)
+    for col in RICHNESS_COLUMNS:
+        score = (score << 1) | df[col].notna().to_numpy(dtype=np.int64)
+    return score
+
 
-            normalized_rows.append(rec)
+def _sort_codes(values: pd.Series) -> np.ndarray:
+    codes, _ = pd.factorize(values, sort=True)
+    # Missing values sort last
+    return np.where(codes < 0, codes.max() + 1, codes)
 
-    result = pd.DataFrame(normalized_rows, columns=UNIFIED_COLUMNS)
 
+def _deduplicate(result: pd.DataFrame, merge: bool = False) -> pd.DataFrame:
     # Deduplicate: same concepto + fecha + referencia keep the one with more info
-    # Helper columns to prioritize rows with more information
-    result["__has_importe_uy"] = result["importe_uy"].notna()
-    result["__has_importe_usd"] = result["importe_usd"].notna()
-    result["__has_estado"] = result["estado"].notna()
-    result["__has_fecha_pago"] = result["fecha_pago"].notna()
-    result["__has_alertas"] = result["alertas"].notna()
-
-    result.sort_values(
-        by=[
-            "concepto",
-            "fecha_vencimiento",
-            "__has_importe_uy",
-            "__has_importe_usd",
-            "__has_estado",
-            "__has_fecha_pago",
-            "__has_alertas",
-        ],
-        ascending=[True, True, False, False, False, False, False],
-        inplace=True,
-        na_position="last",
-    )
-    result = result.drop_duplicates(
-        subset=["concepto", "fecha_vencimiento", "referencia"], keep="first"
-    )
-    result = result.drop_duplicates(
-        subset=["concepto", "fecha_vencimiento", "referencia"], keep="first"
+    if result.empty:
+        return result.reset_index(drop=True)
+    result = result.reset_index(drop=True)
+    group = result.groupby(DEDUP_KEY, dropna=False, sort=False).ngroup().to_numpy()
+    score = _richness_score(result)
+
+    # Best score per key, then the first row (in source order) reaching it
+    best = np.zeros(group.max() + 1, dtype=np.int64)
+    np.maximum.at(best, group, score)
+    candidates = np.flatnonzero(score == best[group])
+    keep = candidates[~pd.Series(group[candidates]).duplicated().to_numpy()]
+
+    deduped = result.iloc[keep]
+    if merge:
+        # Fill gaps in the best row with non-null fields from its duplicates, in source order
+        rest = np.setdiff1d(np.arange(len(result)), keep, assume_unique=True)
+        ordered = result.iloc[np.concatenate([keep, rest])]
+        merged = ordered.groupby(group[np.concatenate([keep, rest])], sort=False).first()
+        deduped = pd.DataFrame(
+            {col: merged[col].tolist() for col in UNIFIED_COLUMNS}, columns=UNIFIED_COLUMNS
+        )
+        keep_score = _richness_score(deduped)
+    else:
+        keep_score = score[keep]
+
+    # Present rows by concepto and fecha, richer rows first
+    order = np.lexsort(
+        (
+            np.arange(len(deduped)),
+            -keep_score,
+            _sort_codes(deduped["fecha_vencimiento"]),
+            _sort_codes(deduped["concepto"]),
+        )
     )
+    return deduped.iloc[order].reset_index(drop=True)
+
+
+def consolidate_csvs(
+    calendar_dir: Optional[str] = None,
+    workers: int = 1,
+    stats: Optional[List[IngestStat]] = None,
+    cache_dir: Optional[str] = None,
+    rebuild_cache: bool = False,
+    merge_duplicates: bool = False,
+) -> pd.DataFrame:
+    directory = calendar_dir or CALENDAR_DIR
+    frames, file_stats = _ingest_csvs(directory, workers, cache_dir=cache_dir, rebuild_cache=rebuild_cache)
+    if stats is not None:
+        stats.extend(file_stats)
+    if not frames:
+        return pd.DataFrame(columns=UNIFIED_COLUMNS)
+
+    result = _concat_normalized(frames)
+
+    return _deduplicate(result, merge=merge_duplicates)
 
-    # Drop helper columns
-    result.drop(
-        columns=[
-            "__has_importe_uy",
-            "__has_importe_usd",
-            "__has_estado",
-            "__has_fecha_pago",
-            "__has_alertas",
-        ],
-        inplace=True,
-        errors="ignore",
+
+def _is_missing(value: object) -> bool:
+    return value is None or (isinstance(value, float) and pd.isna(value)) or value is pd.NaT
+
+
+def _present(value: object) -> bool:
+    # NaN cells count as empty, so they never show up as "nan" in the calendar
+    return not _is_missing(value) and bool(value)
+
+
+def _workbook_formats(workbook: xlsxwriter.Workbook) -> Dict[str, object]:
+    # One registry per workbook, shared by every sheet written into it
+    return {
+        "title": workbook.add_format(TITLE_FORMAT),
+        "header": workbook.add_format(HEADER_FORMAT),
+        "date": workbook.add_format(DATE_FORMAT),
+        "cell_date": workbook.add_format(CELL_DATE_FORMAT),
+        "money": workbook.add_format(MONEY_FORMAT),
+        "note": workbook.add_format(NOTE_FORMAT),
+    }
+
+
+def _open_workbook(output_path: str) -> xlsxwriter.Workbook:
+    # constant_memory flushes each row as soon as the next one starts: rows must be written in order
+    return xlsxwriter.Workbook(output_path, {"constant_memory": True})
+
+
+def _write_sheet_layout(worksheet, formats: Dict[str, object], title: str) -> None:
+    worksheet.write_string(0, 0, title, formats["title"])
+    for col_idx, col_name in enumerate(UNIFIED_COLUMNS):
+        worksheet.write_string(1, col_idx, col_name, formats["header"])
+    for col_idx, width in enumerate(COLUMN_WIDTHS):
+        worksheet.set_column(col_idx, col_idx, width, formats.get(COLUMN_FORMATS.get(col_idx)))
+    # Freeze panes below header
+    worksheet.freeze_panes(2, 0)
+
+
+def _write_records(worksheet, formats: Dict[str, object], df: pd.DataFrame, first_row: int) -> int:
+    columns = [df[col].tolist() if col in df.columns else [None] * len(df) for col in UNIFIED_COLUMNS]
+    date_format = formats["cell_date"]
+    for row, values in enumerate(zip(*columns), start=first_row):
+        for col_idx, value in enumerate(values):
+            if _is_missing(value) or value == "":
+                continue
+            if isinstance(value, datetime):
+                worksheet.write_datetime(row, col_idx, value, date_format)
+            elif isinstance(value, date):
+                worksheet.write_datetime(row, col_idx, datetime.combine(value, datetime.min.time()), date_format)
+            elif isinstance(value, (int, float, np.number)):
+                worksheet.write_number(row, col_idx, value)
+            else:
+                worksheet.write_string(row, col_idx, str(value))
+    return len(df)
+
+
+def _write_template_sheet(worksheet, formats: Dict[str, object]) -> None:
+    # Empty template with data validation and style
+    _write_sheet_layout(worksheet, formats, "Plantilla - Calendario de Vencimientos")
+
+    # Data validation for estado: column index 5 (0-based); Excel column F
+    estado_col = UNIFIED_COLUMNS.index("estado")
+    worksheet.data_validation(
+        2,
+        estado_col,
+        TEMPLATE_ROWS,
+        estado_col,
+        {
+            "validate": "list",
+            "source": TEMPLATE_ESTADOS,
+            "error_title": "Estado inválido",
+            "error_message": "Seleccione un estado de la lista",
+        },
     )
 
-    return result.reset_index(drop=True)
+    # Footer note
+    worksheet.write_string(TEMPLATE_ROWS + 2, 0, "Notas: utilice formato yyyy-mm-dd para las fechas.", formats["note"])
 
 
 def export_excel_template(output_path: str) -> None:
-    # Create an empty template with data validation and style
-    df = pd.DataFrame(columns=UNIFIED_COLUMNS)
-
-    with pd.ExcelWriter(output_path, engine="xlsxwriter") as writer:
-        sheet_name = "Calendario"
-        df.to_excel(writer, index=False, sheet_name=sheet_name, startrow=1)
-        workbook = writer.book
-        worksheet = writer.sheets[sheet_name]
-
-        # Title
-        title_format = workbook.add_format(
-            {
-                "bold": True,
-                "font_size": 16,
-                "align": "left",
-                "valign": "vcenter",
-            }
-        )
-        worksheet.write(0, 0, "Plantilla - Calendario de Vencimientos", title_format)
-
-        # Header formatting
-        header_format = workbook.add_format(
-            {
-                "bold": True,
-                "bg_color": "#0F4C81",
-                "font_color": "#FFFFFF",
-                "border": 1,
-                "align": "center",
-                "valign": "vcenter",
-            }
-        )
-        for col_idx, col_name in enumerate(UNIFIED_COLUMNS):
-            worksheet.write(1, col_idx, col_name, header_format)
-
-        # Column widths
-        widths = [28, 24, 16, 14, 14, 16, 14, 36, 22]
-        for i, w in enumerate(widths):
-            worksheet.set_column(i, i, w)
-
-        # Date formats
-        date_format = workbook.add_format({"num_format": "yyyy-mm-dd"})
-        money_format = workbook.add_format({"num_format": "$ #,##0.00"})
-
-        # Apply formats to columns
-        # concepto (text), referencia (text), fecha_vencimiento (date), importe_uy (money), importe_usd (money)
-        worksheet.set_column(2, 2, widths[2], date_format)
-        worksheet.set_column(3, 3, widths[3], money_format)
-        worksheet.set_column(4, 4, widths[4], money_format)
-        worksheet.set_column(6, 6, widths[6], date_format)
-
-        # Data validation for estado
-        estados = [
-            "BORRADORES",
-            "PENDIENTE",
-            "PAGO",
-            "EN BORRADORES",
-        ]
-        estado_range = f"C3:C1000"
-        # estado is column index 5 (0-based); Excel column F
-        worksheet.data_validation(
-            2,
-            5,
-            1000,
-            5,
-            {
-                "validate": "list",
-                "source": estados,
-                "error_title": "Estado inválido",
-                "error_message": "Seleccione un estado de la lista",
-            },
-        )
+    workbook = _open_workbook(output_path)
+    _write_template_sheet(workbook.add_worksheet(SHEET_NAME), _workbook_formats(workbook))
+    workbook.close()
+
+
+def export_excel_with_data(df: pd.DataFrame, output_path: str, include_template: bool = False) -> None:
+    if df is None:
+        df = pd.DataFrame(columns=UNIFIED_COLUMNS)
+    workbook = _open_workbook(output_path)
+    formats = _workbook_formats(workbook)
+    worksheet = workbook.add_worksheet(SHEET_NAME)
+    _write_sheet_layout(worksheet, formats, "Calendario de Vencimientos")
+    _write_records(worksheet, formats, df, first_row=2)
+    if include_template:
+        _write_template_sheet(workbook.add_worksheet(TEMPLATE_SHEET_NAME), formats)
+    workbook.close()
 
-        # Freeze panes below header
-        worksheet.freeze_panes(2, 0)
 
-        # Footer note
-        note_format = workbook.add_format({"font_color": "#555555", "italic": True})
-        worksheet.write(1002, 0, "Notas: utilice formato yyyy-mm-dd para las fechas.", note_format)
+def _arrow_table(df: pd.DataFrame) -> pa.Table:
+    return pa.Table.from_pandas(df[UNIFIED_COLUMNS], schema=ARROW_SCHEMA, preserve_index=False)
 
 
-def export_excel_with_data(df: pd.DataFrame, output_path: str) -> None:
+def export_arrow(df: pd.DataFrame, output_path: str) -> None:
     if df is None:
         df = pd.DataFrame(columns=UNIFIED_COLUMNS)
-    # Ensure correct column order
-    for col in UNIFIED_COLUMNS:
-        if col not in df.columns:
-            df[col] = None
-    df = df[UNIFIED_COLUMNS]
-
-    with pd.ExcelWriter(output_path, engine="xlsxwriter") as writer:
-        sheet_name = "Calendario"
-        df.to_excel(writer, index=False, sheet_name=sheet_name, startrow=1)
-        workbook = writer.book
-        worksheet = writer.sheets[sheet_name]
-
-        title_format = workbook.add_format(
-            {"bold": True, "font_size": 16, "align": "left", "valign": "vcenter"}
-        )
-        worksheet.write(0, 0, "Calendario de Vencimientos", title_format)
-
-        header_format = workbook.add_format(
-            {
-                "bold": True,
-                "bg_color": "#0F4C81",
-                "font_color": "#FFFFFF",
-                "border": 1,
-                "align": "center",
-                "valign": "vcenter",
-            }
+    with pa.OSFile(output_path, "wb") as sink, pa.ipc.new_file(sink, ARROW_SCHEMA) as writer:
+        writer.write_table(_arrow_table(df))
+
+
+def read_arrow(path: str) -> pd.DataFrame:
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+ALLOWED_ESTADOS = {"BORRADORES", "PENDIENTE", "PAGO"}
+REPORT_COLUMNS = ["concepto", "referencia", "fecha_vencimiento", "estado", "problemas", "fuente_archivo"]
+
+# Validation rules: name -> function returning a boolean mask (True = problem) over the whole frame
+VALIDATION_RULES: Dict[str, Callable[[pd.DataFrame], pd.Series]] = {}
+DEFAULT_RULES = ["concepto_vacio", "sin_fecha_vencimiento", "sin_importe", "estado_no_normalizado"]
+
+
+def register_rule(name: str) -> Callable:
+    def decorator(func: Callable[[pd.DataFrame], pd.Series]) -> Callable[[pd.DataFrame], pd.Series]:
+        VALIDATION_RULES[name] = func
+        return func
+
+    return decorator
+
+
+def _truthy(series: pd.Series) -> pd.Series:
+    # Same truthiness as `if value:` on each cell (None and "" are falsy, NaN is truthy)
+    return series.astype(bool)
+
+
+@register_rule("concepto_vacio")
+def _rule_concepto_vacio(df: pd.DataFrame) -> pd.Series:
+    return ~_truthy(df["concepto"])
+
+
+@register_rule("sin_fecha_vencimiento")
+def _rule_sin_fecha_vencimiento(df: pd.DataFrame) -> pd.Series:
+    return df["fecha_vencimiento"].isna()
+
+
+@register_rule("sin_importe")
+def _rule_sin_importe(df: pd.DataFrame) -> pd.Series:
+    return df["importe_uy"].isna() & df["importe_usd"].isna()
+
+
+@register_rule("estado_no_normalizado")
+def _rule_estado_no_normalizado(df: pd.DataFrame) -> pd.Series:
+    return _truthy(df["estado"]) & ~df["estado"].isin(ALLOWED_ESTADOS)
+
+
+@register_rule("fecha_pago_antes_de_vencimiento")
+def _rule_fecha_pago_antes_de_vencimiento(df: pd.DataFrame) -> pd.Series:
+    pago = pd.to_datetime(df["fecha_pago"], errors="coerce")
+    vencimiento = pd.to_datetime(df["fecha_vencimiento"], errors="coerce")
+    return pago < vencimiento
+
+
+@register_rule("importe_negativo")
+def _rule_importe_negativo(df: pd.DataFrame) -> pd.Series:
+    uy = pd.to_numeric(df["importe_uy"], errors="coerce")
+    usd = pd.to_numeric(df["importe_usd"], errors="coerce")
+    return (uy < 0) | (usd < 0)
+
+
+def _validate(df: pd.DataFrame, rules: Optional[List[str]] = None) -> pd.DataFrame:
+    rules = DEFAULT_RULES if rules is None else rules
+    if df.empty:
+        return pd.DataFrame()
+    # One boolean mask per rule, combined into the comma-separated problemas column
+    problemas = pd.Series("", index=df.index, dtype=object)
+    for name in rules:
+        mask = np.asarray(VALIDATION_RULES[name](df), dtype=bool)
+        problemas = problemas + np.where(mask, name + ",", "")
+    flagged = (problemas != "").to_numpy()
+    if not flagged.any():
+        return pd.DataFrame()
+
+    report = df.loc[flagged, [c for c in REPORT_COLUMNS if c != "problemas"]].copy()
+    report["problemas"] = problemas[flagged].str.rstrip(",")
+    report.insert(0, "row_index", report.index)
+    return report[["row_index"] + REPORT_COLUMNS].reset_index(drop=True)
+
+
+def _ics_escape(value: object) -> str:
+    text = str(value)
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _ics_fold(line: str) -> str:
+    # RFC 5545 3.1: lines longer than 75 octets continue on a line starting with a space
+    if len(line.encode("utf-8")) <= ICS_LINE_OCTETS:
+        return line + "\r\n"
+    parts: List[str] = []
+    current = ""
+    current_octets = 0
+    limit = ICS_LINE_OCTETS
+    for char in line:
+        octets = len(char.encode("utf-8"))
+        if current_octets + octets > limit:
+            parts.append(current)
+            current, current_octets = "", 0
+            limit = ICS_LINE_OCTETS - 1
+        current += char
+        current_octets += octets
+    parts.append(current)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _event_uid(concepto: object, fecha: date, referencia: object) -> str:
+    # Stable across runs so calendar clients update events instead of duplicating them
+    ref = None if _is_missing(referencia) else str(referencia)
+    key = json.dumps([str(concepto), fecha.isoformat(), ref], ensure_ascii=False)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest() + "@vencimientos"
+
+
+def _ics_event(row, reminders_days: List[int], dtstamp: str) -> Optional[str]:
+    fecha = row.get("fecha_vencimiento")
+    if _is_missing(fecha):
+        return None
+    if isinstance(fecha, str):
+        fecha_dt = _parse_date(fecha)
+    elif isinstance(fecha, (datetime, date)):
+        fecha_dt = fecha.date() if isinstance(fecha, datetime) else fecha
+    else:
+        fecha_dt = None
+    if not fecha_dt:
+        return None
+    concepto_raw = row.get("concepto")
+    concepto = concepto_raw if _present(concepto_raw) else "Vencimiento"
+    ref = row.get("referencia")
+    estado = row.get("estado")
+    importe = row.get("importe_uy") if _present(row.get("importe_uy")) else row.get("importe_usd")
+    alertas = row.get("alertas")
+    detalles = []
+    if _present(ref):
+        detalles.append(f"Referencia: {ref}")
+    if _present(estado):
+        detalles.append(f"Estado: {estado}")
+    if _present(importe):
+        detalles.append(f"Importe: {importe}")
+    if _present(alertas):
+        detalles.append(f"Alertas: {alertas}")
+    description = "\n".join(detalles)
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{_event_uid(concepto_raw, fecha_dt, ref)}",
+        f"DTSTAMP:{dtstamp}",
+        f"DTSTART;VALUE=DATE:{fecha_dt.strftime('%Y%m%d')}",
+        f"SUMMARY:{_ics_escape(concepto)}",
+        f"DESCRIPTION:{_ics_escape(description)}",
+    ]
+    # Add alarms (display notifications) in days before
+    for days_before in reminders_days:
+        days = int(days_before)
+        trigger = f"-P{days}D" if days > 0 else f"P{-days}D"
+        lines.extend(
+            [
+                "BEGIN:VALARM",
+                "ACTION:DISPLAY",
+                f"DESCRIPTION:{_ics_escape(concepto)}",
+                f"TRIGGER:{trigger}",
+                "END:VALARM",
+            ]
         )
-        for col_idx, col_name in enumerate(UNIFIED_COLUMNS):
-            worksheet.write(1, col_idx, col_name, header_format)
-
-        widths = [28, 24, 16, 14, 14, 16, 14, 36, 22]
-        for i, w in enumerate(widths):
-            worksheet.set_column(i, i, w)
-
-        date_format = workbook.add_format({"num_format": "yyyy-mm-dd"})
-        money_format = workbook.add_format({"num_format": "$ #,##0.00"})
-        worksheet.set_column(2, 2, widths[2], date_format)
-        worksheet.set_column(3, 3, widths[3], money_format)
-        worksheet.set_column(4, 4, widths[4], money_format)
-        worksheet.set_column(6, 6, widths[6], date_format)
-        worksheet.freeze_panes(2, 0)
-
-
-def _validate(df: pd.DataFrame) -> pd.DataFrame:
-    problems: List[dict] = []
-    allowed_estados = {"BORRADORES", "PENDIENTE", "PAGO"}
-    for idx, row in df.iterrows():
-        issues: List[str] = []
-        if not row.get("concepto"):
-            issues.append("concepto_vacio")
-        if pd.isna(row.get("fecha_vencimiento")) or row.get("fecha_vencimiento") is None:
-            issues.append("sin_fecha_vencimiento")
-        if pd.isna(row.get("importe_uy")) and pd.isna(row.get("importe_usd")):
-            issues.append("sin_importe")
-        estado_val = row.get("estado")
-        if estado_val and estado_val not in allowed_estados:
-            issues.append("estado_no_normalizado")
-        if issues:
-            problems.append({
-                "row_index": idx,
-                "concepto": row.get("concepto"),
-                "referencia": row.get("referencia"),
-                "fecha_vencimiento": row.get("fecha_vencimiento"),
-                "estado": estado_val,
-                "problemas": ",".join(issues),
-                "fuente_archivo": row.get("fuente_archivo"),
-            })
-    return pd.DataFrame(problems)
+    lines.append("END:VEVENT")
+    return "".join(_ics_fold(line) for line in lines)
+
+
+def _ics_dtstamp() -> str:
+    return datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
 
 
 def export_ics(df: pd.DataFrame, output_path: str, reminders_days: Optional[List[int]] = None) -> None:
     if reminders_days is None:
         reminders_days = [3, 1]
-    cal = Calendar()
-    for _, row in df.iterrows():
-        fecha = row.get("fecha_vencimiento")
-        concepto = row.get("concepto") or "Vencimiento"
-        if pd.isna(fecha) or fecha is None:
+    dtstamp = _ics_dtstamp()
+    columns = list(df.columns)
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        f.write(ICS_HEADER)
+        for values in df.itertuples(index=False, name=None):
+            event = _ics_event(dict(zip(columns, values)), reminders_days, dtstamp)
+            if event is not None:
+                f.write(event)
+        f.write(ICS_FOOTER)
+
+
+def _iter_csv_chunks(path: str, chunksize: int) -> Iterator[Tuple[int, pd.DataFrame]]:
+    entry = os.path.basename(path)
+    # Closed when the consumer stops early too: a read error or a failed export abandons the generator
+    with pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunksize) as reader:
+        for chunk in reader:
+            chunk["__fuente_archivo"] = entry
+            yield len(chunk), _normalize_frame(chunk)
+
+
+def _iter_deduplicated_chunks(
+    directory: str,
+    chunksize: int = STREAM_CHUNKSIZE,
+    stats: Optional[List[IngestStat]] = None,
+) -> Iterator[pd.DataFrame]:
+    paths = [
+        os.path.join(directory, entry)
+        for entry in sorted(os.listdir(directory))
+        if entry.lower().endswith(".csv")
+    ]
+
+    # Pass 1: only the dedup index (key -> best score, row number) stays in memory
+    index: Dict[tuple, Tuple[int, int]] = {}
+    readable: List[str] = []
+    total = 0
+    for path in paths:
+        start = time.perf_counter()
+        rows_read = rows_normalized = 0
+        # Previous index entries touched by this file, to roll back if it turns out unreadable
+        undo: Dict[tuple, Optional[Tuple[int, int]]] = {}
+        try:
+            for chunk_rows, chunk in _iter_csv_chunks(path, chunksize):
+                scores = _richness_score(chunk).tolist()
+                keys = zip(*(chunk[col].tolist() for col in DEDUP_KEY))
+                for seq, (key, score) in enumerate(zip(keys, scores), start=total + rows_normalized):
+                    best = index.get(key)
+                    if best is None or score > best[0]:
+                        if key not in undo:
+                            undo[key] = best
+                        index[key] = (score, seq)
+                rows_read += chunk_rows
+                rows_normalized += len(chunk)
+        except Exception as exc:
+            # Unreadable files are skipped as a whole, as in the in-memory path
+            for key, best in undo.items():
+                if best is None:
+                    del index[key]
+                else:
+                    index[key] = best
+            if stats is not None:
+                elapsed = time.perf_counter() - start
+                stats.append(IngestStat(os.path.basename(path), 0, 0, elapsed, f"{type(exc).__name__}: {exc}"))
             continue
-        if isinstance(fecha, str):
-            fecha_dt = _parse_date(fecha)
-        elif isinstance(fecha, (datetime, date)):
-            fecha_dt = fecha if isinstance(fecha, date) else fecha.date()
+        total += rows_normalized
+        readable.append(path)
+        if stats is not None:
+            stats.append(IngestStat(os.path.basename(path), rows_read, rows_normalized, time.perf_counter() - start))
+
+    winners = np.zeros(total, dtype=bool)
+    winners[[seq for _, seq in index.values()]] = True
+    del index
+
+    # Pass 2: re-read and emit only the winning rows, in source order
+    seq = 0
+    for path in readable:
+        for _, chunk in _iter_csv_chunks(path, chunksize):
+            mask = winners[seq : seq + len(chunk)]
+            seq += len(chunk)
+            if mask.any():
+                yield chunk[mask].reset_index(drop=True)
+
+
+def export_streaming(
+    chunks: Iterable[pd.DataFrame],
+    excel_path: str,
+    ics_path: str,
+    report_path: str,
+    reminders_days: Optional[List[int]] = None,
+    rules: Optional[List[str]] = None,
+    include_template: bool = False,
+    arrow_path: Optional[str] = None,
+) -> Tuple[int, int]:
+    if reminders_days is None:
+        reminders_days = [3, 1]
+    rows = issues = 0
+    dtstamp = _ics_dtstamp()
+    # Every output is closed even if a chunk fails halfway, the Arrow writer before its sink
+    with contextlib.ExitStack() as stack:
+        arrow_writer = None
+        if arrow_path:
+            arrow_sink = stack.enter_context(pa.OSFile(arrow_path, "wb"))
+            arrow_writer = stack.enter_context(pa.ipc.new_file(arrow_sink, ARROW_SCHEMA))
+
+        workbook = stack.enter_context(_open_workbook(excel_path))
+        formats = _workbook_formats(workbook)
+        worksheet = workbook.add_worksheet(SHEET_NAME)
+        _write_sheet_layout(worksheet, formats, "Calendario de Vencimientos")
+
+        ics_file = stack.enter_context(open(ics_path, "w", encoding="utf-8", newline=""))
+        report_file = stack.enter_context(open(report_path, "w", encoding="utf-8", newline=""))
+        ics_file.write(ICS_HEADER)
+        for chunk in chunks:
+            _write_records(worksheet, formats, chunk, first_row=rows + 2)
+            if arrow_writer is not None:
+                arrow_writer.write_table(_arrow_table(chunk))
+            columns = list(chunk.columns)
+            for values in chunk.itertuples(index=False, name=None):
+                event = _ics_event(dict(zip(columns, values)), reminders_days, dtstamp)
+                if event is not None:
+                    ics_file.write(event)
+
+            report = _validate(chunk.set_index(chunk.index + rows), rules)
+            if not report.empty:
+                report.to_csv(report_file, index=False, header=issues == 0)
+                issues += len(report)
+            rows += len(chunk)
+        ics_file.write(ICS_FOOTER)
+        if issues == 0:
+            # Same empty report as the in-memory path
+            pd.DataFrame().to_csv(report_file, index=False)
+        if include_template:
+            _write_template_sheet(workbook.add_worksheet(TEMPLATE_SHEET_NAME), formats)
+    return rows, issues
+
+
+def _print_ingest_report(stats: List[IngestStat]) -> None:
+    for stat in stats:
+        if stat.error:
+            print(f"  {stat.fuente_archivo}: error de lectura ({stat.error})")
         else:
-            fecha_dt = None
-        if not fecha_dt:
-            continue
-        event = Event()
-        event.name = str(concepto)
-        event.begin = datetime.combine(fecha_dt, datetime.min.time())
-        event.make_all_day()
-        ref = row.get("referencia")
-        estado = row.get("estado")
-        importe = row.get("importe_uy") or row.get("importe_usd")
-        alertas = row.get("alertas")
-        detalles = []
-        if ref:
-            detalles.append(f"Referencia: {ref}")
-        if estado:
-            detalles.append(f"Estado: {estado}")
-        if importe:
-            detalles.append(f"Importe: {importe}")
-        if alertas:
-            detalles.append(f"Alertas: {alertas}")
-        event.description = "\n".join(detalles)
-
-        # Add alarms (display notifications) in days before
-        for days_before in reminders_days:
-            try:
-                delta = timedelta(days=-int(days_before))
-                alarm = DisplayAlarm(trigger=delta, display_text=str(concepto))
-                event.alarms.append(alarm)
-            except Exception:
-                pass
-        cal.events.add(event)
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.writelines(cal)
+            origen = "cache" if stat.cached else f"{stat.seconds:.2f}s"
+            print(
+                f"  {stat.fuente_archivo}: filas={stat.rows_read} normalizadas={stat.rows_normalized} ({origen})"
+            )
 
 
 def main():
@@ -516,35 +1083,115 @@ def main():
     parser.add_argument("--dir", default=CALENDAR_DIR, help="Directorio con CSVs de vencimientos")
     parser.add_argument("--out-excel", default="Plantilla_Calendario_Vencimientos.xlsx")
     parser.add_argument("--out-excel-data", default="Calendario_Vencimientos_Completo.xlsx")
+    parser.add_argument(
+        "--out-arrow",
+        default="Calendario_Vencimientos_Completo.arrow",
+        help="Consolidado en Arrow IPC para gcal_sync (vacío para omitir)",
+    )
     parser.add_argument("--out-ics", default="Calendario_Vencimientos.ics")
     parser.add_argument("--out-report", default="Vencimientos_Validacion.csv")
     parser.add_argument(
         "--reminders", nargs="*", type=int, default=[3, 1], help="Días antes del vencimiento para alertas"
     )
     parser.add_argument("--template-only", action="store_true")
+    parser.add_argument(
+        "--template-sheet",
+        action="store_true",
+        help="Incluir también la hoja de plantilla en el Excel con datos",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Procesos para leer y normalizar los CSVs en paralelo"
+    )
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Directorio de cache de CSVs normalizados")
+    parser.add_argument("--no-cache", action="store_true", help="Normalizar todos los CSVs sin usar la cache")
+    parser.add_argument("--rebuild-cache", action="store_true", help="Descartar la cache y regenerarla")
+    parser.add_argument(
+        "--merge-duplicates",
+        action="store_true",
+        help="Combinar los campos no vacíos de filas duplicadas en lugar de quedarse solo con la más completa",
+    )
+    parser.add_argument(
+        "--parse-stats",
+        action="store_true",
+        help="Mostrar aciertos/fallos de la memoria de parseo (solo proceso principal, sin --workers)",
+    )
+
+    parser.add_argument(
+        "--rules",
+        nargs="*",
+        choices=sorted(VALIDATION_RULES),
+        default=DEFAULT_RULES,
+        help="Reglas de validación a aplicar en el reporte",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Procesar los CSVs por bloques con memoria acotada (filas en orden de origen, sin cache ni --workers)",
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=STREAM_CHUNKSIZE, help="Filas por bloque en modo --stream"
+    )
 
     args = parser.parse_args()
+    if args.stream and args.merge_duplicates:
+        parser.error("--merge-duplicates no está disponible con --stream")
+
+    arrow_note = f", {args.out_arrow}" if args.out_arrow else ""
 
     if args.template_only:
         export_excel_template(args.out_excel)
         print(f"Plantilla creada en {args.out_excel}")
         return
 
-    df = consolidate_csvs(args.dir)
-    report_df = _validate(df)
-    export_excel_with_data(df, args.out_excel_data)
+    if args.stream:
+        stats: List[IngestStat] = []
+        rows, issues = export_streaming(
+            _iter_deduplicated_chunks(args.dir, args.chunksize, stats),
+            args.out_excel_data,
+            args.out_ics,
+            args.out_report,
+            reminders_days=args.reminders,
+            rules=args.rules,
+            include_template=args.template_sheet,
+            arrow_path=args.out_arrow or None,
+        )
+        _print_ingest_report(stats)
+        export_excel_template(args.out_excel)
+        print(
+            f"Generados: {args.out_excel_data}, {args.out_excel}, {args.out_ics}, {args.out_report}{arrow_note} (filas={rows}, issues={issues})"
+        )
+        return
+
+    stats = []
+    df = consolidate_csvs(
+        args.dir,
+        workers=args.workers,
+        stats=stats,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        rebuild_cache=args.rebuild_cache,
+        merge_duplicates=args.merge_duplicates,
+    )
+    _print_ingest_report(stats)
+    if args.parse_stats:
+        for name, counters in parser_cache_stats().items():
+            detalle = " ".join(f"{key}={value}" for key, value in counters.items())
+            print(f"  parser {name}: {detalle}")
+    report_df = _validate(df, args.rules)
+    export_excel_with_data(df, args.out_excel_data, include_template=args.template_sheet)
+    if args.out_arrow:
+        export_arrow(df, args.out_arrow)
     export_excel_template(args.out_excel)
     export_ics(df, args.out_ics, reminders_days=args.reminders)
     if not report_df.empty:
         report_df.to_csv(args.out_report, index=False)
         print(
-            f"Generados: {args.out_excel_data}, {args.out_excel}, {args.out_ics}, {args.out_report} (filas={len(df)}, issues={len(report_df)})"
+            f"Generados: {args.out_excel_data}, {args.out_excel}, {args.out_ics}, {args.out_report}{arrow_note} (filas={len(df)}, issues={len(report_df)})"
         )
     else:
         # Create empty report with header for consistency
         report_df.to_csv(args.out_report, index=False)
         print(
-            f"Generados: {args.out_excel_data}, {args.out_excel}, {args.out_ics}, {args.out_report} (filas={len(df)}, issues=0)"
+            f"Generados: {args.out_excel_data}, {args.out_excel}, {args.out_ics}, {args.out_report}{arrow_note} (filas={len(df)}, issues=0)"
         )
 
 
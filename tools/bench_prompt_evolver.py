@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Benchmark prompt_evolver.collect_metrics and the fused fixer pass over a markdown corpus
+against the previous multi-pass implementations, and check that every result is unchanged.
+Also runs the tool with and without its result cache and checks the reports are identical."""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import prompt_evolver as pe
+
+
+def legacy_collect_metrics(file_path: Path, content: str) -> pe.FileMetrics:
+    # Previous implementation: one pass over the text per metric, uncompiled patterns
+    lines = content.splitlines()
+    return pe.FileMetrics(
+        file_path=file_path,
+        num_characters=len(content),
+        num_lines=len(lines),
+        num_words=len(pe.split_words(content)),
+        num_sentences=len(pe.split_sentences(content)),
+        num_paragraphs=pe.count_paragraphs(content),
+        num_headings=pe.count_headings(lines),
+        num_code_fences=pe.count_code_fences(lines),
+        trailing_whitespace_lines=pe.count_trailing_whitespace_lines(lines),
+        consecutive_blank_line_runs_over_two=pe.count_consecutive_blank_runs_over_two(lines),
+        malformed_heading_lines=pe.count_malformed_heading_lines(lines),
+    )
+
+
+def legacy_strip_trailing_whitespace(lines: List[str]) -> Tuple[List[str], int]:
+    # Previous fixers, one list pass each; the current ones in prompt_evolver wrap the LineFixer classes
+    updated: List[str] = []
+    changes = 0
+    for line in lines:
+        new_line = line.rstrip(" \t")
+        if new_line != line:
+            changes += 1
+        updated.append(new_line)
+    return updated, changes
+
+
+def legacy_collapse_excess_blank_lines(lines: List[str]) -> Tuple[List[str], int]:
+    updated: List[str] = []
+    changes = 0
+    blank_run = 0
+    for line in lines:
+        if line.strip() == "":
+            blank_run += 1
+            if blank_run <= 2:
+                updated.append("")
+            else:
+                changes += 1
+        else:
+            blank_run = 0
+            updated.append(line)
+    return updated, changes
+
+
+def legacy_ensure_space_after_heading_hash(lines: List[str]) -> Tuple[List[str], int]:
+    updated: List[str] = []
+    changes = 0
+    for line in lines:
+        match = re.match(r"^(#{1,6})(\S.*)$", line)
+        if match:
+            updated.append(f"{match.group(1)} {match.group(2)}")
+            changes += 1
+        else:
+            updated.append(line)
+    return updated, changes
+
+
+def legacy_fix_and_measure(file_path: Path, content: str) -> pe.FixOutcome:
+    # Previous process_file fix path: three list passes, then collect_metrics on both versions
+    lines = content.splitlines()
+    lines, stripped = legacy_strip_trailing_whitespace(lines)
+    lines, collapsed = legacy_collapse_excess_blank_lines(lines)
+    lines, headings = legacy_ensure_space_after_heading_hash(lines)
+    notes = [
+        note
+        for count, note in (
+            (stripped, f"stripped trailing whitespace on {stripped} lines"),
+            (collapsed, f"collapsed {collapsed} excess blank lines"),
+            (headings, f"normalized {headings} heading lines missing a space"),
+        )
+        if count
+    ]
+    if notes:
+        notes.append("ensured file ends with a single newline")
+    new_content = "\n".join(lines).rstrip("\n") + "\n"
+    return pe.FixOutcome(
+        content=new_content,
+        notes=notes,
+        before_metrics=legacy_collect_metrics(file_path, content),
+        after_metrics=legacy_collect_metrics(file_path, new_content),
+    )
+
+
+def _timed(corpus: List[Tuple[Path, str]], collect: Callable[[Path, str], object], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for file_path, content in corpus:
+            collect(file_path, content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check(corpus: List[Tuple[Path, str]]) -> int:
+    mismatches = 0
+    for file_path, content in corpus:
+        # CRLF variant too: exports from Windows editors are common in the prompt library
+        for variant in (content, content.replace("\n", "\r\n")):
+            expected = legacy_collect_metrics(file_path, variant)
+            actual = pe.collect_metrics(file_path, variant)
+            if actual != expected:
+                mismatches += 1
+                print(f"mismatch: {file_path}\n  legacy: {expected}\n  new:    {actual}", file=sys.stderr)
+            if pe.fix_and_measure(file_path, variant) != legacy_fix_and_measure(file_path, variant):
+                mismatches += 1
+                print(f"fix mismatch: {file_path}", file=sys.stderr)
+    return mismatches
+
+
+TOOL = Path(pe.__file__).resolve()
+
+
+def _run_tool(root: Path, report: Path, *extra: str) -> Tuple[float, List[str]]:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(TOOL), "--path", str(root), "--report", str(report), *extra],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    seconds = time.perf_counter() - start
+    # The header timestamp and timing lines differ between any two runs
+    lines = report.read_text(encoding="utf-8").splitlines()[1:]
+    return seconds, [line for line in lines if not line.startswith(("Time:", "Wall clock:"))]
+
+
+def check_cache(root: Path, workdir: Path) -> int:
+    """Reports with --no-cache, a cold cache, a warm cache and after touching every file must be identical."""
+    failures = 0
+    for mode_args in ([], ["--apply-minimal-fixes"]):
+        label = "fix" if mode_args else "analyze"
+        # Fix runs rewrite files, so each side gets its own copy of the corpus
+        uncached_root, cached_root = workdir / label / "uncached", workdir / label / "cached"
+        for copy_root in (uncached_root, cached_root):
+            shutil.copytree(root, copy_root, ignore=shutil.ignore_patterns(".git", ".backups", "*.zip", "*.png"))
+        cache_file = workdir / label / "cache.json"
+        report = workdir / label / "report.md"
+        # Backups outside the copies: the default .backups/<timestamp> would be scanned on the next run
+        backups = ("--backup-dir", str(workdir / label / "backups"))
+        for run in ("cold cache", "warm cache", "after touch"):
+            if run == "after touch":
+                for path in pe.find_markdown_files(cached_root):
+                    os.utime(path)
+            uncached_seconds, uncached_lines = _run_tool(uncached_root, report, "--no-cache", *backups, *mode_args)
+            cached_seconds, cached_lines = _run_tool(cached_root, report, "--cache", str(cache_file), *backups, *mode_args)
+            same = [line.replace(str(uncached_root), "<root>") for line in uncached_lines] == [
+                line.replace(str(cached_root), "<root>") for line in cached_lines
+            ]
+            failures += not same
+            print(
+                f"  {label:<8} {run:<12} --no-cache {uncached_seconds:6.2f}s  cache {cached_seconds:6.2f}s  "
+                f"reports identical: {same}"
+            )
+    return failures
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", default=str(Path(__file__).resolve().parents[1]), help="Root path to scan")
+    parser.add_argument("--rounds", type=int, default=5, help="timing rounds; the best one is reported")
+    parser.add_argument("--skip-cache-check", action="store_true", help="skip the cached vs uncached report check")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    files = pe.find_markdown_files(Path(args.path).resolve())
+    corpus = [(file_path, pe.read_text(file_path)) for file_path in files]
+    size = sum(len(content) for _, content in corpus)
+    print(f"corpus: {len(corpus)} markdown files, {size / 2**20:.1f} MiB of text")
+
+    mismatches = check(corpus)
+    print(f"metrics and fixes unchanged: {mismatches == 0} ({len(corpus) * 2} documents compared)")
+
+    legacy_seconds = _timed(corpus, legacy_collect_metrics, args.rounds)
+    new_seconds = _timed(corpus, pe.collect_metrics, args.rounds)
+    for label, seconds in (("multi-pass (legacy)", legacy_seconds), ("single pass", new_seconds)):
+        print(f"  {label:<20} {seconds * 1000:8.1f} ms  {size / 2**20 / seconds:6.1f} MiB/s")
+    print(f"  speedup x{legacy_seconds / new_seconds:.2f}")
+    legacy_seconds = _timed(corpus, legacy_fix_and_measure, args.rounds)
+    new_seconds = _timed(corpus, pe.fix_and_measure, args.rounds)
+    print("fixes + before/after metrics:")
+    for label, seconds in (("three passes + 2x", legacy_seconds), ("fused pipeline", new_seconds)):
+        print(f"  {label:<20} {seconds * 1000:8.1f} ms  {size / 2**20 / seconds:6.1f} MiB/s")
+    print(f"  speedup x{legacy_seconds / new_seconds:.2f}")
+
+    cache_failures = 0
+    if not args.skip_cache_check:
+        print("result cache (whole-tool runs on copies of the corpus):")
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_failures = check_cache(Path(args.path).resolve(), Path(tmp))
+    return 1 if mismatches or cache_failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
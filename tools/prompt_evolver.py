@@ -1,14 +1,25 @@
 #!/usr/bin/env python3
 
 import argparse
+import dataclasses
 import datetime
+import functools
+import hashlib
+import json
 import os
 import re
 import shutil
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+CACHE_FILE_NAME = ".prompt_evolver_cache.json"
+# Bump when metrics, fixes or notes change so cached results are recomputed
+CACHE_VERSION = 1
 
 
 @dataclass
@@ -34,6 +45,7 @@ class FileResult:
     before_metrics: FileMetrics
     after_metrics: FileMetrics
     notes: List[str]
+    elapsed_seconds: float = 0.0
 
 
 def find_markdown_files(root_path: Path) -> List[Path]:
@@ -53,8 +65,28 @@ def read_text(file_path: Path) -> str:
         return file_path.read_text(encoding="utf-8", errors="replace")
 
 
+def decode_text(data: bytes) -> str:
+    """read_text() for bytes already in memory, including its newline translation."""
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        text = data.decode("utf-8", errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
 def write_text(file_path: Path, content: str) -> None:
-    file_path.write_text(content, encoding="utf-8")
+    # Write a sibling temp file and rename it over the original so an interrupted run never truncates a prompt.
+    # Resolve first: renaming over a symlink would replace the link instead of the prompt it points to.
+    file_path = file_path.resolve()
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{file_path.name}.", suffix=".tmp", dir=file_path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(content)
+        shutil.copymode(file_path, tmp_name)
+        os.replace(tmp_name, file_path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
 
 
 def split_sentences(text: str) -> List[str]:
@@ -109,101 +141,260 @@ def count_malformed_heading_lines(lines: List[str]) -> int:
     return malformed
 
 
+_WORD_RE = re.compile(r"[\w'-]+")
+# Sentence punctuation, then whitespace followed by more text: each match starts a new sentence
+_SENTENCE_BREAK_RE = re.compile(r"[.!?]\s+(?=\S)")
+_HEADING_RE = re.compile(r"#{1,6}[^#]")
+_MALFORMED_HEADING_RE = re.compile(r"#{1,6}\S")
+
+
+class _LineMetrics:
+    """Line-based FileMetrics counters, fed one line at a time."""
+
+    __slots__ = (
+        "lines",
+        "headings",
+        "code_fences",
+        "trailing_whitespace",
+        "excess_blank_runs",
+        "malformed_headings",
+        "paragraphs",
+        "blank_run",
+        "in_paragraph",
+    )
+
+    def __init__(self) -> None:
+        self.lines = self.headings = self.code_fences = self.trailing_whitespace = 0
+        self.excess_blank_runs = self.malformed_headings = self.paragraphs = self.blank_run = 0
+        self.in_paragraph = False
+
+    def add(self, line: str) -> None:
+        self.lines += 1
+        if line and line[-1] in " \t":
+            self.trailing_whitespace += 1
+        stripped = line.strip()
+        if not stripped:
+            self.blank_run += 1
+            self.in_paragraph = False
+            return
+        if self.blank_run > 2:
+            self.excess_blank_runs += 1
+        self.blank_run = 0
+        if not self.in_paragraph:
+            self.paragraphs += 1
+            self.in_paragraph = True
+        if stripped[0] == "#":
+            if _HEADING_RE.match(stripped):
+                self.headings += 1
+        elif stripped.startswith("```"):
+            self.code_fences += 1
+        if line[0] == "#" and _MALFORMED_HEADING_RE.match(line):
+            self.malformed_headings += 1
+
+    def metrics(
+        self, file_path: Path, num_characters: int, tokens: Tuple[int, int], paragraphs: Optional[int] = None
+    ) -> FileMetrics:
+        return FileMetrics(
+            file_path=file_path,
+            num_characters=num_characters,
+            num_lines=self.lines,
+            num_words=tokens[0],
+            num_sentences=tokens[1],
+            num_paragraphs=self.paragraphs if paragraphs is None else paragraphs,
+            num_headings=self.headings,
+            num_code_fences=self.code_fences,
+            trailing_whitespace_lines=self.trailing_whitespace,
+            consecutive_blank_line_runs_over_two=self.excess_blank_runs + (self.blank_run > 2),
+            malformed_heading_lines=self.malformed_headings,
+        )
+
+
+def _token_counts(content: str) -> Tuple[int, int]:
+    """(words, sentences): one regex scan each over the whole text."""
+    has_text = bool(content) and not content.isspace()
+    sentences = len(_SENTENCE_BREAK_RE.findall(content)) + 1 if has_text else 0
+    return len(_WORD_RE.findall(content)), sentences
+
+
+def _split_paragraphs_fallback(content: str, lines: List[str]) -> Optional[int]:
+    # Paragraphs split on \n only; if splitlines() also broke on \r, \x0c, \u2028... count them the old way
+    if len(lines) != content.count("\n") + (0 if not content or content.endswith("\n") else 1):
+        return count_paragraphs(content)
+    return None
+
+
 def collect_metrics(file_path: Path, content: str) -> FileMetrics:
+    """All FileMetrics in one walk over the lines; words and sentences are one regex scan each."""
     lines = content.splitlines()
-    words = split_words(content)
-    sentences = split_sentences(content)
-    metrics = FileMetrics(
-        file_path=file_path,
-        num_characters=len(content),
-        num_lines=len(lines),
-        num_words=len(words),
-        num_sentences=len(sentences),
-        num_paragraphs=count_paragraphs(content),
-        num_headings=count_headings(lines),
-        num_code_fences=count_code_fences(lines),
-        trailing_whitespace_lines=count_trailing_whitespace_lines(lines),
-        consecutive_blank_line_runs_over_two=count_consecutive_blank_runs_over_two(lines),
-        malformed_heading_lines=count_malformed_heading_lines(lines),
+    counters = _LineMetrics()
+    add = counters.add
+    for line in lines:
+        add(line)
+    return counters.metrics(
+        file_path, len(content), _token_counts(content), _split_paragraphs_fallback(content, lines)
     )
-    return metrics
 
 
-def normalize_code_fence_indentation(lines: List[str]) -> Tuple[List[str], int]:
-    updated: List[str] = []
-    changes = 0
-    for line in lines:
-        if line.lstrip().startswith("```") and not line.startswith("```"):
-            updated.append(line.lstrip())
-            changes += 1
-        else:
-            updated.append(line)
-    return updated, changes
+class LineFixer:
+    """A streaming line transform in the fused fixer pass.
 
+    fix() receives each line as left by the previous fixers and returns its replacement, or None
+    to drop it; per-file state lives on the instance. `note` is formatted with the number of
+    changes. A fixer that can create, merge or remove words or sentence breaks must set
+    preserves_tokens = False so the after-metrics rescan the fixed text.
+    """
 
-def ensure_space_after_heading_hash(lines: List[str]) -> Tuple[List[str], int]:
-    updated: List[str] = []
-    changes = 0
-    for line in lines:
-        match = re.match(r"^(#{1,6})(\S.*)$", line)
-        if match:
-            updated.append(f"{match.group(1)} {match.group(2)}")
-            changes += 1
-        else:
-            updated.append(line)
-    return updated, changes
+    note = "changed {changes} lines"
+    preserves_tokens = True
 
+    def __init__(self) -> None:
+        self.changes = 0
 
-def strip_trailing_whitespace(lines: List[str]) -> Tuple[List[str], int]:
-    updated: List[str] = []
-    changes = 0
-    for line in lines:
+    def fix(self, line: str) -> Optional[str]:
+        raise NotImplementedError
+
+
+class StripTrailingWhitespace(LineFixer):
+    note = "stripped trailing whitespace on {changes} lines"
+
+    def fix(self, line: str) -> Optional[str]:
         new_line = line.rstrip(" \t")
         if new_line != line:
-            changes += 1
-        updated.append(new_line)
-    return updated, changes
+            self.changes += 1
+        return new_line
 
 
-def collapse_excess_blank_lines(lines: List[str]) -> Tuple[List[str], int]:
-    updated: List[str] = []
-    changes = 0
-    blank_run = 0
-    for line in lines:
+class CollapseExcessBlankLines(LineFixer):
+    note = "collapsed {changes} excess blank lines"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.blank_run = 0
+
+    def fix(self, line: str) -> Optional[str]:
         if line.strip() == "":
-            blank_run += 1
-            if blank_run <= 2:
-                updated.append("")
-            else:
-                changes += 1
-        else:
-            blank_run = 0
-            updated.append(line)
-    return updated, changes
+            self.blank_run += 1
+            if self.blank_run <= 2:
+                return ""
+            self.changes += 1
+            return None
+        self.blank_run = 0
+        return line
 
 
-def apply_minimal_fixes(content: str) -> Tuple[str, List[str]]:
-    lines = content.splitlines()
-    notes: List[str] = []
+class EnsureSpaceAfterHeadingHash(LineFixer):
+    note = "normalized {changes} heading lines missing a space"
+    _pattern = re.compile(r"^(#{1,6})(\S.*)$")
+
+    def fix(self, line: str) -> Optional[str]:
+        match = self._pattern.match(line) if line[:1] == "#" else None
+        if match:
+            self.changes += 1
+            return f"{match.group(1)} {match.group(2)}"
+        return line
+
+
+class NormalizeCodeFenceIndentation(LineFixer):
+    note = "removed indentation from {changes} code fences"
+
+    def fix(self, line: str) -> Optional[str]:
+        if line.lstrip().startswith("```") and not line.startswith("```"):
+            self.changes += 1
+            return line.lstrip()
+        return line
+
+
+# Do NOT change indentation of code fences to preserve original indentation style
+MINIMAL_FIXERS: Tuple[Type[LineFixer], ...] = (
+    StripTrailingWhitespace,
+    CollapseExcessBlankLines,
+    EnsureSpaceAfterHeadingHash,
+)
+
+
+def _run_fixer(fixer: LineFixer, lines: List[str]) -> Tuple[List[str], int]:
+    updated = [fixed for fixed in map(fixer.fix, lines) if fixed is not None]
+    return updated, fixer.changes
+
+
+def normalize_code_fence_indentation(lines: List[str]) -> Tuple[List[str], int]:
+    return _run_fixer(NormalizeCodeFenceIndentation(), lines)
+
+
+def ensure_space_after_heading_hash(lines: List[str]) -> Tuple[List[str], int]:
+    return _run_fixer(EnsureSpaceAfterHeadingHash(), lines)
+
+
+def strip_trailing_whitespace(lines: List[str]) -> Tuple[List[str], int]:
+    return _run_fixer(StripTrailingWhitespace(), lines)
+
 
-    lines, n1 = strip_trailing_whitespace(lines)
-    if n1:
-        notes.append(f"stripped trailing whitespace on {n1} lines")
+def collapse_excess_blank_lines(lines: List[str]) -> Tuple[List[str], int]:
+    return _run_fixer(CollapseExcessBlankLines(), lines)
 
-    lines, n2 = collapse_excess_blank_lines(lines)
-    if n2:
-        notes.append(f"collapsed {n2} excess blank lines")
 
-    lines, n3 = ensure_space_after_heading_hash(lines)
-    if n3:
-        notes.append(f"normalized {n3} heading lines missing a space")
+@dataclass
+class FixOutcome:
+    content: str
+    notes: List[str]
+    before_metrics: FileMetrics
+    after_metrics: FileMetrics
 
-    # Do NOT change indentation of code fences to preserve original indentation style
 
-    new_content = "\n".join(lines).rstrip("\n") + "\n"
+def fix_and_measure(
+    file_path: Path, content: str, fixer_types: Iterable[Type[LineFixer]] = MINIMAL_FIXERS
+) -> FixOutcome:
+    """Run every fixer and measure the text before and after, all in one pass over the lines."""
+    lines = content.splitlines()
+    fixers = [fixer_type() for fixer_type in fixer_types]
+    before, after = _LineMetrics(), _LineMetrics()
+    fix_calls = [fixer.fix for fixer in fixers]
+    add_before = before.add
+    fixed: List[str] = []
+    held_blank = 0
+    for line in lines:
+        add_before(line)
+        for fix in fix_calls:
+            line = fix(line)
+            if line is None:
+                break
+        else:
+            if not line:
+                # Empty lines are only kept if more text follows: the file ends with a single newline
+                held_blank += 1
+                continue
+            for _ in range(held_blank):
+                after.add("")
+                fixed.append("")
+            held_blank = 0
+            after.add(line)
+            fixed.append(line)
+    if not fixed:
+        after.add("")
+    new_content = "\n".join(fixed) + "\n"
+
+    notes = [fixer.note.format(changes=fixer.changes) for fixer in fixers if fixer.changes]
     if notes:
         notes.append("ensured file ends with a single newline")
-    return new_content, notes
+    tokens = _token_counts(content)
+    if new_content != content and not all(fixer.preserves_tokens for fixer in fixers):
+        after_tokens = _token_counts(new_content)
+    else:
+        after_tokens = tokens
+    return FixOutcome(
+        content=new_content,
+        notes=notes,
+        before_metrics=before.metrics(
+            file_path, len(content), tokens, _split_paragraphs_fallback(content, lines)
+        ),
+        # Fixed lines are joined with \n only, so the line-based paragraph count is exact
+        after_metrics=after.metrics(file_path, len(new_content), after_tokens),
+    )
+
+
+def apply_minimal_fixes(content: str) -> Tuple[str, List[str]]:
+    outcome = fix_and_measure(Path(), content)
+    return outcome.content, outcome.notes
 
 
 def score_improvement(before: FileMetrics, after: FileMetrics) -> int:
@@ -217,22 +408,29 @@ def score_improvement(before: FileMetrics, after: FileMetrics) -> int:
     return score
 
 
-def backup_file(src: Path, backup_root: Path) -> Path:
-    backup_root.mkdir(parents=True, exist_ok=True)
-    dst = backup_root / src.name
+def backup_file(src: Path, backup_root: Path, root: Optional[Path] = None) -> Path:
+    # Mirror the path below root: same-named files in different folders must not share a backup
+    relative = src.relative_to(root) if root is not None and src.is_relative_to(root) else Path(src.name)
+    dst = backup_root / relative
+    dst.parent.mkdir(parents=True, exist_ok=True)
     shutil.copy2(src, dst)
     return dst
 
 
-def write_report(report_path: Path, results: List[FileResult]) -> None:
+def write_report(report_path: Path, results: List[FileResult], wall_seconds: Optional[float] = None) -> None:
     lines: List[str] = []
     now_str = datetime.datetime.now().isoformat(timespec="seconds")
     lines.append(f"Prompt Evolution Report - {now_str}")
+    if wall_seconds is not None:
+        lines.append(
+            f"Wall clock: {wall_seconds:.2f}s; per-file total: {sum(res.elapsed_seconds for res in results):.2f}s"
+        )
     lines.append("")
     for res in results:
         lines.append(f"File: {res.file_path}")
         lines.append(f"Outcome: {res.outcome}")
         lines.append(f"Modified: {res.was_modified}")
+        lines.append(f"Time: {res.elapsed_seconds * 1000:.1f} ms")
         if res.notes:
             lines.append("Notes:")
             for note in res.notes:
@@ -261,19 +459,22 @@ def process_file(
     file_path: Path,
     apply_min_fixes: bool,
     backup_root: Optional[Path],
+    root: Optional[Path] = None,
+    original: Optional[str] = None,
 ) -> FileResult:
-    original = read_text(file_path)
-    before = collect_metrics(file_path, original)
+    if original is None:
+        original = read_text(file_path)
     notes: List[str] = []
 
     if not apply_min_fixes:
         after_content = original
+        before = after = collect_metrics(file_path, original)
         notes.append("no modifications requested (analysis only)")
     else:
-        after_content, fix_notes = apply_minimal_fixes(original)
-        notes.extend(fix_notes)
+        fixed = fix_and_measure(file_path, original)
+        after_content, before, after = fixed.content, fixed.before_metrics, fixed.after_metrics
+        notes.extend(fixed.notes)
 
-    after = collect_metrics(file_path, after_content)
     score = score_improvement(before, after)
     outcome = "neutral"
     was_modified = False
@@ -289,12 +490,12 @@ def process_file(
 
         if outcome == "downgrade":
             if backup_root is not None:
-                backup_file(file_path, backup_root)
+                backup_file(file_path, backup_root, root)
             write_text(file_path, original)
             notes.append("detected downgrade; restored original content")
         else:
             if backup_root is not None:
-                backup_file(file_path, backup_root)
+                backup_file(file_path, backup_root, root)
             write_text(file_path, after_content)
             notes.append("applied minimal formatting fixes")
 
@@ -308,6 +509,101 @@ def process_file(
     )
 
 
+def _error_result(file_path: Path, exc: Exception) -> FileResult:
+    before = collect_metrics(file_path, read_text(file_path))
+    return FileResult(
+        file_path=file_path,
+        was_modified=False,
+        outcome="neutral",
+        before_metrics=before,
+        after_metrics=before,
+        notes=[f"error: {type(exc).__name__}: {exc}"],
+    )
+
+
+def load_cache(cache_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Cached entries per mode ("analyze" / "fix") and file path; empty when missing, stale or unreadable."""
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("entries", {})
+
+
+def save_cache(cache_path: Path, entries: Dict[str, Dict[str, Any]]) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_name(cache_path.name + ".tmp")
+    tmp.write_text(json.dumps({"version": CACHE_VERSION, "entries": entries}), encoding="utf-8")
+    os.replace(tmp, cache_path)
+
+
+def _result_to_json(result: FileResult) -> Dict[str, Any]:
+    return {
+        "was_modified": result.was_modified,
+        "outcome": result.outcome,
+        "before_metrics": {k: v for k, v in dataclasses.asdict(result.before_metrics).items() if k != "file_path"},
+        "after_metrics": {k: v for k, v in dataclasses.asdict(result.after_metrics).items() if k != "file_path"},
+        "notes": result.notes,
+    }
+
+
+def _result_from_json(file_path: Path, data: Dict[str, Any]) -> FileResult:
+    return FileResult(
+        file_path=file_path,
+        was_modified=data["was_modified"],
+        outcome=data["outcome"],
+        before_metrics=FileMetrics(file_path=file_path, **data["before_metrics"]),
+        after_metrics=FileMetrics(file_path=file_path, **data["after_metrics"]),
+        notes=list(data["notes"]),
+    )
+
+
+def _process_with_cache(
+    file_path: Path,
+    cache_entry: Optional[Dict[str, Any]],
+    apply_min_fixes: bool,
+    backup_root: Optional[Path],
+    root: Optional[Path],
+) -> Tuple[FileResult, Optional[Dict[str, Any]]]:
+    stat = file_path.stat()
+    if cache_entry is not None and (cache_entry["size"], cache_entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+        return _result_from_json(file_path, cache_entry["result"]), cache_entry
+    data = file_path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if cache_entry is not None and cache_entry["sha256"] == digest:
+        # Touched but not edited (checkout, copy): same content, same result
+        return _result_from_json(file_path, cache_entry["result"]), dict(
+            cache_entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns
+        )
+    result = process_file(file_path, apply_min_fixes, backup_root, root, original=decode_text(data))
+    after = file_path.stat()
+    if (after.st_size, after.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+        # Rewritten by this run: the next run sees different content, so there is nothing to reuse
+        return result, None
+    entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest, "result": _result_to_json(result)}
+    return result, entry
+
+
+def process_file_cached(
+    file_path: Path,
+    cache_entry: Optional[Dict[str, Any]],
+    apply_min_fixes: bool,
+    backup_root: Optional[Path],
+    root: Optional[Path] = None,
+) -> Tuple[FileResult, Optional[Dict[str, Any]]]:
+    """process_file, or the cached result when the file's content is unchanged; also returns the entry to cache."""
+    start = time.perf_counter()
+    try:
+        result, entry = _process_with_cache(file_path, cache_entry, apply_min_fixes, backup_root, root)
+    except Exception as exc:  # noqa: BLE001
+        # Record failure without aborting the batch; failures are never cached
+        result, entry = _error_result(file_path, exc), None
+    result.elapsed_seconds = time.perf_counter() - start
+    return result, entry
+
+
 def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Prompt evolution and evaluation tool")
     parser.add_argument("--path", default=str(Path.cwd()), help="Root path to scan for .md files")
@@ -318,6 +614,18 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         default=None,
         help="Directory to store backups of modified files (default: .backups/<timestamp>)",
     )
+    parser.add_argument(
+        "--cache",
+        default=None,
+        help=f"Result cache file (default: <path>/{CACHE_FILE_NAME})",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Re-measure every file and leave the cache untouched")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for reading, fixing and writing files (0 = one per CPU)",
+    )
     return parser.parse_args(argv)
 
 
@@ -337,32 +645,46 @@ def main() -> int:
         print("no markdown files found; nothing to do")
         return 0
 
-    results: List[FileResult] = []
-    for md_file in markdown_files:
-        # Only operate within the chosen root to avoid modifying external paths
-        try:
-            result = process_file(
-                file_path=md_file,
-                apply_min_fixes=args.apply_minimal_fixes,
-                backup_root=backup_dir,
-            )
-            results.append(result)
-        except Exception as exc:  # noqa: BLE001
-            # Record failure without aborting the batch
-            before = collect_metrics(md_file, read_text(md_file))
-            results.append(
-                FileResult(
-                    file_path=md_file,
-                    was_modified=False,
-                    outcome="neutral",
-                    before_metrics=before,
-                    after_metrics=before,
-                    notes=[f"error: {type(exc).__name__}: {exc}"],
-                )
-            )
-
-    write_report(report_path, results)
+    cache_path = None if args.no_cache else (Path(args.cache) if args.cache else root / CACHE_FILE_NAME)
+    cache = load_cache(cache_path) if cache_path is not None else {}
+    mode = "fix" if args.apply_minimal_fixes else "analyze"
+    cached_entries = cache.get(mode, {})
+    cache_hits = [cached_entries.get(str(md_file)) for md_file in markdown_files]
+
+    start = time.perf_counter()
+    process = functools.partial(
+        process_file_cached, apply_min_fixes=args.apply_minimal_fixes, backup_root=backup_dir, root=root
+    )
+    jobs = args.jobs or os.cpu_count() or 1
+    if jobs > 1 and len(markdown_files) > 1:
+        # Each file is read, fixed, backed up and written by exactly one worker; map keeps path order
+        chunksize = max(1, len(markdown_files) // (jobs * 8))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            processed = list(pool.map(process, markdown_files, cache_hits, chunksize=chunksize))
+    else:
+        processed = [process(md_file, entry) for md_file, entry in zip(markdown_files, cache_hits)]
+    wall_seconds = time.perf_counter() - start
+    results = [result for result, _ in processed]
+
+    if cache_path is not None:
+        # Only files seen in this run are kept, so deleted files drop out of the cache
+        cache[mode] = {str(md_file): entry for md_file, (_, entry) in zip(markdown_files, processed) if entry}
+        save_cache(cache_path, cache)
+        reused = sum(
+            1
+            for hit, (_, entry) in zip(cache_hits, processed)
+            if hit is not None and entry is not None and hit["sha256"] == entry["sha256"]
+        )
+        print(f"Cache: {reused} of {len(markdown_files)} files unchanged and reused ({cache_path})")
+
+    write_report(report_path, results, wall_seconds)
+    per_file_seconds = sum(result.elapsed_seconds for result in results)
+    slowest = max(results, key=lambda result: result.elapsed_seconds)
     print(f"Processed {len(results)} markdown files. Report written to {report_path}")
+    print(
+        f"Wall clock {wall_seconds:.2f}s with {jobs} job(s); per-file total {per_file_seconds:.2f}s, "
+        f"slowest {slowest.file_path} ({slowest.elapsed_seconds * 1000:.1f} ms)"
+    )
     print(f"Backups (if any) stored in: {backup_dir}")
     return 0
 